@@ -0,0 +1,82 @@
+"""
+bench_decode.py
+compare decoding of large synthetic /get answers:
+json lists (Logger default), json lists converted to numpy arrays
+and decode_buffers
+"""
+
+import time
+import json
+import argparse
+import tracemalloc
+import numpy as np
+import phyphox
+
+
+def synthetic_answer(names, nb_sample):
+    """
+    Build a /get answer with nb_sample values for each buffer
+    """
+    rng = np.random.default_rng(0)
+    buffers = []
+    for idx, name in enumerate(names):
+        if idx == 0:
+            values = np.arange(nb_sample) * 0.002
+        else:
+            values = rng.normal(0, 9.81, nb_sample)
+        buffers.append(b'"' + name.encode() +
+                       b'":{"size":0,"updateMode":"full","buffer":[' +
+                       b','.join(b'%.7g' % v for v in values) + b']}')
+    return b'{"buffer":{' + b','.join(buffers) + b'},"status":{' +\
+        b'"session":"0","measuring":true,"timedRun":false,"countDown":0}}'
+
+
+def json_lists(reponse, names):
+    data = json.loads(reponse)['buffer']
+    return {name: data[name]['buffer'] for name in names}
+
+
+def json_numpy(reponse, names):
+    data = json.loads(reponse)['buffer']
+    return {name: np.array(data[name]['buffer']) for name in names}
+
+
+def bench(decoder, reponse, names, nb_run):
+    """
+    Returns best time and peak memory of decoder
+    """
+    best = float('inf')
+    for _ in range(nb_run):
+        debut = time.perf_counter()
+        decoder(reponse, names)
+        best = min(best, time.perf_counter() - debut)
+    tracemalloc.start()
+    decoder(reponse, names)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        prog='bench_decode.py',
+        description='Decoding time of /get answers')
+    parser.add_argument('-n', '--nb_sample', type=int, default=500000)
+    parser.add_argument('-b', '--nb_buffer', type=int, default=4)
+    parser.add_argument('-r', '--nb_run', type=int, default=3)
+    args = parser.parse_args()
+    names = ["acc_time"] + ["acc" + str(i) for i in range(args.nb_buffer - 1)]
+    reponse = synthetic_answer(names, args.nb_sample)
+    print("answer size {0:.1f} MB".format(len(reponse) / 1e6))
+    decoders = {
+        "json lists": json_lists,
+        "json + numpy": json_numpy,
+        "decode_buffers float64":
+            lambda r, n: phyphox.decode_buffers(r, n, np.float64),
+        "decode_buffers float32":
+            lambda r, n: phyphox.decode_buffers(r, n, np.float32),
+    }
+    for key, decoder in decoders.items():
+        best, peak = bench(decoder, reponse, names, args.nb_run)
+        print("{0:24s}: {1:7.3f} s {2:8.1f} Msamples/s peak {3:7.1f} MB".format(
+            key, best, args.nb_sample * len(names) / best / 1e6, peak / 1e6))
@@ -0,0 +1,72 @@
+"""
+bench_read_buffers.py
+Logger.read_buffers in the three BufferMode against a local Simulator:
+requests/s, samples/s, latency percentiles and peak memory
+"""
+
+import time
+import argparse
+import tracemalloc
+import numpy as np
+import phyphox
+
+
+def poll(phone, mode_data, duration, stack_data):
+    """
+    Call read_buffers during duration seconds
+    """
+    fin = time.perf_counter() + duration
+    while time.perf_counter() < fin:
+        phone.read_buffers(stack_data=stack_data, mode_data=mode_data)
+
+
+def bench(simulator, mode_data, args):
+    """
+    Returns statistics of read_buffers and peak memory
+    """
+    dtype = None if args.dtype == "list" else np.dtype(args.dtype)
+    with phyphox.Logger("127.0.0.1", simulator.port, keep_alive=True,
+                        dtype=dtype) as phone:
+        phone.get_meta()
+        phone.get_config()
+        phone.buffer_needed()
+        phone.enable_stats()
+        poll(phone, mode_data, args.duration, args.stack_data)
+        stats = phone.stats()
+        phone.disable_stats()
+        tracemalloc.start()
+        poll(phone, mode_data, min(args.duration, 1.0), args.stack_data)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return stats, peak
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        prog='bench_read_buffers.py',
+        description='read_buffers throughput against a local simulator')
+    parser.add_argument('-s', '--nb_set', type=int, default=2)
+    parser.add_argument('-b', '--nb_buffer', type=int, default=4)
+    parser.add_argument('-r', '--rate', type=float, default=500.0)
+    parser.add_argument('-d', '--duration', type=float, default=5.0)
+    parser.add_argument('-t', '--dtype', default="float64",
+                        help="list, float64 or float32")
+    parser.add_argument('--stack_data', action='store_true')
+    args = parser.parse_args()
+    with phyphox.Simulator(args.nb_set, args.nb_buffer, args.rate) as sim:
+        # full answers grow with experiment time
+        time.sleep(args.duration)
+        print("{0} sets of {1} buffers at {2} Hz, dtype {3}".format(
+            args.nb_set, args.nb_buffer, args.rate, args.dtype))
+        for mode_data in (phyphox.BufferMode.FULL, phyphox.BufferMode.LAST,
+                          phyphox.BufferMode.UPDATE):
+            stats, peak = bench(sim, mode_data, args)
+            get = stats['endpoints']['/get']
+            nb_sample = sum(stats['samples'].values())
+            print("{0:6s}: {1:8.1f} requests/s {2:10.0f} samples/s "
+                  "latency p50 {3:6.2f} p95 {4:6.2f} p99 {5:6.2f} ms "
+                  "peak {6:7.1f} MB".format(
+                      mode_data.name, get['count'] / stats['duration'],
+                      nb_sample / stats['duration'],
+                      get['latency_p50'] * 1e3, get['latency_p95'] * 1e3,
+                      get['latency_p99'] * 1e3, peak / 1e6))
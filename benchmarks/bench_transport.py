@@ -0,0 +1,61 @@
+"""
+bench_transport.py
+compare requests per second using urlopen (one connection per request)
+and persistent HTTP/1.1 connection against a local stand-in server
+"""
+
+import time
+import threading
+import argparse
+import http.server
+import phyphox
+
+
+class StandInHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Answer like phyphox /get with a small buffer
+    """
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    body = b'{"buffer":{"acc_time":{"size":0,"updateMode":"partial",' +\
+        b'"buffer":[' + b','.join(b'%.6f' % (i * 0.002) for i in range(10)) +\
+        b']}},"status":{"session":"0","measuring":true,' +\
+        b'"timedRun":false,"countDown":0}}'
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def bench(logger, nb_request):
+    """
+    Send nb_request /get requests and return requests per second
+    """
+    debut = time.perf_counter()
+    for _ in range(nb_request):
+        logger.transport.request("/get?acc_time=full")
+    return nb_request / (time.perf_counter() - debut)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        prog='bench_transport.py',
+        description='Requests per second urlopen versus keep-alive')
+    parser.add_argument('-n', '--nb_request', type=int, default=2000)
+    args = parser.parse_args()
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_port
+    with phyphox.Logger("127.0.0.1", port, no_proxy=True) as phone:
+        print("urlopen    : {0:8.1f} requests/s".format(
+            bench(phone, args.nb_request)))
+    with phyphox.Logger("127.0.0.1", port, keep_alive=True) as phone:
+        print("keep-alive : {0:8.1f} requests/s".format(
+            bench(phone, args.nb_request)))
+    server.shutdown()
@@ -0,0 +1,55 @@
+"""
+sample2.py
+connect to phyphone mobile app.
+select buffer
+poll phone in background thread for 10 seconds and stop
+"""
+
+import time
+import queue
+import logging
+import argparse
+import phyphox
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(
+        prog='sample2.py',
+        description='Background acquisition with phyphox REST API')
+    parser.add_argument('-v', '--verbose',
+                        action='store_true')
+    parser.add_argument('-a', '--adresse', default="192.168.0.1")
+    args = parser.parse_args()
+    if args.verbose:
+        logging.basicConfig(format="%(levelname)s: %(message)s",
+                            level=logging.DEBUG)
+        logging.info("Verbose output.")
+    else:
+        logging.basicConfig(format="%(levelname)s: %(message)s")
+    my_phone = phyphox.Logger(args.adresse, 8080, no_proxy=True,
+                              keep_alive=True, timeout=5)
+    my_phone.get_meta()
+    my_phone.get_config()
+    if my_phone.buffer_needed():
+        my_phone.clear_data()
+        print("\nStart sampling\n")
+        my_phone.start()
+        acquisition = my_phone.start_acquisition(min_interval=0.05,
+                                                 target_samples=50)
+        fin = time.perf_counter() + 10
+        while time.perf_counter() < fin:
+            try:
+                chunk = acquisition.queue.get(timeout=1)
+            except queue.Empty:
+                print("No data")
+                continue
+            for name, values in chunk.items():
+                print(name, len(values), " values")
+            print("Poll interval {0:.3f} s rate {1:.1f} Hz".format(
+                acquisition.interval, acquisition.rate))
+        my_phone.stop_acquisition()
+        my_phone.stop()
+    else:
+        print("Invalid buffer selected")
+    my_phone.close()
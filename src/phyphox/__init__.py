@@ -1 +1,22 @@
 from .phyphox import *
+from .transport import *
+from .aio import *
+from .group import *
+from .ringbuffer import *
+from .decode import *
+from .acquisition import *
+from .recorder import *
+from .export import *
+from .cache import *
+from .instrument import *
+from .simulator import *
+from .replay import *
+from .align import *
+from .decimate import *
+from .online import *
+from .spectral import *
+from .shared import *
+from .retry import *
+from .clock import *
+from .compact import *
+from .pipeline import *
@@ -0,0 +1,147 @@
+"""
+Acquisition class
+background thread polling phyphox phone application
+"""
+import threading
+import queue
+import time
+import logging
+
+
+class Acquisition(threading.Thread):
+    """
+    Background thread calling Logger.read_buffers. Poll interval is
+    adapted to get about target_samples new samples in each answer:
+    sample rate is first estimated using sensor MinDelay, then measured
+    with new data. Interval is bounded by min_interval (maximum request
+    rate) and max_interval, and is increased after empty answers.
+    New data (dict of values for each buffer name) are put in queue.
+
+    :param Logger logger: phone to poll
+    :param float min_interval: minimum time between two requests in seconds (default: 0.05)
+    :param float max_interval: maximum time between two requests in seconds (default: 1.0)
+    :param int target_samples: number of new samples wanted in each answer (default: 1 lowest latency)
+    :param int queue_size: maximum number of chunks waiting in queue, 0 no queue (default: 100)
+    :param str policy: 'block' polling waits when queue is full, 'drop' oldest chunk is lost (default: 'block')
+    :param bool stack_data: stack_data parameter of read_buffers (default: False)
+    :param BufferMode mode_data: mode_data parameter of read_buffers (default: None BufferMode.UPDATE)
+    """
+    POLICIES = ('block', 'drop')
+
+    def __init__(self, logger, min_interval=0.05, max_interval=1.0,
+                 target_samples=1, queue_size=100, policy='block',
+                 stack_data=False, mode_data=None):
+        super().__init__(name="phyphox-acquisition", daemon=True)
+        if policy not in Acquisition.POLICIES:
+            raise ValueError("policy must be in " +
+                             str(Acquisition.POLICIES))
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError("0 < min_interval <= max_interval")
+        self.__logger = logger
+        #: minimum time between two requests in seconds
+        self.min_interval = min_interval
+        #: maximum time between two requests in seconds
+        self.max_interval = max_interval
+        #: number of new samples wanted in each answer
+        self.target_samples = target_samples
+        #: 'block' or 'drop'
+        self.policy = policy
+        self.__read_param = {'stack_data': stack_data}
+        if mode_data is not None:
+            self.__read_param['mode_data'] = mode_data
+        #: queue of new data, None if queue_size is 0
+        self.queue = None
+        if queue_size > 0:
+            self.queue = queue.Queue(queue_size)
+        #: estimated sample rate in Hz
+        self.rate = logger.get_sample_rate()
+        #: current time between two requests in seconds
+        self.interval = self.__next_interval(self.rate)
+        #: number of requests sent
+        self.nb_request = 0
+        #: number of chunks dropped because queue was full
+        self.nb_dropped = 0
+        #: last exception raised by read_buffers
+        self.error = None
+        # samples received by callback since last poll
+        self.__nb_new = 0
+        self.__stop_event = threading.Event()
+
+    def __next_interval(self, rate):
+        if not rate:
+            return self.min_interval
+        return min(max(self.target_samples / rate, self.min_interval),
+                   self.max_interval)
+
+    def __push(self, chunk):
+        if self.policy == 'drop':
+            while True:
+                try:
+                    self.queue.put_nowait(chunk)
+                    return
+                except queue.Full:
+                    try:
+                        self.queue.get_nowait()
+                        self.nb_dropped = self.nb_dropped + 1
+                    except queue.Empty:
+                        pass
+        # backpressure: polling waits until a chunk is read
+        while True:
+            try:
+                self.queue.put(chunk, timeout=self.min_interval)
+                return
+            except queue.Full:
+                if self.__stop_event.is_set():
+                    self.nb_dropped = self.nb_dropped + 1
+                    return
+
+    def __callback(self, chunk):
+        # first column is time buffer of first set
+        self.__nb_new = self.__nb_new + len(next(iter(chunk.values()), []))
+        if self.queue is not None:
+            self.__push(chunk)
+
+    def run(self):
+        self.__logger.add_callback(self.__callback)
+        last_data = time.perf_counter()
+        try:
+            while not self.__stop_event.is_set():
+                debut = time.perf_counter()
+                self.__nb_new = 0
+                try:
+                    self.__logger.read_buffers(**self.__read_param)
+                    self.error = None
+                except Exception as error:
+                    logging.warning("Acquisition error: %s", str(error))
+                    self.error = error
+                self.nb_request = self.nb_request + 1
+                # new samples are counted by callback: Logger.new_data
+                # is left to other consumers
+                nb = self.__nb_new
+                if nb:
+                    rate = nb / max(debut - last_data, 1e-6)
+                    last_data = debut
+                    if self.rate:
+                        self.rate = 0.7 * self.rate + 0.3 * rate
+                    else:
+                        self.rate = rate
+                    self.interval = self.__next_interval(self.rate)
+                else:
+                    self.interval = min(self.interval * 1.5,
+                                        self.max_interval)
+                # interval is measured between two request starts
+                attente = self.interval - (time.perf_counter() - debut)
+                if attente > 0:
+                    self.__stop_event.wait(attente)
+        finally:
+            self.__logger.remove_callback(self.__callback)
+
+    def stop(self, timeout=None):
+        """
+        Stop polling and wait end of thread.
+
+        :param float timeout: time in seconds to wait end of thread (default: None)
+        """
+        self.__stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
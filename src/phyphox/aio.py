@@ -0,0 +1,473 @@
+"""
+AsyncLogger class
+to connect your phone to your asyncio application
+"""
+import asyncio
+import time
+import urllib.parse
+import urllib.error
+import warnings
+import logging
+from .phyphox import Logger, BufferMode, PHYPHOX_API
+
+
+class AsyncKeepAliveTransport():
+    """
+    asyncio transport reusing persistent HTTP/1.1 connections.
+    A connection closed by the phone is opened again on next request.
+
+    :param str base_url: URL to access phyphox phone application
+    :param float timeout: timeout for one request in seconds (default: None no timeout)
+    :param int pool_size: maximum number of connections opened at the same time (default: 1)
+    :param int retries: number of reconnections for one request when connection is lost (default: 1)
+    """
+    def __init__(self, base_url, timeout=None, pool_size=1, retries=1):
+        if pool_size < 1:
+            raise ValueError("pool_size must be greater than 0")
+        #: url to access phone phyphox application
+        self.base_url = base_url
+        #: timeout for one request in seconds
+        self.timeout = timeout
+        #: number of reconnections for one request
+        self.retries = retries
+        url = urllib.parse.urlsplit(base_url)
+        self.__host = url.hostname
+        self.__port = url.port
+        self.__ssl = url.scheme == 'https'
+        self.__pool_size = pool_size
+        # created in first request to use running loop
+        self.__pool = None
+        #: number of TCP connections opened since creation
+        self.nb_connection = 0
+
+    async def __new_connection(self):
+        self.nb_connection = self.nb_connection + 1
+        logging.debug("New connection %d to %s", self.nb_connection,
+                      self.base_url)
+        return await asyncio.open_connection(self.__host, self.__port,
+                                             ssl=self.__ssl or None)
+
+    async def __send(self, writer, path):
+        writer.write(("GET " + path + " HTTP/1.1\r\n" +
+                      "Host: " + self.__host + ":" + str(self.__port) +
+                      "\r\nAccept-Encoding: identity\r\n\r\n").encode())
+        await writer.drain()
+
+    @staticmethod
+    async def __read_head(reader):
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed by phone")
+        version, status, reason = (status_line.decode('latin-1').rstrip() +
+                                   "  ").split(" ", 2)
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, value = line.decode('latin-1').split(":", 1)
+            headers[key.strip().lower()] = value.strip()
+        will_close = headers.get("connection", "").lower() == "close" or\
+            version == "HTTP/1.0"
+        return int(status), reason.strip(), headers, will_close
+
+    async def __exchange(self, connection, path):
+        reader, writer = connection
+        await self.__send(writer, path)
+        status, reason, headers, will_close = await self.__read_head(reader)
+        if "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            parts = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                parts.append(await reader.readexactly(size))
+                await reader.readline()
+            body = b"".join(parts)
+        else:
+            body = await reader.read()
+            will_close = True
+        return status, reason, headers, body, will_close
+
+    async def request(self, path):
+        """
+        Send a GET request and read the whole answer.
+
+        :param str path: path and query string (e.g. "/meta")
+        :return bytes: response body
+        :raise urllib.error.HTTPError: if phone answer status is not 200
+        """
+        if self.__pool is None:
+            self.__pool = asyncio.LifoQueue()
+            for _ in range(self.__pool_size):
+                self.__pool.put_nowait(None)
+        connection = await self.__pool.get()
+        nb_try = 0
+        while True:
+            reused = connection is not None
+            try:
+                if connection is None:
+                    connection = await asyncio.wait_for(
+                        self.__new_connection(), self.timeout)
+                status, reason, headers, body, will_close = \
+                    await asyncio.wait_for(self.__exchange(connection, path),
+                                           self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                self.__discard(connection)
+                connection = None
+                # a stale keep-alive connection is not counted as a try
+                if not reused:
+                    nb_try = nb_try + 1
+                if nb_try > self.retries:
+                    self.__pool.put_nowait(None)
+                    raise
+                continue
+            except BaseException:
+                self.__discard(connection)
+                self.__pool.put_nowait(None)
+                raise
+            if will_close:
+                self.__discard(connection)
+                connection = None
+            self.__pool.put_nowait(connection)
+            if status != 200:
+                raise urllib.error.HTTPError(self.base_url + path, status,
+                                             reason, headers, None)
+            return body
+
+    async def stream(self, path, block_size=65536):
+        """
+        Send a GET request and read answer block by block.
+        A dedicated connection is used and closed at the end.
+
+        :param str path: path and query string (e.g. "/export?format=1")
+        :param int block_size: maximum size of a block in bytes (default: 65536)
+        :return: asynchronous generator of bytes blocks
+        :raise urllib.error.HTTPError: if phone answer status is not 200
+        """
+        reader, writer = await asyncio.wait_for(self.__new_connection(),
+                                                self.timeout)
+        try:
+            await self.__send(writer, path)
+            status, reason, headers, _ = await asyncio.wait_for(
+                self.__read_head(reader), self.timeout)
+            if status != 200:
+                raise urllib.error.HTTPError(self.base_url + path, status,
+                                             reason, headers, None)
+            if headers.get("transfer-encoding", "").lower() != "chunked":
+                nb = None
+                if "content-length" in headers:
+                    nb = int(headers["content-length"])
+                async for block in self.__read_blocks(reader, nb,
+                                                      block_size):
+                    yield block
+                return
+            while True:
+                line = await asyncio.wait_for(reader.readline(),
+                                              self.timeout)
+                nb = int(line.split(b";")[0], 16)
+                if nb == 0:
+                    return
+                async for block in self.__read_blocks(reader, nb,
+                                                      block_size):
+                    yield block
+                await reader.readline()
+        finally:
+            writer.close()
+
+    async def __read_blocks(self, reader, nb, block_size):
+        """
+        Read nb bytes (None until connection is closed) block by block.
+        """
+        while nb is None or nb > 0:
+            size = block_size if nb is None else min(block_size, nb)
+            block = await asyncio.wait_for(reader.read(size), self.timeout)
+            if not block:
+                if nb is not None:
+                    raise ConnectionResetError("Connection closed by phone")
+                return
+            if nb is not None:
+                nb = nb - len(block)
+            yield block
+
+    @staticmethod
+    def __discard(connection):
+        if connection is not None:
+            connection[1].close()
+
+    async def close(self):
+        """
+        Close all connections waiting in pool.
+        """
+        if self.__pool is None:
+            return
+        for _ in range(self.__pool_size):
+            self.__discard(await self.__pool.get())
+        for _ in range(self.__pool_size):
+            self.__pool.put_nowait(None)
+
+
+class _CoreTransport():
+    """
+    Transport of the Logger building links and decoding answers for
+    AsyncLogger: requests are sent by AsyncLogger coroutines.
+    """
+    def request(self, path, timeout=None):
+        raise TypeError("requests of AsyncLogger are coroutines")
+
+    def stream(self, path, block_size=65536):
+        raise TypeError("requests of AsyncLogger are coroutines")
+
+    def close(self):
+        pass
+
+
+class AsyncLogger():
+    """
+    Phyphox Logger class for asyncio application.
+    Requests are coroutines. Links are built and answers are decoded
+    by a Logger which never sends a request: its methods reading
+    stored data (CORE_ATTRIBUTES) are available on AsyncLogger.
+    Logger methods without coroutine version (read_buffers_chunked,
+    start_acquisition) do not exist: use read_buffers or chunks.
+
+    :param str ip: Device IP address.
+    :param int port: Port number (default: 8080).
+    :param str protocol: Communication protocol (default: 'http').
+    :param float timeout: timeout for one request in seconds (default: None no timeout).
+    :param transport: object with coroutines request(path) and close() and asynchronous generator stream(path, block_size). default is None (AsyncKeepAliveTransport).
+    :param dtype: default None data are python lists. numpy.float64 or numpy.float32 data are decoded in numpy arrays.
+    :param ConfigCache cache: default None. persistent cache of meta and config answers.
+    """
+
+    #: Logger methods and attributes, without request, of AsyncLogger
+    CORE_ATTRIBUTES = (
+        'dtype', 'cache', 'new_data', 'overflow', 'instrumentation',
+        'enable_stats', 'disable_stats', 'stats', 'get_meta_key',
+        'print_reponse', 'get_experiment', 'get_buffer_position',
+        'get_buffer_name', 'get_selected_names', 'build_link',
+        'add_callback', 'remove_callback', 'get_nb_measure',
+        'get_last_buffer_read', 'get_all_buffer_read', 'get_buffer_since',
+        'get_buffer_view', 'get_buffer_memoryview', 'get_sample_rate',
+        'set_ring_buffer', 'set_storage', 'set_decimation', 'get_decimator',
+        'get_decimated', 'set_spectrogram', 'get_spectrogram',
+        'set_statistics', 'get_statistics', 'get_ring_buffer',
+        'get_last_samples', 'print_select_buffer')
+
+    def __init__(self, adresse, port=8080, protocol='http', timeout=None,
+                 transport=None, dtype=None, cache=None):
+        self.__core = Logger(adresse, port, protocol,
+                             transport=_CoreTransport(), dtype=dtype,
+                             cache=cache)
+        #: url to access phone phyphox application
+        self.base_url = self.__core.base_url
+        #: transport used to send all requests to phone
+        self.transport = transport
+        if transport is None:
+            self.transport = AsyncKeepAliveTransport(self.base_url, timeout)
+
+    def __getattr__(self, name):
+        if name in AsyncLogger.CORE_ATTRIBUTES:
+            return getattr(self.__core, name)
+        raise AttributeError("'AsyncLogger' object has no attribute '" +
+                             name + "'")
+
+    def __str__(self):
+        return str(self.__core)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """
+        Close connections opened by transport.
+        """
+        await self.transport.close()
+
+    async def send_url(self, cmd_key):
+        """
+        open standard phyphox URL.
+
+        :param str cmd_key: Command to send
+        :return dict: A dictionary with the JSON response, or an empty dict if no response.
+        """
+        if cmd_key in PHYPHOX_API:
+            try:
+                return self.__core._decode_json(
+                    await self.__request(PHYPHOX_API[cmd_key]))
+            except urllib.error.HTTPError:
+                pass
+        warnings.warn("Unknown command or not implemented")
+        return {}
+
+    async def __request(self, path):
+        instrumentation = self.__core.instrumentation
+        if instrumentation is None:
+            return await self.transport.request(path)
+        debut = time.perf_counter()
+        reponse = await self.transport.request(path)
+        instrumentation.request(path.split('?')[0],
+                                     time.perf_counter() - debut,
+                                     len(reponse))
+        return reponse
+
+    async def start(self):
+        """
+        Sends the start command to the Phyphox app.
+
+        :return: JSON response (True on success).
+        """
+        return await self.send_url("start")
+
+    async def stop(self):
+        """
+        Stop sampling of phyphox phone application
+
+        :return: JSON response (True on success).
+        """
+        return await self.send_url("stop")
+
+    async def clear_data(self):
+        """
+        Stop sampling and reset buffer in the Phyphox app.
+
+        :return: JSON response (True on success).
+        """
+        self.__core._reset_nb_measure()
+        return await self.send_url("clear")
+
+    async def get_time(self):
+        """
+        Get phone time reference
+        """
+        return await self.send_url("time")
+
+    async def get_meta(self, force_update=False):
+        """
+        Get meta information from phyphox phone application
+
+        :param bool force_update: True retrieve data from mobile phone otherwise use old data.
+        """
+        if self.__core._answer_needed("meta", force_update):
+            answer = self.__core._cached_answer("meta", force_update)
+            if answer is None:
+                answer = await self.send_url("meta")
+                self.__core._cache_answer("meta", answer)
+            self.__core._update_meta(answer)
+        else:
+            self.__core._update_meta()
+
+    async def get_config(self, force_update=False):
+        """
+        Retrieves configuration data for the selected experiment.
+        """
+        if self.__core._answer_needed("config", force_update):
+            if self.__core.cache is not None and \
+                    self.__core._answer_needed("meta", False):
+                # device identity of cached config
+                await self.get_meta()
+            answer = self.__core._cached_answer("config", force_update)
+            if answer is None:
+                answer = await self.send_url("config")
+                self.__core._cache_answer("config", answer)
+            self.__core._update_config(answer)
+        else:
+            self.__core._update_config()
+
+    async def buffer_needed(self, l_exp=None):
+        """
+        Selects buffers in the Phyphox configuration: tuples of
+        positions, buffer names, labels, set names or glob patterns.
+        See Logger.buffer_needed
+
+        :param list l_exp: list of tuple or str. default value is None
+        :return bool: False is something wrong in list
+        """
+        if self.__core._answer_needed("config", False):
+            await self.get_config()
+        if self.__core._answer_needed("config", False):
+            warnings.warn("Cannot get config data")
+            return False
+        return self.__core.buffer_needed(l_exp)
+
+    async def print_buffer_name(self):
+        """
+        Prints available buffers from configuration data.
+        """
+        if self.__core._answer_needed("config", False):
+            await self.get_config()
+        if self.__core._answer_needed("config", False):
+            warnings.warn("Cannot get config data")
+            return
+        self.__core.print_buffer_name()
+
+    async def export_file(self, filetype=0, filename="data.xls",
+                          block_size=65536, progress=None):
+        """
+        Retrieves all recorded data in a single file written block by
+        block while it is downloaded. See Logger.export_file
+
+        :param int filetype: default is 0 for xls
+        :param str filename: file name to save. default is "data.xls"
+        :param int block_size: size of blocks written in bytes. default is 65536
+        :param progress: default None. function called with number of bytes written after each block
+        :return int: number of bytes written
+        """
+        nb_bytes = 0
+        debut = time.perf_counter()
+        with open(filename, "wb") as fd:
+            async for block in self.transport.stream(
+                    "/export?format=" + str(filetype), block_size):
+                fd.write(block)
+                nb_bytes = nb_bytes + len(block)
+                if progress is not None:
+                    progress(nb_bytes)
+        if self.__core.instrumentation is not None:
+            self.__core.instrumentation.request("/export",
+                                         time.perf_counter() - debut,
+                                         nb_bytes)
+        logging.info("Export %s: %d bytes", filename, nb_bytes)
+        return nb_bytes
+
+    async def read_buffers(self, stack_data=True,
+                           mode_data=BufferMode.UPDATE):
+        """
+        read data for selected buffer. See Logger.read_buffers
+
+        :param bool stack_data: True data are pushed in a list otherwise only last data are keep in memory
+        :param BufferMode mode_data: see
+        :return: True if new data are available
+        """
+        lnk = self.__core._data_link(mode_data)
+        if not lnk:
+            return self.__core.new_data
+        logging.debug("%s%s", self.base_url, lnk)
+        return self.__core._store_buffers(await self.__request(lnk),
+                                          stack_data)
+
+    async def chunks(self, interval=0.1, stack_data=False,
+                     mode_data=BufferMode.UPDATE):
+        """
+        Asynchronous iterator yielding new data (same format as
+        get_last_buffer_read). Phone is polled every interval seconds.
+
+        :param float interval: time between two requests in seconds (default: 0.1)
+        :param bool stack_data: True data are also pushed in a list (default: False)
+        :param BufferMode mode_data: default is BufferMode.UPDATE
+        """
+        last = None
+        while True:
+            if await self.read_buffers(stack_data, mode_data):
+                # new_data is left to other users: a chunk already
+                # yielded is the same list
+                chunk = self.get_last_buffer_read()
+                if chunk is not last:
+                    last = chunk
+                    yield chunk
+            await asyncio.sleep(interval)
@@ -0,0 +1,110 @@
+"""
+Aligner class
+resample buffers of several sets or phones on a common timebase
+"""
+import numpy as np
+
+
+class Aligner():
+    """
+    Incremental resampling of buffers on a common timebase:
+    times t0 + k / rate, t0 being the first time when all sets have
+    data. Each set is a list of buffer names, time buffer first
+    (same format as Experiment.buffer_names). New samples are given
+    to feed (Logger callback format): samples on timebase are computed
+    as soon as all sets cover them, only samples needed for next
+    interpolations are kept. For several phones, give names with
+    a prefix for each phone and use prefix in feed.
+
+    :param float rate: sample rate of common timebase in Hz
+    :param list groups: list of sets, a set being a list of buffer names (time buffer first)
+    :param str method: 'linear' interpolation or 'previous' last sample (default: 'linear')
+    :param str time_name: key of times in aligned chunks (default: 'time')
+    """
+    METHODS = ('linear', 'previous')
+
+    def __init__(self, rate, groups, method='linear', time_name='time'):
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0")
+        if method not in Aligner.METHODS:
+            raise ValueError("method must be in " + str(Aligner.METHODS))
+        #: sample rate of common timebase in Hz
+        self.rate = float(rate)
+        #: 'linear' or 'previous'
+        self.method = method
+        #: key of times in aligned chunks
+        self.time_name = time_name
+        self.__groups = [list(l_) for l_ in groups]
+        self.clear()
+
+    def clear(self):
+        """
+        Remove samples not aligned and restart timebase.
+        """
+        self.__tails = [[np.empty(0) for name in l_]
+                        for l_ in self.__groups]
+        self.__t0 = None
+        self.__next = 0
+
+    def get_names(self):
+        """
+        Returns keys of aligned chunks: time_name then value buffer names.
+
+        :return list:
+        """
+        return [self.time_name] + [name for l_ in self.__groups
+                                   for name in l_[1:]]
+
+    def __interp(self, grid, temps, values):
+        if self.method == 'linear':
+            return np.interp(grid, temps, values)
+        idx = np.searchsorted(temps, grid, side='right') - 1
+        return values[np.maximum(idx, 0)]
+
+    def feed(self, chunk, prefix='', offset=0.0):
+        """
+        Add new samples and returns samples on timebase that can be computed.
+
+        :param dict chunk: new values for each buffer name (Logger callback format)
+        :param str prefix: added to buffer names of chunk (default: '')
+        :param float offset: added to times of chunk in seconds, e.g. clock offset of a phone (default: 0.0)
+        :return dict: numpy array for each name of get_names, arrays can be empty
+        """
+        for l_, tails in zip(self.__groups, self.__tails):
+            if not l_[0].startswith(prefix) or \
+                    l_[0][len(prefix):] not in chunk:
+                continue
+            for col, name in enumerate(l_):
+                values = np.asarray(chunk[name[len(prefix):]],
+                                    dtype=np.float64)
+                if col == 0:
+                    values = values + offset
+                tails[col] = np.concatenate((tails[col], values))
+        return self.__align()
+
+    def __align(self):
+        result = {name: np.empty(0) for name in self.get_names()}
+        if any(tails[0].shape[0] == 0 for tails in self.__tails):
+            return result
+        if self.__t0 is None:
+            debut = max(tails[0][0] for tails in self.__tails)
+            self.__t0 = np.ceil(debut * self.rate) / self.rate
+        fin = min(tails[0][-1] for tails in self.__tails)
+        # integer index of timebase avoids accumulated rounding
+        nb = int(np.floor((fin - self.__t0) * self.rate + 1e-9)) + 1 -\
+            self.__next
+        if nb <= 0:
+            return result
+        grid = self.__t0 + np.arange(self.__next, self.__next + nb) /\
+            self.rate
+        self.__next = self.__next + nb
+        result[self.time_name] = grid
+        for l_, tails in zip(self.__groups, self.__tails):
+            for name, values in zip(l_[1:], tails[1:]):
+                result[name] = self.__interp(grid, tails[0], values)
+            # keep last sample before next time of timebase
+            keep = max(np.searchsorted(tails[0], grid[-1], side='right') - 1,
+                       0)
+            for col in range(len(tails)):
+                tails[col] = tails[col][keep:]
+        return result
@@ -0,0 +1,195 @@
+"""
+ConfigCache class
+persistent cache of /meta and /config answers
+"""
+import os
+import json
+import time
+import logging
+from .phyphox import Experiment
+
+
+class ConfigCache():
+    """
+    Persistent cache of /meta and /config answers: one JSON file for each
+    device (base_url) in directory, file names start with PREFIX.
+    A config answer is used only for the device identity (meta keys in
+    IDENTITY_KEYS) and the crc32 it was stored with: when meta answer
+    gives another device, config is invalidated.
+    An answer older than max_age seconds is asked again to the phone:
+    when experiment crc32 is unchanged, experiment is not parsed again,
+    otherwise the entry is invalidated.
+    Within max_age, a config answer is used without asking phone: if
+    experiment is changed on the phone, buffer names are wrong until
+    answer is too old (use force_update or invalidate).
+    Least recently used devices are removed above max_entries.
+
+    :param str directory: folder of cache files (created if needed)
+    :param float max_age: time in seconds an answer is used without asking phone, None no limit (default: 60)
+    :param int max_entries: maximum number of devices kept (default: 64)
+    """
+    #: prefix of cache file names, other files of directory are not used
+    PREFIX = "phyphox_cache_"
+    #: meta keys identifying a device
+    IDENTITY_KEYS = ('deviceManufacturer', 'deviceBrand', 'deviceModel',
+                     'deviceBoard', 'deviceCodename', 'deviceRelease',
+                     'version', 'build')
+
+    def __init__(self, directory, max_age=60, max_entries=64):
+        if max_entries < 1:
+            raise ValueError("max_entries must be greater than 0")
+        os.makedirs(directory, exist_ok=True)
+        #: folder of cache files
+        self.directory = directory
+        #: time in seconds an answer is used without asking phone
+        self.max_age = max_age
+        #: maximum number of devices kept
+        self.max_entries = max_entries
+        self.__experiments = {}
+        self.__counters = {'hits': 0, 'misses': 0, 'expired': 0,
+                           'unchanged': 0, 'invalidations': 0,
+                           'evictions': 0}
+
+    def __path(self, device):
+        file_name = "".join(c if c.isalnum() else "_" for c in device)
+        return os.path.join(self.directory,
+                            ConfigCache.PREFIX + file_name + ".json")
+
+    @staticmethod
+    def identity(meta):
+        """
+        Returns device identity of a meta answer.
+
+        :param dict meta: meta answer, None unknown device
+        :return str: None if meta is None
+        """
+        if meta is None:
+            return None
+        return "|".join(str(meta.get(key))
+                        for key in ConfigCache.IDENTITY_KEYS)
+
+    def __read(self, device):
+        try:
+            with open(self.__path(device), encoding="utf-8") as fd:
+                return json.load(fd)
+        except (OSError, ValueError):
+            return {}
+
+    def __write(self, device, entry):
+        path = self.__path(device)
+        with open(path + ".tmp", "w", encoding="utf-8") as fd:
+            json.dump(entry, fd)
+        os.replace(path + ".tmp", path)
+        self.__evict()
+
+    def __evict(self):
+        files = [os.path.join(self.directory, file_name)
+                 for file_name in os.listdir(self.directory)
+                 if file_name.startswith(ConfigCache.PREFIX) and
+                 file_name.endswith(".json")]
+        if len(files) <= self.max_entries:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files[:len(files) - self.max_entries]:
+            os.remove(path)
+            self.__counters['evictions'] = self.__counters['evictions'] + 1
+
+    def get(self, device, key, meta=None):
+        """
+        Returns answer of a request if it is in cache and not too old.
+        A config answer is returned only if meta gives the device
+        identity it was stored with and the answer has a crc32 (compared
+        by put when the answer is asked again).
+
+        :param str device: device address (Logger base_url)
+        :param str key: 'meta' or 'config'
+        :param dict meta: meta answer of device (default: None unknown)
+        :return dict: None if phone must be asked
+        """
+        entry = self.__read(device)
+        if key not in entry:
+            self.__counters['misses'] = self.__counters['misses'] + 1
+            return None
+        if key == 'config' and (
+                entry[key].get('identity') != self.identity(meta) or
+                entry[key].get('crc32') is None):
+            self.__counters['misses'] = self.__counters['misses'] + 1
+            return None
+        if self.max_age is not None and \
+                time.time() - entry[key]['time'] > self.max_age:
+            self.__counters['expired'] = self.__counters['expired'] + 1
+            return None
+        self.__counters['hits'] = self.__counters['hits'] + 1
+        # file time is used for least recently used eviction
+        os.utime(self.__path(device))
+        return entry[key]['answer']
+
+    def put(self, device, key, answer, meta=None):
+        """
+        Store answer of a request. For config, entry is invalidated
+        if crc32 or device identity is different. For meta, config is
+        removed if device identity is different.
+
+        :param str device: device address (Logger base_url)
+        :param str key: 'meta' or 'config'
+        :param dict answer: phone answer
+        :param dict meta: meta answer of device for config (default: None unknown)
+        """
+        entry = self.__read(device)
+        if key == 'config' and key in entry:
+            if entry[key].get('crc32') == answer.get('crc32') and \
+                    entry[key].get('identity') == self.identity(meta):
+                self.__counters['unchanged'] =\
+                    self.__counters['unchanged'] + 1
+            else:
+                logging.info("Experiment changed on %s", device)
+                self.__counters['invalidations'] =\
+                    self.__counters['invalidations'] + 1
+        if key == 'meta' and 'meta' in entry and 'config' in entry and \
+                self.identity(entry['meta']['answer']) != \
+                self.identity(answer):
+            logging.info("Device changed on %s", device)
+            del entry['config']
+            self.__counters['invalidations'] =\
+                self.__counters['invalidations'] + 1
+        entry[key] = {'time': time.time(), 'answer': answer}
+        if key == 'config':
+            entry[key]['identity'] = self.identity(meta)
+            entry[key]['crc32'] = answer.get('crc32')
+        self.__write(device, entry)
+
+    def invalidate(self, device):
+        """
+        Remove all answers of a device.
+
+        :param str device: device address (Logger base_url)
+        """
+        if os.path.exists(self.__path(device)):
+            os.remove(self.__path(device))
+            self.__counters['invalidations'] =\
+                self.__counters['invalidations'] + 1
+
+    def experiment(self, answer):
+        """
+        Returns Experiment built from config answer.
+        Experiments are parsed once for each crc32.
+
+        :param dict answer: config answer
+        :return Experiment:
+        """
+        crc32 = answer.get('crc32')
+        if crc32 is None:
+            return Experiment(answer)
+        if crc32 not in self.__experiments:
+            self.__experiments[crc32] = Experiment(answer)
+        return self.__experiments[crc32]
+
+    def stats(self):
+        """
+        Returns cache counters: hits, misses, expired (answer too old),
+        unchanged (crc32 same after asking phone), invalidations
+        and evictions.
+
+        :return dict:
+        """
+        return dict(self.__counters)
@@ -0,0 +1,188 @@
+"""
+phyphox-record command
+record selected buffers of one or many phones in .npy files
+"""
+import os
+import sys
+import time
+import signal
+import logging
+import argparse
+import threading
+import numpy as np
+from .phyphox import Logger
+from .group import LoggerGroup
+from .recorder import Recorder
+from .retry import RetryPolicy
+
+
+def _parse_phone(text):
+    """
+    Returns address and port of "ip" or "ip:port".
+    """
+    if text.count(":") == 1:
+        adresse, port = text.split(":")
+        return adresse, int(port)
+    return text, 8080
+
+
+def build_parser():
+    """
+    Returns parser of phyphox-record arguments.
+
+    :return argparse.ArgumentParser:
+    """
+    parser = argparse.ArgumentParser(
+        prog='phyphox-record',
+        description='Record buffers of phyphox phones in .npy files '
+                    '(one folder for each phone, see open_recording)')
+    parser.add_argument('phones', nargs='+', metavar='IP[:PORT]',
+                        help='phone address, port 8080 by default')
+    parser.add_argument('-b', '--buffer', action='append', default=None,
+                        help='buffer name, label or set name, glob '
+                             'patterns allowed, repeat for many buffers '
+                             '(default: all buffers)')
+    parser.add_argument('-o', '--output', default='recording',
+                        help='output folder (default: recording)')
+    parser.add_argument('-d', '--duration', type=float, default=None,
+                        help='recording time in seconds '
+                             '(default: until Ctrl-C or SIGTERM)')
+    parser.add_argument('--dtype', choices=('float64', 'float32'),
+                        default='float64',
+                        help='data type of files (default: float64)')
+    parser.add_argument('--clear', action='store_true',
+                        help='clear phone data before start')
+    parser.add_argument('--no-control', action='store_true',
+                        help='do not send start and stop commands')
+    parser.add_argument('--min-interval', type=float, default=0.05,
+                        help='minimum time between two requests in seconds')
+    parser.add_argument('--max-interval', type=float, default=1.0,
+                        help='maximum time between two requests in seconds')
+    parser.add_argument('--target-samples', type=int, default=50,
+                        help='number of new samples wanted in each answer')
+    parser.add_argument('--timeout', type=float, default=5.0,
+                        help='socket timeout of a request in seconds')
+    parser.add_argument('--retries', type=int, default=3,
+                        help='number of retries of a failed request')
+    parser.add_argument('--stats-interval', type=float, default=1.0,
+                        help='time between two statistics lines in seconds')
+    parser.add_argument('-v', '--verbose', action='store_true')
+    return parser
+
+
+def _stats_line(name, logger, recorder, acquisition, previous, duree):
+    """
+    Returns one statistics line and number of samples of a phone.
+    """
+    nb = sum(recorder.get_count(l_[0])
+             for l_ in logger.get_selected_names())
+    line = name + ": " + str(nb) + " samples " +\
+        "{:.1f}/s".format((nb - previous) / max(duree, 1e-6))
+    endpoint = logger.stats().get('endpoints', {}).get('/get')
+    if endpoint is not None:
+        line = line + " get p50 {:.1f} ms p95 {:.1f} ms".format(
+            1000 * endpoint['latency_p50'], 1000 * endpoint['latency_p95'])
+    if acquisition is not None:
+        line = line + " poll {:.0f} ms".format(1000 * acquisition.interval)
+        if acquisition.error is not None:
+            line = line + " error: " + str(acquisition.error)
+    return line, nb
+
+
+def main(argv=None):
+    """
+    phyphox-record entry point.
+
+    :param list argv: arguments (default: None sys.argv)
+    :return int: exit status
+    """
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(format="%(levelname)s: %(message)s",
+                        level=logging.INFO if args.verbose else
+                        logging.WARNING)
+    policy = RetryPolicy(retries=args.retries, timeout=args.timeout)
+    loggers = {}
+    for text in args.phones:
+        adresse, port = _parse_phone(text)
+        loggers[adresse + "_" + str(port)] = Logger(
+            adresse, port, keep_alive=True, dtype=np.float64, retry=policy)
+    group = LoggerGroup(loggers, timeout=args.timeout * (args.retries + 1))
+    recorders = {}
+    acquisitions = {}
+    stop_event = threading.Event()
+    previous_handler = None
+    try:
+        group.get_meta()
+        selection = group.buffer_needed(args.buffer)
+        for name in loggers:
+            if not selection.get(name):
+                print(name + ": no buffer selected " +
+                      str(group.errors.get(name, "")), file=sys.stderr)
+                return 2
+        if args.clear:
+            group.clear_data()
+        for name, logger in loggers.items():
+            recorders[name] = Recorder(os.path.join(args.output, name),
+                                       dtype=args.dtype)
+            logger.add_callback(recorders[name].write)
+            logger.enable_stats()
+        if not args.no_control:
+            group.start()
+        for name, logger in loggers.items():
+            acquisitions[name] = logger.start_acquisition(
+                min_interval=args.min_interval,
+                max_interval=args.max_interval,
+                target_samples=args.target_samples, queue_size=0)
+        try:
+            previous_handler = signal.signal(
+                signal.SIGTERM, lambda signum, frame: stop_event.set())
+        except ValueError:
+            # not in main thread
+            pass
+        debut = time.monotonic()
+        last = debut
+        counts = dict.fromkeys(loggers, 0)
+        try:
+            while not stop_event.is_set():
+                attente = args.stats_interval
+                if args.duration is not None:
+                    attente = min(attente,
+                                  debut + args.duration - time.monotonic())
+                    if attente <= 0:
+                        break
+                stop_event.wait(attente)
+                now = time.monotonic()
+                for name, logger in loggers.items():
+                    line, counts[name] = _stats_line(
+                        name, logger, recorders[name], acquisitions[name],
+                        counts[name], now - last)
+                    print("{:8.1f} s ".format(now - debut) + line,
+                          flush=True)
+                last = now
+        except KeyboardInterrupt:
+            pass
+        for logger in loggers.values():
+            logger.stop_acquisition()
+        if not args.no_control:
+            group.stop()
+        # samples received after last poll
+        group.call("read_buffers", False)
+        for name, logger in loggers.items():
+            print(_stats_line(name, logger, recorders[name], None,
+                              0, time.monotonic() - debut)[0] +
+                  " in " + os.path.join(args.output, name), flush=True)
+        return 0
+    finally:
+        if previous_handler is not None:
+            signal.signal(signal.SIGTERM, previous_handler)
+        for logger in loggers.values():
+            logger.stop_acquisition()
+        for recorder in recorders.values():
+            recorder.close()
+        group.close()
+        for logger in loggers.values():
+            logger.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
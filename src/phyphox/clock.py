@@ -0,0 +1,187 @@
+"""
+ClockSync class
+convert phone buffer times to host time
+"""
+import time
+import threading
+import collections
+import logging
+import numpy as np
+
+
+class ClockSync():
+    """
+    Offset and drift of a phone clock relative to host clock.
+    Buffer times are experiment times: /time events (Logger.get_time)
+    give phone system time of each start, so that experiment times
+    are converted to phone system time whatever the pauses.
+    Phone system time is compared to host clock NTP-style: a probe
+    asks last sample of time buffer and is dated with the middle of
+    host send and receive times. Only probes with the shortest round
+    trip times are kept and a line is fitted: offset and drift.
+    Error is about half the round trip time plus one sample period.
+    refresh can run in a background thread (start and stop).
+
+    :param Logger logger: phone
+    :param str time_name: name of a time buffer of a running sensor
+    :param int window: number of probes kept (default: 32)
+    :param float keep: fraction of probes with shortest round trip time used (default: 0.5)
+    :param clock: host clock function in seconds (default: time.time)
+    """
+    def __init__(self, logger, time_name, window=32, keep=0.5,
+                 clock=time.time):
+        if window < 1 or not 0 < keep <= 1:
+            raise ValueError("window >= 1 and 0 < keep <= 1")
+        #: phone
+        self.logger = logger
+        #: name of a time buffer
+        self.time_name = time_name
+        #: fraction of probes used
+        self.keep = keep
+        self.__clock = clock
+        #: phone system time minus host time in seconds
+        self.offset = None
+        #: host seconds minus phone seconds for one phone second
+        self.drift = 0.0
+        #: shortest round trip time of probes kept in seconds
+        self.rtt = None
+        self.__model = None
+        # experiment and system times of start events
+        self.__events = (np.zeros(1), np.zeros(1))
+        self.__probes = collections.deque(maxlen=window)
+        self.__lock = threading.Lock()
+        self.__stop = None
+        self.__thread = None
+
+    def __repr__(self):
+        return 'ClockSync(offset=' + str(self.offset) + ', drift=' +\
+            str(self.drift) + ', rtt=' + str(self.rtt) + ')'
+
+    def set_events(self, events):
+        """
+        Set time references of experiment (answer of /time).
+        Without start event, experiment time is used as phone time.
+
+        :param list events: dict with keys 'event', 'experimentTime' and 'systemTime'
+        """
+        starts = [(event['experimentTime'], event['systemTime'])
+                  for event in events if event.get('event') == 'START']
+        if not starts:
+            starts = [(0.0, 0.0)]
+        experiment, system = np.array(starts, dtype=np.float64).T
+        self.__events = (experiment, system)
+
+    def to_phone(self, temps):
+        """
+        Convert experiment times to phone system times.
+
+        :param temps: array like of experiment times in seconds
+        :return numpy.ndarray:
+        """
+        temps = np.asarray(temps, dtype=np.float64)
+        experiment, system = self.__events
+        idx = np.maximum(np.searchsorted(experiment, temps, side='right') - 1,
+                         0)
+        return system[idx] + (temps - experiment[idx])
+
+    def to_host(self, temps):
+        """
+        Convert experiment times to host times.
+
+        :param temps: array like of experiment times in seconds
+        :return numpy.ndarray:
+        :raise RuntimeError: if clock is not synchronized (refresh)
+        """
+        if self.__model is None:
+            raise RuntimeError("clock not synchronized: call refresh")
+        # one tuple: consistent values when refresh runs in a thread
+        ref, offset, drift = self.__model
+        phone = self.to_phone(temps)
+        return phone - offset + drift * (phone - ref)
+
+    def add_probe(self, phone, send, receive):
+        """
+        Add a probe and update offset and drift.
+
+        :param float phone: phone system time given in answer
+        :param float send: host time when request is sent
+        :param float receive: host time when answer is received
+        """
+        self.__probes.append((phone, (send + receive) / 2, receive - send))
+        probes = np.array(self.__probes)
+        rtt = probes[:, 2]
+        nb = max(int(np.ceil(self.keep * rtt.shape[0])), 1)
+        probes = probes[np.argsort(rtt, kind='stable')[:nb]]
+        phone, ecart = probes[:, 0], probes[:, 1] - probes[:, 0]
+        ref = phone.mean()
+        drift = 0.0
+        if nb > 1 and np.ptp(phone) > 0:
+            drift = np.polyfit(phone - ref, ecart, 1)[0]
+        offset = -ecart.mean()
+        self.__model = (ref, offset, drift)
+        self.offset, self.drift = offset, drift
+        self.rtt = probes[0, 2]
+
+    def probe(self):
+        """
+        Send one probe: last sample of time buffer.
+
+        :return bool: False if time buffer is empty
+        """
+        send = self.__clock()
+        reponse = self.logger._request("/get?" + self.time_name)
+        receive = self.__clock()
+        buffer = self.logger._decode_json(reponse)['buffer']
+        values = buffer[self.time_name]['buffer']
+        if not values or values[-1] is None:
+            return False
+        self.add_probe(float(self.to_phone(values[-1])), send, receive)
+        return True
+
+    def refresh(self, nb_probe=8):
+        """
+        Read time references and send probes.
+
+        :param int nb_probe: number of probes (default: 8)
+        :return float: offset, None if clock is not synchronized
+        """
+        with self.__lock:
+            self.set_events(self.logger.get_time())
+            for _ in range(nb_probe):
+                self.probe()
+            logging.debug("%s", self)
+            return self.offset
+
+    def start(self, interval=10.0, nb_probe=4):
+        """
+        Refresh offset and drift in a background thread.
+
+        :param float interval: time between two refreshes in seconds (default: 10.0)
+        :param int nb_probe: number of probes of each refresh (default: 4)
+        """
+        if self.__thread is not None:
+            return
+        self.__stop = threading.Event()
+        self.__thread = threading.Thread(target=self.__run,
+                                         args=(interval, nb_probe),
+                                         name="phyphox-clock", daemon=True)
+        self.__thread.start()
+
+    def __run(self, interval, nb_probe):
+        while True:
+            try:
+                self.refresh(nb_probe)
+            except (OSError, ValueError, KeyError) as error:
+                logging.warning("Clock refresh failed: %s", str(error))
+            if self.__stop.wait(interval):
+                return
+
+    def stop(self):
+        """
+        Stop background thread.
+        """
+        if self.__thread is None:
+            return
+        self.__stop.set()
+        self.__thread.join()
+        self.__thread = None
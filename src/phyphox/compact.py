@@ -0,0 +1,365 @@
+"""
+CompactBuffer class
+compressed storage of acquired data
+"""
+import zlib
+import numpy as np
+
+
+def _narrow(tab):
+    """
+    Returns integers in the smallest signed type holding them.
+    """
+    if tab.shape[0] == 0:
+        return tab.astype(np.int8)
+    vmin, vmax = tab.min(), tab.max()
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= vmin and vmax <= info.max:
+            return tab.astype(dtype)
+    return tab
+
+
+class Float32Encoding():
+    """
+    Values are stored as float32: half memory, about 7 significant digits.
+    """
+    #: numpy data type of decoded samples
+    dtype = np.dtype(np.float32)
+
+    def encode(self, values):
+        """
+        :param numpy.ndarray values: samples
+        :return numpy.ndarray: encoded samples
+        """
+        return values.astype(np.float32)
+
+    def decode(self, encoded, nb):
+        """
+        :param encoded: result of encode
+        :param int nb: number of samples
+        :return numpy.ndarray: samples
+        """
+        return encoded
+
+    def nbytes(self, encoded):
+        """
+        :return int: memory used by encoded samples
+        """
+        return encoded.nbytes
+
+
+class DeltaEncoding():
+    """
+    Delta-of-delta encoding of times: times are rounded to resolution,
+    for nearly uniform times differences of consecutive intervals are
+    small integers stored in 1 or 2 bytes. With resolution None, bits
+    of float64 values are used: encoding is exact but less compact.
+    Blocks with non finite times (NaN, inf) or times too large for
+    resolution are encoded with bits of float64 values.
+
+    :param float resolution: time resolution in seconds (default: 1e-6)
+    """
+    #: numpy data type of decoded samples
+    dtype = np.dtype(np.float64)
+
+    def __init__(self, resolution=1e-6):
+        #: time resolution in seconds, None exact encoding
+        self.resolution = resolution
+
+    def encode(self, values):
+        """
+        :param numpy.ndarray values: samples
+        :return numpy.ndarray: encoded samples
+        """
+        values = values.astype(np.float64)
+        # False for NaN and inf
+        exact = self.resolution is None or\
+            not (np.abs(values) < 2.0 ** 62 * self.resolution).all()
+        if exact:
+            ints = values.view(np.int64)
+        else:
+            ints = np.round(values / self.resolution).astype(np.int64)
+        head = np.zeros(3, dtype=np.int64)
+        head[0] = exact
+        head[1:1 + min(ints.shape[0], 1)] = ints[:1]
+        head[2:2 + len(np.diff(ints[:2]))] = np.diff(ints[:2])
+        dod = _narrow(np.diff(ints, 2))
+        # encoding mode, first value and first interval are stored in
+        # dod type
+        return np.concatenate((head.view(dod.dtype), dod))
+
+    def decode(self, encoded, nb):
+        """
+        :param encoded: result of encode
+        :param int nb: number of samples
+        :return numpy.ndarray: samples
+        """
+        nb_head = 24 // encoded.dtype.itemsize
+        exact, first, interval = encoded[:nb_head].view(np.int64)
+        deltas = np.empty(max(nb - 1, 0), dtype=np.int64)
+        deltas[:1] = interval
+        np.cumsum(encoded[nb_head:], out=deltas[1:], dtype=np.int64)
+        deltas[1:] = deltas[1:] + interval
+        ints = np.empty(nb, dtype=np.int64)
+        ints[:1] = first
+        np.cumsum(deltas, out=ints[1:])
+        ints[1:] = ints[1:] + first
+        if exact:
+            return ints.view(np.float64)
+        return ints * self.resolution
+
+    def nbytes(self, encoded):
+        """
+        :return int: memory used by encoded samples
+        """
+        return encoded.nbytes
+
+
+class ZlibEncoding():
+    """
+    Block compression with zlib of samples encoded by inner encoding.
+    Bytes are shuffled before compression (first bytes of all samples,
+    then second bytes...) for a better compression ratio.
+
+    :param inner: encoding applied before compression (default: None samples)
+    :param int level: zlib compression level (default: 6)
+    """
+    def __init__(self, inner=None, level=6):
+        #: encoding applied before compression
+        self.inner = inner
+        #: zlib compression level
+        self.level = level
+
+    @property
+    def dtype(self):
+        """
+        numpy data type of decoded samples, None type of samples encoded
+        """
+        return getattr(self.inner, 'dtype', None)
+
+    def encode(self, values):
+        """
+        :param numpy.ndarray values: samples
+        :return: encoded samples
+        """
+        if self.inner is not None:
+            values = self.inner.encode(values)
+        shuffled = values.view(np.uint8).reshape(-1, values.dtype.itemsize)
+        return (zlib.compress(shuffled.T.tobytes(), self.level),
+                values.dtype)
+
+    def decode(self, encoded, nb):
+        """
+        :param encoded: result of encode
+        :param int nb: number of samples
+        :return numpy.ndarray: samples
+        """
+        data, dtype = encoded
+        shuffled = np.frombuffer(zlib.decompress(data), dtype=np.uint8)
+        values = shuffled.reshape(dtype.itemsize, -1).T.copy().view(dtype)
+        values = values.ravel()
+        if self.inner is not None:
+            return self.inner.decode(values, nb)
+        return values
+
+    def nbytes(self, encoded):
+        """
+        :return int: memory used by encoded samples
+        """
+        return len(encoded[0])
+
+
+#: encodings known by name, combined with + (e.g. 'float32+zlib')
+ENCODINGS = {'float32': Float32Encoding,
+             'delta': DeltaEncoding,
+             'zlib': ZlibEncoding}
+
+
+def get_encoding(encoding):
+    """
+    Build an encoding from its name.
+
+    :param encoding: name in ENCODINGS, names joined with + or encoding object
+    :return: encoding object, None if encoding is None
+    """
+    if not isinstance(encoding, str):
+        return encoding
+    result = None
+    for name in encoding.split('+'):
+        if name not in ENCODINGS:
+            raise ValueError("encoding must be in " + str(list(ENCODINGS)))
+        if name == 'zlib':
+            result = ZlibEncoding(result)
+        elif result is None:
+            result = ENCODINGS[name]()
+        else:
+            raise ValueError("only zlib can follow another encoding")
+    return result
+
+
+class CompactBuffer():
+    """
+    Growing buffer storing samples in blocks: when block_size samples
+    are received, they are encoded (frozen block) and the numpy array
+    is released. Blocks are decoded only when samples are read and
+    the last block decoded is kept for following reads. Same methods
+    as RingBuffer but arrays returned are decoded copies, all with the
+    data type of decoded samples (e.g. float32 for 'float32' encoding).
+
+    :param encoding: name in ENCODINGS, names joined with + or encoding object (default: None samples are not encoded)
+    :param int block_size: number of samples of a block (default: 65536)
+    :param dtype: numpy data type of samples received (default: numpy.float64)
+    """
+    def __init__(self, encoding=None, block_size=65536, dtype=np.float64):
+        if block_size < 2:
+            raise ValueError("block_size must be greater than 1")
+        #: encoding of frozen blocks (None not encoded)
+        self.encoding = get_encoding(encoding)
+        #: number of samples of a block
+        self.block_size = int(block_size)
+        self.__dtype = np.dtype(dtype)
+        # samples not yet encoded are returned with type of decoded samples
+        self.__out_dtype = getattr(self.encoding, 'dtype', None)
+        if self.__out_dtype is None:
+            self.__out_dtype = self.__dtype
+        #: number of samples appended since creation
+        self.total = 0
+        self.clear()
+
+    def __len__(self):
+        return self.total - self.__first
+
+    def __repr__(self):
+        return 'CompactBuffer(size=' + str(len(self)) + ', nbytes=' +\
+            str(self.nbytes) + ', blocks=' + str(len(self.__blocks)) + ')'
+
+    @property
+    def dtype(self):
+        """
+        numpy data type of samples received
+        """
+        return self.__dtype
+
+    @property
+    def nbytes(self):
+        """
+        memory used by encoded blocks and samples not yet encoded
+        """
+        return self.__frozen_bytes +\
+            sum(values.nbytes for values in self.__active)
+
+    def append(self, values):
+        """
+        Append samples at the end of buffer.
+
+        :param values: array like of samples
+        """
+        values = np.asarray(values, dtype=self.__dtype).ravel()
+        if values.shape[0] == 0:
+            return
+        self.total = self.total + values.shape[0]
+        self.__active.append(values)
+        self.__nb_active = self.__nb_active + values.shape[0]
+        if self.__nb_active < self.block_size:
+            return
+        values = np.concatenate(self.__active)
+        nb_block = values.shape[0] // self.block_size
+        for block in np.split(values[:nb_block * self.block_size], nb_block):
+            self.__freeze(block)
+        rest = values[nb_block * self.block_size:].copy()
+        self.__active = [rest] if rest.shape[0] else []
+        self.__nb_active = rest.shape[0]
+
+    def __freeze(self, block):
+        if self.encoding is None:
+            encoded = block.copy()
+            self.__frozen_bytes = self.__frozen_bytes + encoded.nbytes
+        else:
+            encoded = self.encoding.encode(block)
+            self.__frozen_bytes = self.__frozen_bytes +\
+                self.encoding.nbytes(encoded)
+        self.__blocks.append(encoded)
+
+    def __block(self, idx):
+        if self.__cache[0] != idx:
+            block = self.__blocks[idx]
+            if self.encoding is not None:
+                block = self.encoding.decode(block, self.block_size)
+            self.__cache = (idx, block)
+        return self.__cache[1]
+
+    def get(self, debut=0, fin=None):
+        """
+        Returns decoded samples from debut to fin.
+        Indices are positions in all samples appended since creation.
+
+        :param int debut: index of first sample (default: 0)
+        :param int fin: index after last sample (default: None end)
+        :return numpy.ndarray:
+        """
+        if fin is None or fin > self.total:
+            fin = self.total
+        debut = max(debut, self.__first)
+        if debut >= fin:
+            return np.empty(0, dtype=self.__out_dtype)
+        # positions in blocks
+        debut, fin = debut - self.__first, fin - self.__first
+        frozen = len(self.__blocks) * self.block_size
+        tabs = []
+        for idx in range(debut // self.block_size,
+                         min(-(-fin // self.block_size), len(self.__blocks))):
+            start = idx * self.block_size
+            tabs.append(self.__block(idx)[max(debut - start, 0):
+                                          fin - start])
+        if fin > frozen:
+            active = self.__active[0] if len(self.__active) == 1 else\
+                np.concatenate(self.__active)
+            tabs.append(active[max(debut - frozen, 0):fin - frozen])
+        if len(tabs) == 1:
+            return tabs[0].astype(self.__out_dtype)
+        return np.concatenate(tabs, dtype=self.__out_dtype)
+
+    def last(self, nb=None):
+        """
+        Returns the last nb samples.
+
+        :param int nb: number of samples (default: None all samples)
+        :return numpy.ndarray:
+        """
+        if nb is None or nb > len(self):
+            nb = len(self)
+        return self.get(self.total - nb)
+
+    def view(self, nb=None):
+        """
+        Returns a read-only array of the last nb samples.
+
+        :param int nb: number of samples (default: None all samples)
+        :return numpy.ndarray:
+        """
+        tab = self.last(nb)
+        tab.flags.writeable = False
+        return tab
+
+    def since(self, index):
+        """
+        Returns a read-only array of samples from index.
+
+        :param int index: index of first sample
+        :return numpy.ndarray:
+        """
+        tab = self.get(max(index, 0))
+        tab.flags.writeable = False
+        return tab
+
+    def clear(self):
+        """
+        Remove all samples.
+        """
+        self.__first = self.total
+        self.__blocks = []
+        self.__frozen_bytes = 0
+        self.__active = []
+        self.__nb_active = 0
+        self.__cache = (None, None)
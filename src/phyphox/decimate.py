@@ -0,0 +1,207 @@
+"""
+Decimator class
+multi-resolution summaries of a buffer for live plotting
+"""
+import numpy as np
+from .ringbuffer import RingBuffer
+
+
+def lttb(temps, values, anchor, nb_bucket, bucket):
+    """
+    Largest-Triangle-Three-Buckets on nb_bucket complete buckets of
+    bucket samples. Samples after the last bucket are used as next
+    bucket (their mean), at least one bucket must follow.
+
+    :param numpy.ndarray temps: times, at least (nb_bucket + 1) * bucket samples
+    :param numpy.ndarray values: values
+    :param tuple anchor: (time, value) selected in previous bucket, None first sample of first bucket
+    :param int nb_bucket: number of buckets to reduce
+    :param int bucket: number of samples in a bucket
+    :return: times and values selected (one for each bucket)
+    """
+    fin = nb_bucket * bucket
+    tab_t = temps[:fin].reshape(nb_bucket, bucket)
+    tab_v = values[:fin].reshape(nb_bucket, bucket)
+    # mean of next bucket for each bucket
+    next_t = np.append(tab_t[1:].mean(axis=1),
+                       temps[fin:fin + bucket].mean())
+    next_v = np.append(tab_v[1:].mean(axis=1),
+                       values[fin:fin + bucket].mean())
+    selected = np.empty(nb_bucket, dtype=np.intp)
+    if anchor is None:
+        anchor = (tab_t[0, 0], tab_v[0, 0])
+    anchor_t, anchor_v = anchor
+    for idx in range(nb_bucket):
+        # twice triangle area, anchor is selected point of previous bucket
+        area = np.abs((anchor_t - next_t[idx]) * (tab_v[idx] - anchor_v) -
+                      (anchor_t - tab_t[idx]) * (next_v[idx] - anchor_v))
+        selected[idx] = area.argmax()
+        anchor_t = tab_t[idx, selected[idx]]
+        anchor_v = tab_v[idx, selected[idx]]
+    rows = np.arange(nb_bucket)
+    return tab_t[rows, selected], tab_v[rows, selected]
+
+
+class _Level():
+    """
+    One resolution: summaries are computed by buckets of bucket
+    samples (or buckets) of previous level.
+    """
+    def __init__(self, bucket, capacity):
+        self.bucket = bucket
+        policy = 'grow' if capacity is None else 'overwrite'
+        capacity = capacity or 1024
+        # time and value of min, time and value of max of each bucket
+        self.minmax = [RingBuffer(capacity, policy=policy) for idx in range(4)]
+        # point selected by LTTB in each bucket
+        self.lttb = [RingBuffer(capacity, policy=policy) for idx in range(2)]
+        self.pending_minmax = [np.empty(0) for idx in range(4)]
+        self.pending_lttb = [np.empty(0) for idx in range(2)]
+        self.anchor = None
+
+    def add_minmax(self, tmin, vmin, tmax, vmax):
+        pending = [np.concatenate((old, new)) for old, new in
+                   zip(self.pending_minmax, (tmin, vmin, tmax, vmax))]
+        nb = pending[0].shape[0] // self.bucket
+        self.pending_minmax = [tab[nb * self.bucket:] for tab in pending]
+        if nb == 0:
+            return None
+        rows = np.arange(nb)
+        tmin, vmin, tmax, vmax = [tab[:nb * self.bucket].reshape(
+            nb, self.bucket) for tab in pending]
+        idx_min = vmin.argmin(axis=1)
+        idx_max = vmax.argmax(axis=1)
+        result = (tmin[rows, idx_min], vmin[rows, idx_min],
+                  tmax[rows, idx_max], vmax[rows, idx_max])
+        for ring, tab in zip(self.minmax, result):
+            ring.append(tab)
+        return result
+
+    def add_lttb(self, temps, values):
+        temps, values = [np.concatenate((old, new)) for old, new in
+                         zip(self.pending_lttb, (temps, values))]
+        # last complete bucket waits for next bucket mean
+        nb = temps.shape[0] // self.bucket - 1
+        if nb <= 0:
+            self.pending_lttb = [temps, values]
+            return None
+        result = lttb(temps, values, self.anchor, nb, self.bucket)
+        self.anchor = (result[0][-1], result[1][-1])
+        self.pending_lttb = [temps[nb * self.bucket:],
+                             values[nb * self.bucket:]]
+        for ring, tab in zip(self.lttb, result):
+            ring.append(tab)
+        return result
+
+
+class Decimator():
+    """
+    Multi-resolution summaries of one buffer updated incrementally:
+    level k summarises buckets of base * factor ** k samples, with
+    min and max of each bucket and one point selected by
+    Largest-Triangle-Three-Buckets (LTTB). A level is built from previous
+    level, so each sample is processed once. get returns the finest
+    level giving at most max_points points in a time range (buckets
+    of coarsest level are merged if needed): time depends on number of
+    buckets of coarsest level only. Samples of an incomplete bucket
+    are not shown.
+
+    :param int base: number of samples in a bucket of level 0 (default: 16)
+    :param int factor: number of buckets of a level in a bucket of next level (default: 4)
+    :param int nb_level: number of levels (default: 8)
+    :param int capacity: number of buckets kept for each level, None all (default: None)
+    """
+    METHODS = ('minmax', 'lttb')
+
+    def __init__(self, base=16, factor=4, nb_level=8, capacity=None):
+        if base < 2 or factor < 2 or nb_level < 1:
+            raise ValueError("base >= 2, factor >= 2 and nb_level >= 1")
+        self.__levels = [_Level(base if idx == 0 else factor, capacity)
+                         for idx in range(nb_level)]
+        #: number of samples received
+        self.total = 0
+
+    def __repr__(self):
+        return 'Decimator(levels=' + str([len(level.minmax[0])
+                                          for level in self.__levels]) + ')'
+
+    def append(self, temps, values):
+        """
+        Add new samples.
+
+        :param temps: array like of times
+        :param values: array like of values
+        """
+        temps = np.asarray(temps, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        self.total = self.total + temps.shape[0]
+        minmax = (temps, values, temps, values)
+        points = (temps, values)
+        for level in self.__levels:
+            if minmax is not None:
+                minmax = level.add_minmax(*minmax)
+            if points is not None:
+                points = level.add_lttb(*points)
+            if minmax is None and points is None:
+                break
+
+    def get_level(self, level, method='minmax'):
+        """
+        Returns all summaries of a level.
+
+        :param int level: level index, 0 finest
+        :param str method: 'minmax' or 'lttb' (default: 'minmax')
+        :return list: read-only arrays (time of min, min, time of max, max) for 'minmax' or (time, value) for 'lttb'
+        """
+        if method not in Decimator.METHODS:
+            raise ValueError("method must be in " + str(Decimator.METHODS))
+        if method == 'minmax':
+            return [ring.view() for ring in self.__levels[level].minmax]
+        return [ring.view() for ring in self.__levels[level].lttb]
+
+    def get(self, debut=None, fin=None, max_points=2000, method='minmax'):
+        """
+        Returns points to plot between debut and fin.
+
+        :param float debut: first time (default: None beginning)
+        :param float fin: last time (default: None end)
+        :param int max_points: maximum number of points (default: 2000)
+        :param str method: 'minmax' min and max of each bucket in time order or 'lttb' (default: 'minmax')
+        :return: numpy arrays of times and values
+        """
+        nb_point = 2 if method == 'minmax' else 1
+        for level in range(len(self.__levels)):
+            tabs = self.get_level(level, method)
+            lo = 0 if debut is None else np.searchsorted(tabs[0], debut)
+            hi = tabs[0].shape[0] if fin is None else\
+                np.searchsorted(tabs[0], fin, side='right')
+            if (hi - lo) * nb_point <= max_points:
+                break
+        tabs = [tab[lo:hi] for tab in tabs]
+        nb = tabs[0].shape[0]
+        # coarsest level too large: buckets are merged by group of size
+        size = -(-nb * nb_point // max_points)
+        if method == 'lttb':
+            if size > 1 and nb // size > 1:
+                temps, values = lttb(tabs[0], tabs[1], None,
+                                     nb // size - 1, size)
+                return np.append(temps, tabs[0][-1]),\
+                    np.append(values, tabs[1][-1])
+            return tabs[0].copy(), tabs[1].copy()
+        if size > 1:
+            # edge padding does not change min and max of a group
+            pad = -nb % size
+            tabs = [np.pad(tab, (0, pad), mode='edge').reshape(-1, size)
+                    for tab in tabs]
+            rows = np.arange(tabs[0].shape[0])
+            idx_min = tabs[1].argmin(axis=1)
+            idx_max = tabs[3].argmax(axis=1)
+            tabs = [tabs[0][rows, idx_min], tabs[1][rows, idx_min],
+                    tabs[2][rows, idx_max], tabs[3][rows, idx_max]]
+        tmin, vmin, tmax, vmax = tabs
+        first = tmin <= tmax
+        temps = np.column_stack((np.where(first, tmin, tmax),
+                                 np.where(first, tmax, tmin)))
+        values = np.column_stack((np.where(first, vmin, vmax),
+                                  np.where(first, vmax, vmin)))
+        return temps.ravel(), values.ravel()
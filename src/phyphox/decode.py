@@ -0,0 +1,138 @@
+"""
+Fast decoding of /get answers
+number arrays are converted in numpy arrays without building python lists
+"""
+import json
+import warnings
+import numpy as np
+
+
+def _parse_numbers(text, dtype):
+    """
+    Convert comma separated numbers in a numpy array.
+
+    :param bytes text: numbers without brackets
+    :param dtype: numpy data type
+    :return numpy.ndarray:
+    """
+    if not text.strip():
+        return np.empty(0, dtype=dtype)
+    nb = text.count(b',') + 1
+    if b'null' in text:
+        # phyphox sends null for NaN values
+        text = text.replace(b'null', b'nan')
+    try:
+        with warnings.catch_warnings():
+            # numpy < 2 warns instead of raising ValueError
+            warnings.simplefilter("error", DeprecationWarning)
+            tab = np.fromstring(text, dtype=dtype, sep=',')
+    except (ValueError, DeprecationWarning):
+        tab = None
+    if tab is None or tab.shape[0] != nb:
+        tab = np.array(json.loads(b'[' + text.replace(b'nan', b'NaN') +
+                                  b']'), dtype=dtype)
+    return tab
+
+
+def find_buffer(reponse, name, start=0):
+    """
+    Find number array of buffer name in /get answer.
+
+    :param bytes reponse: phone answer
+    :param str name: buffer name
+    :param int start: position where search begins (default: 0)
+    :return tuple: (first, last) position of numbers between brackets
+    :raise KeyError: if buffer is not in answer
+    """
+    key = b'"' + name.encode() + b'"'
+    pos = reponse.find(key, start)
+    while pos >= 0:
+        # a key is followed by a colon
+        after = pos + len(key)
+        while reponse[after:after + 1].isspace():
+            after = after + 1
+        if reponse[after:after + 1] == b':':
+            break
+        pos = reponse.find(key, pos + 1)
+    if pos < 0:
+        raise KeyError(name)
+    pos = reponse.find(b'"buffer"', pos + len(key))
+    first = reponse.find(b'[', pos)
+    last = reponse.find(b']', first)
+    if pos < 0 or first < 0 or last < 0:
+        raise KeyError(name)
+    return first + 1, last
+
+
+def decode_buffers(reponse, names, dtype=np.float64):
+    """
+    Decode buffers of a /get answer in numpy arrays.
+    Only number arrays of names are parsed, json tree is never built.
+
+    :param bytes reponse: phone answer
+    :param list names: buffer names
+    :param dtype: numpy data type (default: numpy.float64)
+    :return dict: numpy array for each buffer name
+    :raise KeyError: if a buffer is not in answer
+    """
+    if isinstance(reponse, str):
+        reponse = reponse.encode()
+    start = max(reponse.find(b'"buffer"'), 0)
+    pos = start
+    columns = {}
+    for name in names:
+        try:
+            # buffers are usually in request order: one pass on answer
+            first, last = find_buffer(reponse, name, pos)
+        except KeyError:
+            first, last = find_buffer(reponse, name, start)
+        columns[name] = _parse_numbers(reponse[first:last], dtype)
+        pos = last
+    return columns
+
+
+class ArrayStream():
+    """
+    Incremental decoder of an answer with one number array
+    (/get request for one buffer). Blocks are fed as they arrive,
+    numbers are returned as soon as they are complete.
+
+    :param dtype: numpy data type (default: numpy.float64)
+    """
+    def __init__(self, dtype=np.float64):
+        self.__dtype = dtype
+        self.__rest = b''
+        self.__started = False
+        #: True when end of array is found
+        self.done = False
+
+    def feed(self, block):
+        """
+        Decode a new block of answer.
+
+        :param bytes block: next bytes of answer
+        :return numpy.ndarray: numbers completed by this block
+        """
+        if self.done:
+            return np.empty(0, dtype=self.__dtype)
+        if not self.__started:
+            pos = block.find(b'[')
+            if pos < 0:
+                return np.empty(0, dtype=self.__dtype)
+            self.__started = True
+            block = block[pos + 1:]
+        pos = block.find(b']')
+        if pos >= 0:
+            self.done = True
+            text = self.__rest + block[:pos]
+            self.__rest = b''
+        else:
+            text = self.__rest + block
+            # last number can be incomplete
+            pos = text.rfind(b',')
+            if pos < 0:
+                self.__rest = text
+                return np.empty(0, dtype=self.__dtype)
+            self.__rest = text[pos + 1:]
+            text = text[:pos]
+        return _parse_numbers(text, self.__dtype)
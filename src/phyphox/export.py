@@ -0,0 +1,141 @@
+"""
+ExportReader class
+lazy reader of phyphox export files (zip of csv files)
+"""
+import io
+import csv
+import zipfile
+import numpy as np
+
+#: separator and decimal mark for each export file type
+EXPORT_FORMATS = {1: (',', '.'),
+                  2: ('\t', '.'),
+                  3: (';', '.'),
+                  4: ('\t', ','),
+                  5: (';', ',')}
+
+
+class ExportReader():
+    """
+    Lazy reader of a zip file written by Logger.export_file (file type 1 to 5).
+    Opening reads only header lines. A column is decoded in a numpy array
+    when it is asked, reading its csv file line by line without
+    extracting the archive in memory. Decoded columns are kept.
+
+    :param str filename: zip file name
+    :param int filetype: file type used in export_file (default: None detected using csv header)
+    """
+    def __init__(self, filename, filetype=None):
+        if filetype is not None and filetype not in EXPORT_FORMATS:
+            raise ValueError("filetype must be in " +
+                             str(list(EXPORT_FORMATS)))
+        self.__zip = zipfile.ZipFile(filename)
+        self.__filetype = filetype
+        self.__members = {}
+        for member in self.__zip.namelist():
+            if member.endswith(".csv"):
+                self.__members[member[:-4]] = member
+        self.__formats = {}
+        self.__columns = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Close zip file.
+        """
+        self.__zip.close()
+
+    def __lines(self, set_name):
+        return io.TextIOWrapper(self.__zip.open(self.__members[set_name]),
+                                encoding='utf-8-sig', newline='')
+
+    def __format(self, set_name):
+        if set_name not in self.__formats:
+            if set_name not in self.__members:
+                raise KeyError(set_name)
+            with self.__lines(set_name) as text:
+                header = text.readline()
+                first_line = text.readline()
+            if self.__filetype is not None:
+                separator, decimal = EXPORT_FORMATS[self.__filetype]
+            else:
+                # separator giving the largest number of labels
+                separator = max(('\t', ';', ','), key=lambda sep: len(
+                    next(csv.reader([header], delimiter=sep))))
+                decimal = '.'
+                if separator != ',' and ',' in first_line:
+                    decimal = ','
+            labels = next(csv.reader([header], delimiter=separator))
+            self.__formats[set_name] = (labels, separator, decimal)
+        return self.__formats[set_name]
+
+    def sets(self):
+        """
+        Returns names of csv files in archive (without .csv).
+
+        :return list:
+        """
+        return list(self.__members)
+
+    def labels(self, set_name):
+        """
+        Returns column labels of a csv file.
+
+        :param str set_name: csv file name (see sets)
+        :return list:
+        """
+        return list(self.__format(set_name)[0])
+
+    def load(self, set_name, columns=None):
+        """
+        Decode columns of a csv file in one reading.
+
+        :param str set_name: csv file name (see sets)
+        :param list columns: labels or indexes of columns (default: None all columns)
+        :return dict: numpy array for each label
+        """
+        labels, separator, decimal = self.__format(set_name)
+        if columns is None:
+            columns = labels
+        indexes = [labels.index(col) if isinstance(col, str) else col
+                   for col in columns]
+        needed = [idx for idx in dict.fromkeys(indexes)
+                  if (set_name, idx) not in self.__columns]
+        if needed:
+            with self.__lines(set_name) as text:
+                lines = text
+                if decimal == ',':
+                    lines = (line.replace(',', '.') for line in text)
+                try:
+                    tab = np.loadtxt(lines, delimiter=separator, skiprows=1,
+                                     usecols=needed, ndmin=2, quotechar='"')
+                except ValueError:
+                    tab = None
+            if tab is None:
+                # empty values: slower reader replacing them by NaN
+                with self.__lines(set_name) as text:
+                    lines = text
+                    if decimal == ',':
+                        lines = (line.replace(',', '.') for line in text)
+                    tab = np.genfromtxt(lines, delimiter=separator,
+                                        skip_header=1, usecols=needed,
+                                        ndmin=2)
+            for pos, idx in enumerate(needed):
+                self.__columns[(set_name, idx)] = tab[:, pos].copy()
+        return {labels[idx]: self.__columns[(set_name, idx)]
+                for idx in indexes}
+
+    def get(self, set_name, column):
+        """
+        Decode one column of a csv file.
+
+        :param str set_name: csv file name (see sets)
+        :param column: label or index of column
+        :return numpy.ndarray:
+        """
+        return next(iter(self.load(set_name, [column]).values()))
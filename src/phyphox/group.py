@@ -0,0 +1,236 @@
+"""
+LoggerGroup class
+to drive many phones at the same time
+"""
+import concurrent.futures
+import logging
+import numpy as np
+from .phyphox import BufferMode
+
+
+class LoggerGroup():
+    """
+    Group of Logger. Commands are sent to all phones concurrently
+    using a thread pool. A phone still busy with a previous command
+    is skipped and reported in slow, a phone which cannot be
+    reached is reported in unreachable, others are not blocked.
+    Answer of a slow phone is given by next call: in its result if
+    the same method is called, in late otherwise.
+
+    :param loggers: dict of Logger (key is phone name) or list of Logger (key is base_url)
+    :param float timeout: time in seconds to wait answers in one call (default: None wait all answers)
+    :param int max_workers: number of threads (default: None one thread per phone)
+    """
+    def __init__(self, loggers=None, timeout=None, max_workers=None):
+        self.__loggers = {}
+        if isinstance(loggers, dict):
+            self.__loggers.update(loggers)
+        elif loggers is not None:
+            for logger in loggers:
+                self.__loggers[logger.base_url] = logger
+        #: time in seconds to wait answers in one call
+        self.timeout = timeout
+        self.__max_workers = max_workers
+        self.__executor = None
+        self.__pending = {}
+        #: phones without answer at the end of last call
+        self.slow = set()
+        #: phones with a connection error in last call
+        self.unreachable = set()
+        #: exception raised by each phone in last call
+        self.errors = {}
+        #: late answers of previous calls: (method, result) for each phone
+        self.late = {}
+
+    def __len__(self):
+        return len(self.__loggers)
+
+    def __getitem__(self, name):
+        return self.__loggers[name]
+
+    def __iter__(self):
+        return iter(self.__loggers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def add(self, logger, name=None):
+        """
+        Add a phone in group.
+
+        :param Logger logger: phone to add
+        :param str name: phone name (default: None logger.base_url is used)
+        """
+        if name is None:
+            name = logger.base_url
+        self.__loggers[name] = logger
+
+    def remove(self, name):
+        """
+        Remove a phone from group.
+
+        :param str name: phone name
+        :return Logger: removed logger
+        """
+        self.__pending.pop(name, None)
+        return self.__loggers.pop(name)
+
+    def __late(self, method):
+        """
+        Remove calls of slow phones ended since last call from pending.
+        Returns results of method, other results are kept in late.
+        """
+        results = {}
+        for name, (late_method, future) in list(self.__pending.items()):
+            if not future.done():
+                continue
+            del self.__pending[name]
+            if future.exception() is not None:
+                logging.info("%s %s: %s", name, late_method,
+                             str(future.exception()))
+            elif late_method == method:
+                results[name] = future.result()
+            else:
+                self.late[name] = (late_method, future.result())
+        return results
+
+    def call(self, method, *args, **kwargs):
+        """
+        Call a Logger method for all phones concurrently.
+        Results of the same method not received in previous calls
+        are given with new results (new result is kept for a phone
+        answering both).
+
+        :param str method: Logger method name
+        :return dict: result for each phone which answered without error
+        """
+        self.late = {}
+        return self.__call(method, self.__late(method), args, kwargs)
+
+    def __call(self, method, results, args, kwargs):
+        if self.__executor is None:
+            workers = self.__max_workers or max(len(self.__loggers), 1)
+            self.__executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="phyphox")
+        self.slow = set()
+        self.unreachable = set()
+        self.errors = {}
+        futures = {}
+        for name, logger in self.__loggers.items():
+            if name in self.__pending:
+                # Logger is not thread safe: wait end of previous call
+                self.slow.add(name)
+                continue
+            futures[name] = self.__executor.submit(getattr(logger, method),
+                                                   *args, **kwargs)
+        concurrent.futures.wait(futures.values(), timeout=self.timeout)
+        for name, future in futures.items():
+            if not future.done():
+                self.slow.add(name)
+                self.__pending[name] = (method, future)
+            elif future.exception() is not None:
+                self.errors[name] = future.exception()
+                if isinstance(future.exception(), OSError):
+                    self.unreachable.add(name)
+                logging.info("%s %s: %s", name, method,
+                             str(future.exception()))
+            else:
+                results[name] = future.result()
+        return results
+
+    def start(self):
+        """
+        Sends the start command to all phones.
+
+        :return dict: JSON response for each phone
+        """
+        return self.call("start")
+
+    def stop(self):
+        """
+        Sends the stop command to all phones.
+
+        :return dict: JSON response for each phone
+        """
+        return self.call("stop")
+
+    def clear_data(self):
+        """
+        Sends the clear command to all phones.
+
+        :return dict: JSON response for each phone
+        """
+        return self.call("clear_data")
+
+    def get_meta(self, force_update=False):
+        """
+        Get meta information from all phones.
+
+        :param bool force_update: True retrieve data from mobile phone otherwise use old data.
+        """
+        return self.call("get_meta", force_update)
+
+    def get_config(self, force_update=False):
+        """
+        Retrieves configuration data from all phones.
+
+        :param bool force_update: True retrieve data from mobile phone otherwise use old data.
+        """
+        return self.call("get_config", force_update)
+
+    def buffer_needed(self, l_exp=None):
+        """
+        Selects the same buffers for all phones. See Logger.buffer_needed
+
+        :param list l_exp: list of tuple. default value is None
+        :return dict: False for phone if something wrong in list
+        """
+        return self.call("buffer_needed", l_exp)
+
+    def read_buffers(self, stack_data=True, mode_data=BufferMode.UPDATE):
+        """
+        Read selected buffers of all phones and returns new data.
+        See Logger.read_buffers
+
+        :param bool stack_data: True data are pushed in a list otherwise only last data are keep in memory
+        :param BufferMode mode_data: default is BufferMode.UPDATE
+        :return dict: last buffer list for each phone with new data
+        """
+        chunks = {}
+        self.late = {}
+        # chunks read after timeout of previous calls
+        for name, new_data in self.__late("read_buffers").items():
+            if new_data:
+                chunks[name] = self.__loggers[name].get_last_buffer_read()
+        for name, new_data in self.__call("read_buffers", {},
+                                          (stack_data, mode_data),
+                                          {}).items():
+            if new_data:
+                chunk = self.__loggers[name].get_last_buffer_read()
+                if name in chunks:
+                    chunk = self.__merge(chunks[name], chunk)
+                chunks[name] = chunk
+        return chunks
+
+    @staticmethod
+    def __merge(first, second):
+        """
+        Returns buffer list with values of first then second.
+        """
+        return [[list(tab_1) + list(tab_2) if isinstance(tab_1, list) else
+                 np.concatenate((tab_1, tab_2))
+                 for tab_1, tab_2 in zip(set_1, set_2)]
+                for set_1, set_2 in zip(first, second)]
+
+    def close(self):
+        """
+        Stop threads and close connections of all phones.
+        """
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=False, cancel_futures=True)
+            self.__executor = None
+        for logger in self.__loggers.values():
+            logger.close()
@@ -0,0 +1,143 @@
+"""
+Instrumentation class
+counters of requests sent to phyphox phone application
+"""
+import time
+import collections
+import logging
+import numpy as np
+
+
+class Instrumentation():
+    """
+    Counters of a Logger: latency and answer size for each endpoint,
+    JSON decode time, samples per second for each buffer, empty polls
+    and overflow events. Hooks are called with an event name
+    ('request', 'decode', 'poll' or 'overflow') and a dict of values.
+
+    :param int window: number of latencies kept for each endpoint to compute percentiles (default: 1000)
+    """
+    def __init__(self, window=1000):
+        #: number of latencies kept for each endpoint
+        self.window = window
+        self.__hooks = []
+        self.reset()
+
+    def reset(self):
+        """
+        Set all counters to zero.
+        """
+        self.__debut = time.perf_counter()
+        self.__endpoints = {}
+        self.__decode = [0, 0.0]
+        self.__samples = {}
+        self.__polls = [0, 0]
+        self.__overflows = 0
+
+    def add_hook(self, hook):
+        """
+        Add a function called with event name and dict of values.
+
+        :param hook: function hook(event, values)
+        """
+        self.__hooks.append(hook)
+
+    def remove_hook(self, hook):
+        """
+        Remove a function added with add_hook.
+
+        :param hook: function to remove
+        """
+        self.__hooks.remove(hook)
+
+    def __call_hooks(self, event, values):
+        for hook in self.__hooks:
+            try:
+                hook(event, values)
+            except Exception:
+                logging.exception("Error in hook %s", str(hook))
+
+    def request(self, endpoint, latency, nb_bytes):
+        """
+        Record one request.
+
+        :param str endpoint: request path without query ('/get', '/meta'...)
+        :param float latency: time in seconds between request and end of answer
+        :param int nb_bytes: answer size in bytes
+        """
+        counter = self.__endpoints.get(endpoint)
+        if counter is None:
+            counter = {'count': 0, 'bytes': 0,
+                       'latencies': collections.deque(maxlen=self.window)}
+            self.__endpoints[endpoint] = counter
+        counter['count'] = counter['count'] + 1
+        counter['bytes'] = counter['bytes'] + nb_bytes
+        counter['latencies'].append(latency)
+        if self.__hooks:
+            self.__call_hooks('request', {'endpoint': endpoint,
+                                          'latency': latency,
+                                          'bytes': nb_bytes})
+
+    def decode(self, duration):
+        """
+        Record decoding time of one answer.
+
+        :param float duration: time in seconds
+        """
+        self.__decode[0] = self.__decode[0] + 1
+        self.__decode[1] = self.__decode[1] + duration
+        if self.__hooks:
+            self.__call_hooks('decode', {'duration': duration})
+
+    def poll(self, counts):
+        """
+        Record one /get answer.
+
+        :param dict counts: number of new samples for each buffer name
+        """
+        self.__polls[0] = self.__polls[0] + 1
+        empty = not any(counts.values())
+        if empty:
+            self.__polls[1] = self.__polls[1] + 1
+        for name, nb in counts.items():
+            self.__samples[name] = self.__samples.get(name, 0) + nb
+        if self.__hooks:
+            self.__call_hooks('poll', {'empty': empty, 'samples': counts})
+
+    def overflow(self):
+        """
+        Record new data overwriting data not read.
+        """
+        self.__overflows = self.__overflows + 1
+        if self.__hooks:
+            self.__call_hooks('overflow', {})
+
+    def snapshot(self):
+        """
+        Returns counters since creation or last reset.
+
+        :return dict: keys 'duration', 'endpoints', 'decode', 'samples', 'samples_per_s', 'polls', 'empty_polls', 'empty_ratio', 'overflows'
+        """
+        duration = time.perf_counter() - self.__debut
+        endpoints = {}
+        for endpoint, counter in self.__endpoints.items():
+            latencies = np.array(counter['latencies'])
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+            endpoints[endpoint] = {'count': counter['count'],
+                                   'bytes': counter['bytes'],
+                                   'latency_mean': latencies.mean(),
+                                   'latency_p50': p50,
+                                   'latency_p95': p95,
+                                   'latency_p99': p99,
+                                   'latency_max': latencies.max()}
+        return {'duration': duration,
+                'endpoints': endpoints,
+                'decode': {'count': self.__decode[0],
+                           'time': self.__decode[1]},
+                'samples': dict(self.__samples),
+                'samples_per_s': {name: nb / duration
+                                  for name, nb in self.__samples.items()},
+                'polls': self.__polls[0],
+                'empty_polls': self.__polls[1],
+                'empty_ratio': self.__polls[1] / max(self.__polls[0], 1),
+                'overflows': self.__overflows}
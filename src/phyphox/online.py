@@ -0,0 +1,221 @@
+"""
+OnlineStats and RollingStats classes
+statistics of a buffer updated with each new chunk
+"""
+import collections
+import numpy as np
+from .ringbuffer import RingBuffer
+
+
+class OnlineStats():
+    """
+    Count, mean, variance, min, max and RMS of all samples received,
+    updated with each chunk without keeping samples: chunk statistics
+    are computed with numpy and merged (Chan et al. parallel algorithm).
+    NaN values are ignored.
+    """
+    def __init__(self):
+        #: number of samples
+        self.count = 0
+        #: mean of samples
+        self.mean = np.nan
+        #: minimum of samples
+        self.min = np.nan
+        #: maximum of samples
+        self.max = np.nan
+        self.__m2 = 0.0
+
+    def __repr__(self):
+        return 'OnlineStats(' + str(self.get()) + ')'
+
+    def update(self, values):
+        """
+        Add samples.
+
+        :param values: array like of samples
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if values.shape[0] == 0:
+            return
+        mean = values.mean()
+        self.__merge(values.shape[0], mean, ((values - mean) ** 2).sum(),
+                     values.min(), values.max())
+
+    def merge(self, other):
+        """
+        Add samples of another OnlineStats (e.g. computed in another process).
+
+        :param OnlineStats other: statistics to merge
+        """
+        if other.count:
+            self.__merge(other.count, other.mean,
+                         other.variance() * other.count, other.min, other.max)
+
+    def __merge(self, count, mean, m2, vmin, vmax):
+        if self.count == 0:
+            self.count, self.mean, self.__m2 = count, mean, m2
+            self.min, self.max = vmin, vmax
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean = self.mean + delta * count / total
+        self.__m2 = self.__m2 + m2 + delta ** 2 * self.count * count / total
+        self.count = total
+        self.min = min(self.min, vmin)
+        self.max = max(self.max, vmax)
+
+    def variance(self, ddof=0):
+        """
+        Returns variance of samples.
+
+        :param int ddof: delta degrees of freedom (default: 0)
+        :return float: NaN if count <= ddof
+        """
+        if self.count <= ddof:
+            return np.nan
+        return self.__m2 / (self.count - ddof)
+
+    def std(self, ddof=0):
+        """
+        Returns standard deviation of samples.
+
+        :param int ddof: delta degrees of freedom (default: 0)
+        :return float:
+        """
+        return np.sqrt(self.variance(ddof))
+
+    def rms(self):
+        """
+        Returns root mean square of samples.
+
+        :return float:
+        """
+        return np.sqrt(self.variance() + self.mean ** 2)
+
+    def get(self):
+        """
+        Returns all statistics.
+
+        :return dict: keys 'count', 'mean', 'variance', 'std', 'min', 'max', 'rms'
+        """
+        return {'count': self.count, 'mean': self.mean,
+                'variance': self.variance(), 'std': self.std(),
+                'min': self.min, 'max': self.max, 'rms': self.rms()}
+
+
+class RollingStats():
+    """
+    Statistics of the last window samples updated with each chunk:
+    sums and sums of squares (shifted by a reference value) of new
+    samples are added and those of samples leaving the window are
+    subtracted, min and max are fronts of monotonic deques. Sums are
+    computed again after window samples have left the window, so that
+    rounding errors do not accumulate: cost is O(chunk size) and get
+    is O(1). NaN values are ignored.
+
+    :param int window: number of samples
+    """
+    def __init__(self, window):
+        #: number of samples in window
+        self.window = int(window)
+        self.__ring = RingBuffer(self.window)
+        # reference value, count, sum and sum of squares of samples - ref
+        self.__ref = 0.0
+        self.__count = 0
+        self.__sum = 0.0
+        self.__sum2 = 0.0
+        self.__nb_removed = 0
+        # (index, value) of candidates for min and max
+        self.__mins = collections.deque()
+        self.__maxs = collections.deque()
+
+    def __repr__(self):
+        return 'RollingStats(window=' + str(self.window) + ', ' +\
+            str(self.get()) + ')'
+
+    def __add(self, values, sign):
+        values = values[~np.isnan(values)] - self.__ref
+        self.__count = self.__count + sign * values.shape[0]
+        self.__sum = self.__sum + sign * values.sum()
+        self.__sum2 = self.__sum2 + sign * (values ** 2).sum()
+
+    def __recompute(self):
+        values = self.__ring.view()
+        values = values[~np.isnan(values)]
+        self.__ref = values.mean() if values.shape[0] else 0.0
+        self.__count, self.__sum, self.__sum2 = 0, 0.0, 0.0
+        self.__add(values, 1)
+        self.__nb_removed = 0
+
+    @staticmethod
+    def __push(candidates, indices, values, better):
+        """
+        Add values to a monotonic deque: a value is kept if no later
+        value is better (greater for max, smaller for min).
+        """
+        if values.shape[0] == 0:
+            return
+        # best of following values in chunk
+        following = better.accumulate(values[::-1])[::-1]
+        keep = np.ones(values.shape[0], dtype=bool)
+        keep[:-1] = better(values[:-1], following[1:]) != following[1:]
+        best = following[0]
+        while candidates and better(candidates[-1][1], best) == best:
+            candidates.pop()
+        candidates.extend(zip(indices[keep].tolist(),
+                              values[keep].tolist()))
+
+    def update(self, values):
+        """
+        Add samples and update statistics of window.
+
+        :param values: array like of samples
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        nb = values.shape[0]
+        if nb == 0:
+            return
+        nb_out = min(max(len(self.__ring) + nb - self.window, 0),
+                     len(self.__ring))
+        if nb_out:
+            self.__add(self.__ring.view()[:nb_out], -1)
+        debut = self.__ring.total
+        self.__ring.append(values)
+        self.__nb_removed = self.__nb_removed + nb_out
+        if nb >= self.window or self.__nb_removed >= self.window:
+            self.__recompute()
+        else:
+            if self.__count == 0:
+                # empty window: reference is a new sample
+                finite = values[~np.isnan(values)]
+                self.__ref = finite[0] if finite.shape[0] else 0.0
+                self.__sum, self.__sum2 = 0.0, 0.0
+            self.__add(values, 1)
+        first = self.__ring.total - self.window
+        if nb > self.window:
+            values = values[-self.window:]
+            debut = first
+        indices = np.arange(debut, debut + values.shape[0])
+        mask = ~np.isnan(values)
+        for candidates, better in ((self.__mins, np.minimum),
+                                   (self.__maxs, np.maximum)):
+            self.__push(candidates, indices[mask], values[mask], better)
+            while candidates and candidates[0][0] < first:
+                candidates.popleft()
+
+    def get(self):
+        """
+        Returns statistics of window.
+
+        :return dict: keys 'count', 'mean', 'variance', 'std', 'min', 'max', 'rms'
+        """
+        if self.__count == 0:
+            return OnlineStats().get()
+        mean = self.__sum / self.__count
+        variance = max(self.__sum2 / self.__count - mean ** 2, 0.0)
+        mean = mean + self.__ref
+        return {'count': self.__count, 'mean': mean,
+                'variance': variance, 'std': np.sqrt(variance),
+                'min': self.__mins[0][1], 'max': self.__maxs[0][1],
+                'rms': np.sqrt(variance + mean ** 2)}
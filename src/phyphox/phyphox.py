@@ -5,12 +5,31 @@ to connect your phone to your python application
 import os
 import urllib.request
 import urllib.parse
+import urllib.error
 import json
 import ipaddress
 import copy
+import bisect
+import http.client
+import concurrent.futures
+import fnmatch
+import re
 import warnings
 import logging
+import time
 import enum
+import numpy as np
+from .transport import UrllibTransport, KeepAliveTransport
+from .ringbuffer import RingBuffer
+from .compact import CompactBuffer, get_encoding
+from .decode import decode_buffers, ArrayStream
+from .acquisition import Acquisition
+from .instrument import Instrumentation
+from .replay import RecordingTransport
+from .decimate import Decimator
+from .online import OnlineStats, RollingStats
+from .spectral import Spectrogram
+from .retry import ResilientTransport
 
 
 class BufferMode(enum.Enum):
@@ -111,6 +130,11 @@ class Experiment():
         self.buffer_names = []
         self.source_names = []
         self.legends = []
+        #: sensor name (input source) for each buffer name
+        self.sensor_names = {}
+        self.__positions = {}
+        self.__labels = {}
+        self.__sets = {}
         if isinstance(metadata, dict):
             for key in metadata:
                 if key in self.__meta:
@@ -154,8 +178,108 @@ class Experiment():
                 canaux_exp.append(src['buffer'])
                 legend_exp.append(src["label"])
             if len(canaux_exp) > 0:
+                # index: positions of names, labels and sets
+                idx_exp = len(self.buffer_names)
+                self.__sets.setdefault(cpt_set['set'], []).append(idx_exp)
+                for idx, (name, label) in enumerate(zip(canaux_exp,
+                                                        legend_exp)):
+                    self.__positions.setdefault(name, (idx_exp, idx))
+                    self.__labels.setdefault(label, []).append((idx_exp,
+                                                                idx))
                 self.legends.append(legend_exp)
                 self.buffer_names.append(canaux_exp)
+        for cpt_input in self.__meta['inputs']:
+            for output in cpt_input.get('outputs', []):
+                for name in output.values():
+                    self.sensor_names[name] = cpt_input.get('source')
+
+    def get_position(self, name):
+        """
+        Returns position of a buffer in buffer_names.
+
+        :param str name: buffer name
+        :return tuple: (set index, buffer index), None if name is unknown
+        """
+        return self.__positions.get(name)
+
+    def get_time_name(self, name):
+        """
+        Returns time buffer of the set of a buffer.
+
+        :param str name: buffer name
+        :return str: None if name is unknown
+        """
+        position = self.__positions.get(name)
+        if position is None:
+            return None
+        return self.buffer_names[position[0]][0]
+
+    @staticmethod
+    def __match(index, pattern):
+        if pattern in index:
+            return [index[pattern]]
+        # case sensitive on all systems
+        regex = re.compile(fnmatch.translate(pattern))
+        return [value for key, value in index.items() if regex.match(key)]
+
+    def find(self, pattern):
+        """
+        Returns positions of buffers whose name or label matches
+        pattern, and of all buffers of sets whose name matches pattern.
+        Pattern is a glob pattern (fnmatch): * ? and [seq].
+
+        :param str pattern: name, label or set name
+        :return list: sorted (set index, buffer index) tuples
+        """
+        positions = set(Experiment.__match(self.__positions, pattern))
+        for l_ in Experiment.__match(self.__labels, pattern):
+            positions.update(l_)
+        for l_ in Experiment.__match(self.__sets, pattern):
+            for idx_exp in l_:
+                positions.update((idx_exp, idx) for idx in
+                                 range(len(self.buffer_names[idx_exp])))
+        return sorted(positions)
+
+
+def _aligned_rows(streams, dtypes, chunk_size):
+    """
+    Decode streams of one number array each and yield
+    aligned rows by chunks of chunk_size values.
+
+    :param list streams: generators of bytes blocks
+    :param list dtypes: numpy data type for each stream
+    :param int chunk_size: number of values in a chunk
+    :return: generator of list of numpy arrays (one for each stream)
+    :raise ConnectionError: if an answer is incomplete
+    """
+    decoders = [ArrayStream(dtype) for dtype in dtypes]
+    pending = [[] for stream in streams]
+    counts = [0 for stream in streams]
+    finished = [False for stream in streams]
+    while True:
+        for idx, stream in enumerate(streams):
+            while counts[idx] < chunk_size and not finished[idx]:
+                block = next(stream, None)
+                if block is None:
+                    if not decoders[idx].done:
+                        raise ConnectionError("Incomplete answer")
+                    finished[idx] = True
+                    break
+                values = decoders[idx].feed(block)
+                if values.shape[0]:
+                    pending[idx].append(values)
+                    counts[idx] = counts[idx] + values.shape[0]
+        nb = min(min(counts), chunk_size)
+        if nb == 0:
+            # end of one buffer: values not aligned are lost
+            return
+        rows = []
+        for idx in range(len(streams)):
+            values = np.concatenate(pending[idx])
+            rows.append(values[:nb])
+            pending[idx] = [values[nb:]]
+            counts[idx] = counts[idx] - nb
+        yield rows
 
 
 class Logger():
@@ -166,11 +290,20 @@ class Logger():
     :param int port: Port number (default: 8080).
     :param str protocol: Communication protocol (default: 'http').
     :param bool no_proxy: If True, disables proxy usage by setting the environment variable (default: False).
+    :param float timeout: socket timeout in seconds (default: None no timeout).
+    :param bool keep_alive: If True, reuses persistent HTTP/1.1 connections (default: False).
+    :param transport: object used to send requests. default is None (built using keep_alive).
+    :param dtype: default None data are python lists. numpy.float64 or numpy.float32 data are decoded in numpy arrays.
+    :param ConfigCache cache: default None. persistent cache of meta and config answers.
+    :param str record: default None. session file where all requests and answers are saved (see ReplayTransport).
+    :param RetryPolicy retry: default None. timeouts, deadline, retries, hedging and circuit breaker of requests.
     :meta private config: raw data for experiment configuration
     :meta private meta: raw data for meta phyphox answer
     """
 
-    def __init__(self, adresse, port=8080, protocol='http', no_proxy=False):
+    def __init__(self, adresse, port=8080, protocol='http', no_proxy=False,
+                 timeout=None, keep_alive=False, transport=None, dtype=None,
+                 cache=None, record=None, retry=None):
         """The constructor
 
         :ivar base_url: URL to access the Phyphox application on the phone.
@@ -178,6 +311,13 @@ class Logger():
         :param int port: port number (default: 8080).
         :param str protocol: default is http
         :param bool no_proxy: default False. True try disable proxy using environment variable
+        :param float timeout: default None. socket timeout in seconds
+        :param bool keep_alive: default False. True one persistent connection is used for all requests (two with hedged requests)
+        :param transport: default None. object with request(path) and close() methods
+        :param dtype: default None. numpy data type to decode data without python lists
+        :param ConfigCache cache: default None. meta and config answers are stored on disk
+        :param str record: default None. session file name to record requests and answers
+        :param RetryPolicy retry: default None. requests are sent once without deadline
         """
         if ipaddress.ip_address(adresse):
             if isinstance(port, int):
@@ -189,16 +329,52 @@ class Logger():
         #: url to access phone phyphox application
         self.base_url = protocol + "://" + \
             self.__ip_adress[0] + ":" + self.__ip_adress[1]
+        #: numpy data type of data read (None python lists)
+        self.dtype = dtype
+        #: persistent cache of meta and config answers (None no cache)
+        self.cache = cache
+        #: transport used to send all requests to phone
+        self.transport = transport
+        if self.transport is None:
+            if keep_alive:
+                # a hedged request needs a second connection
+                pool_size = 1
+                if retry is not None and retry.hedge_after is not None:
+                    pool_size = 2
+                self.transport = KeepAliveTransport(self.base_url, timeout,
+                                                    pool_size=pool_size)
+            else:
+                self.transport = UrllibTransport(self.base_url, timeout)
+        if record is not None:
+            self.transport = RecordingTransport(self.transport, record)
+        if retry is not None:
+            self.transport = ResilientTransport(self.transport, retry)
         self.__req_answers = {'config': {}, 'meta': {}}
         #: sensors: sensor used in experiment
         self.__sensors = {}
         self.__experiment = None
         self.__get_names = []
+        self.__name_positions = {}
+        self.__time_names = []
+        self.__value_names = []
+        self.__links = {}
         self.__first_get = True
         self.__next_time = []
         self.__nb_measure = 0
         self.__list_tabs = []
+        self.__list_ends = []
+        self.__rings = None
+        self.__ring_param = {}
+        self.__callbacks = []
+        self.__decimation = None
+        self.__decimators = {}
+        self.__statistics = None
+        self.__stat_window = None
+        self.__spectrograms = {}
+        self.__acquisition = None
         self.__cmd_response = None
+        #: counters of requests (None disabled see enable_stats)
+        self.instrumentation = None
         #: channel  name
         self.channel = []
         #: legend for each channel
@@ -247,6 +423,18 @@ class Logger():
             print(sensor[0], "\t", sensor[1])
         return result
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Close connections opened by transport.
+        """
+        self.transport.close()
+
     def send_url(self, cmd_key):
         """
         open standard phyphox URL.
@@ -255,16 +443,70 @@ class Logger():
         :return dict: A dictionary with the JSON response, or an empty dict if no response.
         """
         if cmd_key in PHYPHOX_API:
-            url = self.base_url + PHYPHOX_API[cmd_key]
             try:
-                with urllib.request.urlopen(url) as reponse:
-                    self.__cmd_response = reponse.read()
-                return json.loads(self.__cmd_response)
+                self.__cmd_response = self._request(PHYPHOX_API[cmd_key])
+                return self._decode_json(self.__cmd_response)
             except urllib.error.HTTPError:
                 pass
         warnings.warn("Unknown command or not implemented")
         return {}
 
+    def _request(self, path):
+        """
+        Send request path using transport and record its latency
+        when instrumentation is enabled.
+        """
+        if self.instrumentation is None:
+            return self.transport.request(path)
+        debut = time.perf_counter()
+        reponse = self.transport.request(path)
+        self.instrumentation.request(path.split('?')[0],
+                                     time.perf_counter() - debut,
+                                     len(reponse))
+        return reponse
+
+    def _decode_json(self, reponse):
+        """
+        json.loads recording decode time when instrumentation is enabled.
+        """
+        if self.instrumentation is None:
+            return json.loads(reponse)
+        debut = time.perf_counter()
+        answer = json.loads(reponse)
+        self.instrumentation.decode(time.perf_counter() - debut)
+        return answer
+
+    def enable_stats(self, hook=None, window=1000):
+        """
+        Start recording latency and size of answers, decode time,
+        samples per second, empty polls and overflows.
+
+        :param hook: default None. function hook(event, values) see Instrumentation
+        :param int window: number of latencies kept for percentiles. default is 1000
+        :return Instrumentation:
+        """
+        if self.instrumentation is None:
+            self.instrumentation = Instrumentation(window)
+        if hook is not None:
+            self.instrumentation.add_hook(hook)
+        return self.instrumentation
+
+    def disable_stats(self):
+        """
+        Stop recording counters.
+        """
+        self.instrumentation = None
+
+    def stats(self):
+        """
+        Returns counters recorded since enable_stats.
+
+        :return dict: see Instrumentation.snapshot, empty if stats are disabled
+        """
+        if self.instrumentation is None:
+            return {}
+        return self.instrumentation.snapshot()
+
     def get_meta_key(self, key):
         """
         Retrieves a key from the JSON metadata.
@@ -305,9 +547,51 @@ class Logger():
 
         :param bool force_update: True retrieve data from mobile phone otherwise use old data.
         """
-        if force_update or not self.__req_answers["meta"]:
-            self.__req_answers["meta"] = self.send_url("meta")
-        logging.info("META\n%s", str(self.__req_answers["meta"]))
+        if self._answer_needed("meta", force_update):
+            answer = self._cached_answer("meta", force_update)
+            if answer is None:
+                answer = self.send_url("meta")
+                self._cache_answer("meta", answer)
+            self._update_meta(answer)
+        else:
+            self._update_meta()
+
+    def _answer_needed(self, key, force_update):
+        """
+        True if request key must be sent to phone.
+        """
+        return force_update or not self.__req_answers[key]
+
+    def _cached_answer(self, key, force_update):
+        """
+        Answer of request key found in cache, None if phone must be asked.
+        """
+        if self.cache is None or force_update:
+            return None
+        return self.cache.get(self.base_url, key, self._cache_meta(key))
+
+    def _cache_answer(self, key, answer):
+        """
+        Store answer of request key in cache.
+        """
+        if self.cache is not None and answer:
+            self.cache.put(self.base_url, key, answer, self._cache_meta(key))
+
+    def _cache_meta(self, key):
+        """
+        Meta answer identifying device of a cached config answer.
+        """
+        if key != 'config' or not self.__req_answers['meta']:
+            return None
+        return self.__req_answers['meta']
+
+    def _update_meta(self, answer=None):
+        """
+        Set meta keys and sensors using answer or old data if answer is None.
+        """
+        if answer is not None:
+            self.__req_answers["meta"] = answer
+        logging.debug("META\n%s", self.__req_answers["meta"])
         for key in self.__req_answers["meta"]:
             if key in self.__metakeys:
                 self.__metakeys[key] = self.__req_answers["meta"][key]
@@ -320,10 +604,38 @@ class Logger():
         """
         Retrieves configuration data for the selected experiment.
         """
-        if force_update or not self.__req_answers["config"]:
-            self.__req_answers["config"] = self.send_url("config")
-        logging.info("CONFIG:\n%s", str(self.__req_answers["config"]))
-        self.__experiment = Experiment(self.__req_answers["config"])
+        if self._answer_needed("config", force_update):
+            if self.cache is not None and self._answer_needed("meta", False):
+                # device identity of cached config
+                self.get_meta()
+            answer = self._cached_answer("config", force_update)
+            if answer is None:
+                answer = self.send_url("config")
+                self._cache_answer("config", answer)
+            self._update_config(answer)
+        else:
+            self._update_config()
+
+    def _update_config(self, answer=None):
+        """
+        Build experiment using answer or old data if answer is None.
+        """
+        if answer is not None:
+            self.__req_answers["config"] = answer
+        logging.debug("CONFIG:\n%s", self.__req_answers["config"])
+        if self.cache is not None:
+            self.__experiment = self.cache.experiment(
+                self.__req_answers["config"])
+        else:
+            self.__experiment = Experiment(self.__req_answers["config"])
+
+    def get_experiment(self):
+        """
+        Returns experiment built by get_config.
+
+        :return Experiment: None if configuration is not read
+        """
+        return self.__experiment
 
     def init_sensors(self):
         """
@@ -341,9 +653,15 @@ class Logger():
 
         :return: JSON response (True on success).
         """
-        self.__nb_measure = 0
+        self._reset_nb_measure()
         return self.send_url("clear")
 
+    def _reset_nb_measure(self):
+        """
+        Reset number of measurements before clearing phone buffers.
+        """
+        self.__nb_measure = 0
+
     def stop(self):
         """
         Stop sampling of phyphox phone application
@@ -358,9 +676,11 @@ class Logger():
         """
         return self.send_url("time")
 
-    def export_file(self, filetype=0, filename="data.xls"):
+    def export_file(self, filetype=0, filename="data.xls", block_size=65536,
+                    progress=None):
         """
         Retrieves all recorded data in a single file.
+        File is written block by block while it is downloaded.
         File types:
         0 for xls
         1 zip file included csv with comma separator and decimal point
@@ -368,17 +688,29 @@ class Logger():
         3 zip file included csv with semicolon separator and decimal point
         4 zip file included csv with tabulator separator and decimal comma
         5 zip file included csv with semicolon separator and decimal comma
+        Use ExportReader to read zip files.
 
         :param int filetype: default is 0 for xls
         :param str filename: file name to save. default is "data.xls"
+        :param int block_size: size of blocks written in bytes. default is 65536
+        :param progress: default None. function called with number of bytes written after each block
+        :return int: number of bytes written
         """
-        url = self.base_url + "/export?format=" + str(filetype)
-        with urllib.request.urlopen(url) as reponse:
-            reponse = reponse.read()
-        # self.__config = json.loads(reponse)
-        logging.info("CONFIG:\n%s", str(reponse))
+        nb_bytes = 0
+        debut = time.perf_counter()
         with open(filename, "wb") as fd:
-            fd.write(reponse)
+            for block in self.transport.stream("/export?format=" +
+                                               str(filetype), block_size):
+                fd.write(block)
+                nb_bytes = nb_bytes + len(block)
+                if progress is not None:
+                    progress(nb_bytes)
+        if self.instrumentation is not None:
+            self.instrumentation.request("/export",
+                                         time.perf_counter() - debut,
+                                         nb_bytes)
+        logging.info("Export %s: %d bytes", filename, nb_bytes)
+        return nb_bytes
 
     def buffer_needed(self, l_exp=None):
         """
@@ -387,17 +719,29 @@ class Logger():
         Otherwise, l_exp must be a list of tuples (id, (b_id1, …)),
         where id is the source index in the configuration data,
         and b_id is the buffer index in the source list.
+        Items of l_exp can also be buffer names, labels or set names
+        with glob patterns (e.g. "acc*" or "Acceleration x*"):
+        time buffer of each set is then selected first.
 
-        :param list l_exp: list of tuple. default value is None
-        :return bool: False is something wrong in list
+        :param list l_exp: list of tuple or str. default value is None
+        :return bool: False is something wrong in list, selection is unchanged
         """
         if not self.__req_answers["config"]:
             self.get_config()
         exp = self.__experiment
-        self.__get_names = []
         if not l_exp:
-            self.__get_names = copy.deepcopy(exp.buffer_names)
+            # names are immutable: copy of lists is enough
+            self.__get_names = [list(l_) for l_ in exp.buffer_names]
+            self.__index_names()
             return True
+        if isinstance(l_exp, str):
+            l_exp = [l_exp]
+        if any(isinstance(item, str) for item in l_exp):
+            l_exp = self.__select(l_exp)
+            if l_exp is None:
+                return False
+        # selection is changed only if l_exp is valid
+        get_names = []
         for idx_exp, idx_buf in l_exp:
             names = []
             if idx_exp < 0 or idx_exp >= len(exp.source_names):
@@ -412,9 +756,66 @@ class Logger():
                                   ", buffer in this experiment")
                 else:
                     names.append(exp.buffer_names[idx_exp][idx])
-            self.__get_names.append(names)
+            if names:
+                get_names.append(names)
+        self.__get_names = get_names
+        self.__index_names()
         return True
 
+    def __select(self, l_exp):
+        """
+        Convert names, labels and patterns of l_exp in positions
+        grouped by set, time buffer first.
+        """
+        selection = {}
+        for item in l_exp:
+            if isinstance(item, str):
+                positions = self.__experiment.find(item)
+                if not positions:
+                    warnings.warn("No buffer matches " + item)
+                    return None
+            else:
+                positions = [(item[0], idx) for idx in item[1]]
+            for idx_exp, idx in positions:
+                selection.setdefault(idx_exp, {0}).add(idx)
+        return [(idx_exp, sorted(selection[idx_exp]))
+                for idx_exp in sorted(selection)]
+
+    def __index_names(self):
+        """
+        Index selected names and build links and names used by each poll.
+        """
+        self.__name_positions = {}
+        for idx_exp, l_ in enumerate(self.__get_names):
+            for idx, name in enumerate(l_):
+                self.__name_positions[name] = (idx_exp, idx)
+        self.__time_names = [l_[0] for l_ in self.__get_names if l_]
+        self.__value_names = [name for l_ in self.__get_names
+                              for name in l_[1:]]
+        names = [name for l_ in self.__get_names for name in l_]
+        self.__links = {'full': "/get?" + "&".join(name + "=full"
+                                                   for name in names),
+                        'last': "/get?" + "&".join(names)}
+        # for each set, link parts around thresholds: str(tps).join(parts)
+        self.__links['update'] = []
+        for l_ in self.__get_names:
+            parts = [l_[0] + "="]
+            suffix = ""
+            for name in l_[1:]:
+                parts.append(suffix + "&" + name + "=")
+                suffix = "%7C" + l_[0]
+            parts.append(suffix)
+            self.__links['update'].append(parts)
+
+    def get_buffer_position(self, name):
+        """
+        Returns position of a selected buffer.
+
+        :param str name: buffer name
+        :return tuple: (set index, buffer index) in get_selected_names, None if not selected
+        """
+        return self.__name_positions.get(name)
+
     def get_buffer_name(self, idx: int) -> str:
         """
         Returns the name of the buffer at index idx.
@@ -426,6 +827,14 @@ class Logger():
                 return self.__get_names[idx[0]][idx[1]]
         return ''
 
+    def get_selected_names(self):
+        """
+        Returns names of buffers selected by buffer_needed.
+
+        :return list: list of buffer names for each set, time buffer first
+        """
+        return [list(l_) for l_ in self.__get_names]
+
     def build_link(self, val_time=None, only_last=False):
         """
         Creates a link to retrieve selected buffers.
@@ -438,31 +847,17 @@ class Logger():
         if not self.__get_names:
             warnings.warn("No buffer selected. Call buffer_needed first")
             return ""
-        base = ""
         if self.__first_get or val_time is None or only_last:
             self.__nb_measure = 0
-            for l_name in self.__get_names:
-                for name in l_name:
-                    if only_last:
-                        base = base + name + "&"
-                    else:
-                        base = base + name + "=full&"
-            base = "/get?" + base[:-1]
-        else:
-            if len(val_time) != len(self.__get_names):
-                logging.info("bug %d %d", val_time, len(self.__get_names))
-                val_time = len(self.__get_names) * [val_time[0]]
-                warnings.warn("build_link time threshold duplicated")
-            for l_name, tps in zip(self.__get_names, val_time):
-                for idx, name in enumerate(l_name):
-                    if idx == 0:
-                        base = base + name + '=' + str(tps) + '&'
-                        tps_var = name
-                    else:
-                        base = base + name + '=' +\
-                            str(tps) + '%7C' + tps_var + '&'
-            base = "/get?" + base[:-1]
-        return base
+            if only_last:
+                return self.__links['last']
+            return self.__links['full']
+        if len(val_time) != len(self.__get_names):
+            logging.info("bug %d %d", val_time, len(self.__get_names))
+            val_time = len(self.__get_names) * [val_time[0]]
+            warnings.warn("build_link time threshold duplicated")
+        return "/get?" + "&".join(str(tps).join(parts) for parts, tps
+                                  in zip(self.__links['update'], val_time))
 
     def read_buffers(self, stack_data=True, mode_data=BufferMode.UPDATE):
         """
@@ -479,6 +874,18 @@ class Logger():
         :return: True if new data are available
         """
 
+        lnk = self._data_link(mode_data)
+        if not lnk:
+            return self.new_data
+        logging.debug("%s%s", self.base_url, lnk)
+        return self._store_buffers(self._request(lnk), stack_data)
+
+    def _data_link(self, mode_data):
+        """
+        Build link to get data for mode_data.
+
+        :return str: empty string if no buffer selected or invalid mode
+        """
         match mode_data:
             case BufferMode.FULL:
                 lnk = self.build_link(val_time=None)
@@ -492,38 +899,264 @@ class Logger():
             warnings.warn("No buffer selected or invali mode_data." +
                           "Cannot get data")
             self.new_data = False
-            return self.new_data
-        logging.info(self.base_url + lnk)
-        with urllib.request.urlopen(self.base_url + lnk) as reponse:
-            reponse = reponse.read()
-            logging.info("LNK answer:\n%s", str(reponse))
-            data = json.loads(reponse)
-        if len(data['buffer'][self.__get_names[0][0]]['buffer']) == 0:
+        return lnk
+
+    def _store_buffers(self, reponse, stack_data):
+        """
+        Decode /get answer and store data of selected buffers.
+
+        :param bytes reponse: phone answer
+        :param bool stack_data: True data are pushed in a list otherwise only last data are keep in memory
+        :return: True if new data are available
+        """
+        # body is formatted only if debug messages are enabled
+        logging.debug("LNK answer:\n%s", reponse)
+        if self.instrumentation is not None:
+            debut = time.perf_counter()
+        if self.dtype is None:
+            data = json.loads(reponse)['buffer']
+            columns = {name: data[name]['buffer']
+                       for name in self.__name_positions}
+        else:
+            # first buffers are time references for next link:
+            # float64 is kept to avoid threshold rounding
+            columns = decode_buffers(reponse, self.__time_names)
+            columns.update(decode_buffers(reponse, self.__value_names,
+                                          self.dtype))
+        if self.instrumentation is not None:
+            self.instrumentation.decode(time.perf_counter() - debut)
+            self.instrumentation.poll({name: len(values)
+                                       for name, values in columns.items()})
+        if len(columns[self.__get_names[0][0]]) == 0:
             self.new_data = False
             return self.new_data
+        previous_time = self.__next_time
         self.__next_time = []
         self.__first_get = False
         self.__nb_measure = self.__nb_measure +\
-            len(data['buffer'][self.__get_names[0][0]]['buffer'])
+            len(columns[self.__get_names[0][0]])
         list_tabs = []
-        for l_ in self.__get_names:
+        for idx, l_ in enumerate(self.__get_names):
             data_exp = []
-            data_exp.append(data['buffer'][l_[0]]['buffer'])
-            self.__next_time.append(data['buffer'][l_[0]]['buffer'][-1])
+            data_exp.append(columns[l_[0]])
+            if len(columns[l_[0]]):
+                self.__next_time.append(float(columns[l_[0]][-1]))
+            elif idx < len(previous_time):
+                # no new data in this set: same threshold
+                self.__next_time.append(previous_time[idx])
+            else:
+                self.__next_time.append(-1.0)
             for name in l_[1:]:
-                data_exp.append(data['buffer'][name]['buffer'])
+                data_exp.append(columns[name])
             list_tabs.append(data_exp)
-        if stack_data:
+        self.__stack_tabs(list_tabs, stack_data, True)
+        if self.overflow and self.instrumentation is not None:
+            self.instrumentation.overflow()
+        self.new_data = True
+        self.__update_summaries(columns)
+        self.__call_callbacks(columns)
+        return self.new_data
+
+    def __stack_tabs(self, list_tabs, stack_data, to_rings):
+        if stack_data and self.__rings is not None:
+            if to_rings:
+                for l_, data_exp in zip(self.__get_names, list_tabs):
+                    for name, values in zip(l_, data_exp):
+                        self.get_ring_buffer(name).append(values)
+            self.__list_tabs = [list_tabs]
+        elif stack_data:
+            if self.__list_ends:
+                ends = self.__list_ends[-1]
+            else:
+                ends = len(list_tabs) * [0]
+            self.__list_ends.append([end + len(data_exp[0]) for end, data_exp
+                                     in zip(ends, list_tabs)])
             self.__list_tabs.append(list_tabs)
         else:
             if self.new_data:
                 self.overflow = True
             else:
                 self.overflow = False
+            self.__list_ends = [[len(data_exp[0]) for data_exp in list_tabs]]
             self.__list_tabs = [list_tabs]
+
+    def __update_summaries(self, columns):
+        """
+        Update statistics, decimators and spectrograms of buffers
+        with new data.
+        """
+        if self.__statistics is not None:
+            for name, values in columns.items():
+                if name not in self.__statistics:
+                    rolling = None
+                    if self.__stat_window:
+                        rolling = RollingStats(self.__stat_window)
+                    self.__statistics[name] = (OnlineStats(), rolling)
+                for stats in self.__statistics[name]:
+                    if stats is not None:
+                        stats.update(values)
+        if self.__decimation is None and not self.__spectrograms:
+            return
+        for l_ in self.__get_names:
+            if l_[0] not in columns:
+                continue
+            for name in l_[1:]:
+                if self.__decimation is not None:
+                    if name not in self.__decimators:
+                        self.__decimators[name] = Decimator(
+                            **self.__decimation)
+                    self.__decimators[name].append(columns[l_[0]],
+                                                   columns[name])
+                if name in self.__spectrograms:
+                    self.__spectrograms[name].append(columns[l_[0]],
+                                                     columns[name])
+
+    def __call_callbacks(self, columns):
+        for callback in self.__callbacks:
+            try:
+                callback(columns)
+            except Exception:
+                logging.exception("Error in callback %s", str(callback))
+
+    def read_buffers_chunked(self, chunk_size=65536, workers=1,
+                             stack_data=True, retries=2, block_size=65536):
+        """
+        Read all data of selected buffers (like BufferMode.FULL)
+        without loading the whole answer in memory.
+        Each buffer is downloaded with its own request and decoded
+        while blocks arrive. Rows of a set are aligned and sent by
+        chunks of chunk_size samples to callbacks and ring buffers.
+        A broken download goes on from the last time received
+        (time threshold link). Data are numpy arrays
+        (dtype attribute or float64).
+        With ring buffers or stack_data False, memory used is proportional
+        to chunk_size, otherwise all data are pushed in list.
+        After this call, read_buffers gets data since the last time received.
+
+        :param int chunk_size: number of samples in a chunk (default: 65536)
+        :param int workers: number of sets downloaded at the same time (default: 1)
+        :param bool stack_data: True data are pushed in a list otherwise only last chunk is keep in memory
+        :param int retries: number of restarts after a connection error (default: 2)
+        :param int block_size: size of blocks read in bytes (default: 65536)
+        :return: True if new data are available
+        """
+        if not self.__get_names:
+            warnings.warn("No buffer selected. Call buffer_needed first")
+            self.new_data = False
+            return self.new_data
+        param = (chunk_size, stack_data, retries, block_size)
+        if workers > 1 and len(self.__get_names) > 1:
+            with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+                results = list(executor.map(
+                    lambda idx_exp: self.__read_set_chunked(idx_exp, *param),
+                    range(len(self.__get_names))))
+        else:
+            results = [self.__read_set_chunked(idx_exp, *param)
+                       for idx_exp in range(len(self.__get_names))]
+        if results[0][1] == 0:
+            self.new_data = False
+            return self.new_data
+        self.__first_get = False
+        self.__nb_measure = results[0][1]
+        # an empty set is read again from the beginning
+        self.__next_time = [result[2] if result[1] else -1.0
+                            for result in results]
+        self.__stack_tabs([result[0] for result in results], stack_data,
+                          False)
         self.new_data = True
         return self.new_data
 
+    def __read_set_chunked(self, idx_exp, chunk_size, stack_data, retries,
+                           block_size):
+        names = self.__get_names[idx_exp]
+        dtypes = [np.float64] + (len(names) - 1) * [self.dtype or np.float64]
+        chunks = [[] for name in names]
+        nb_total = 0
+        last_time = None
+        nb_try = 0
+        while True:
+            if last_time is None:
+                paths = ["/get?" + name + "=full" for name in names]
+            else:
+                paths = ["/get?" + names[0] + "=" + str(last_time)] +\
+                    ["/get?" + name + "=" + str(last_time) + "%7C" + names[0]
+                     for name in names[1:]]
+            streams = [self.transport.stream(path, block_size)
+                       for path in paths]
+            try:
+                for rows in _aligned_rows(streams, dtypes, chunk_size):
+                    columns = dict(zip(names, rows))
+                    last_time = float(rows[0][-1])
+                    nb_total = nb_total + len(rows[0])
+                    if stack_data and self.__rings is not None:
+                        for name, values in columns.items():
+                            self.get_ring_buffer(name).append(values)
+                        chunks = [[values] for values in rows]
+                    elif stack_data:
+                        for chunk, values in zip(chunks, rows):
+                            chunk.append(values)
+                    else:
+                        chunks = [[values] for values in rows]
+                    self.__update_summaries(columns)
+                    self.__call_callbacks(columns)
+                break
+            except (OSError, http.client.HTTPException) as error:
+                nb_try = nb_try + 1
+                if nb_try > retries:
+                    raise
+                logging.warning("Download of %s restarts after %s: %s",
+                                names[0], str(last_time), str(error))
+            finally:
+                for stream in streams:
+                    stream.close()
+        list_tabs = [np.concatenate(chunk) if chunk else
+                     np.empty(0, dtype=dtype)
+                     for chunk, dtype in zip(chunks, dtypes)]
+        return list_tabs, nb_total, last_time
+
+    def add_callback(self, callback):
+        """
+        Register a function called by read_buffers when new data are
+        available. Function receives a dict with new values for each
+        selected buffer name. Exceptions are logged and ignored.
+
+        :param callback: function with one argument
+        """
+        self.__callbacks.append(callback)
+
+    def remove_callback(self, callback):
+        """
+        Unregister a function added with add_callback.
+
+        :param callback: function to remove
+        """
+        if callback in self.__callbacks:
+            self.__callbacks.remove(callback)
+
+    def start_acquisition(self, **kwargs):
+        """
+        Poll phone in a background thread. Poll interval follows
+        sample rate and new data are sent to callbacks and to a queue.
+        Do not call read_buffers while acquisition is running.
+        See Acquisition for parameters.
+
+        :return Acquisition: running thread (queue attribute gives new data)
+        """
+        self.stop_acquisition()
+        self.__acquisition = Acquisition(self, **kwargs)
+        self.__acquisition.start()
+        return self.__acquisition
+
+    def stop_acquisition(self, timeout=None):
+        """
+        Stop background thread started by start_acquisition.
+
+        :param float timeout: time in seconds to wait end of thread (default: None)
+        """
+        if self.__acquisition is not None:
+            self.__acquisition.stop(timeout)
+            self.__acquisition = None
+
     def get_nb_measure(self):
         """
         Returns the number of measurements for the first buffer.
@@ -541,11 +1174,304 @@ class Logger():
     def get_all_buffer_read(self):
         """
         Returns a deep copy of all read buffers.
+        When ring buffers are used, a copy of samples kept
+        in ring buffers is returned as a single buffer list.
         """
         if self.new_data:
+            if self.__rings is not None:
+                return [[[self.get_ring_buffer(name).last().copy()
+                          for name in l_] for l_ in self.__get_names]]
             return copy.deepcopy(self.__list_tabs)
         return []
 
+    def get_buffer_since(self, name, index=0):
+        """
+        Returns samples of a selected buffer from index without copying
+        all stored data. Index is the position in all samples stored
+        since first read. Ring buffers are not copied: a read-only view
+        valid until next read_buffers call is returned.
+        Otherwise only chunks after index are concatenated.
+        Keep index + len(result) for next call.
+
+        :param str name: buffer name
+        :param int index: index of first sample (default: 0)
+        :return numpy.ndarray: read-only array, None if name is not selected
+        """
+        if name not in self.__name_positions:
+            return None
+        ring = self.get_ring_buffer(name)
+        if ring is not None:
+            return ring.since(index)
+        idx_exp, idx = self.__name_positions[name]
+        first = bisect.bisect_right(self.__list_ends, index,
+                                    key=lambda ends: ends[idx_exp])
+        if first == len(self.__list_tabs):
+            tab = np.empty(0)
+        else:
+            if first > 0:
+                index = index - self.__list_ends[first - 1][idx_exp]
+            tabs = [np.asarray(list_tabs[idx_exp][idx])
+                    for list_tabs in self.__list_tabs[first:]]
+            tabs[0] = tabs[0][max(index, 0):]
+            if len(tabs) == 1:
+                tab = tabs[0]
+            else:
+                tab = np.concatenate(tabs)
+        tab.flags.writeable = False
+        return tab
+
+    def get_buffer_view(self, name, nb=None):
+        """
+        Returns a read-only array of the last samples of a selected buffer.
+        Ring buffers are not copied: view is valid until next
+        read_buffers call.
+
+        :param str name: buffer name
+        :param int nb: number of samples (default: None all stored samples)
+        :return numpy.ndarray: None if name is not selected
+        """
+        ring = self.get_ring_buffer(name)
+        if ring is not None:
+            return ring.view(nb)
+        if name not in self.__name_positions:
+            return None
+        if not self.__list_ends:
+            return self.get_buffer_since(name)
+        total = self.__list_ends[-1][self.__name_positions[name][0]]
+        if nb is None or nb > total:
+            nb = total
+        return self.get_buffer_since(name, total - nb)
+
+    def get_buffer_memoryview(self, name, nb=None):
+        """
+        Returns a read-only memoryview of the last samples of a selected
+        buffer. See get_buffer_view
+
+        :param str name: buffer name
+        :param int nb: number of samples (default: None all stored samples)
+        :return memoryview: None if name is not selected
+        """
+        tab = self.get_buffer_view(name, nb)
+        if tab is None:
+            return None
+        return memoryview(tab)
+
+    def get_sample_rate(self, name=None):
+        """
+        Estimate sample rate using MinDelay of sensors (meta data)
+        used in experiment (config data).
+
+        :param str name: buffer name (default: None fastest sensor in experiment)
+        :return float: sample rate in Hz, None if unknown
+        """
+        if self.__experiment is None:
+            return None
+        if name is None:
+            sensor_names = set(self.__experiment.sensor_names.values())
+        else:
+            sensor_names = {self.__experiment.sensor_names.get(name)}
+        rates = []
+        for sensor_name in sensor_names:
+            if sensor_name in self.__sensors:
+                min_delay = self.__sensors[sensor_name].get('MinDelay')
+                if min_delay and min_delay > 0:
+                    # MinDelay is given in microseconds
+                    rates.append(1e6 / min_delay)
+        if rates:
+            return max(rates)
+        if name is not None:
+            return self.get_sample_rate()
+        return None
+
+    def set_ring_buffer(self, capacity=None, duration=None, rate=None,
+                        policy='overwrite', dtype=np.float64):
+        """
+        Push data of selected buffers in preallocated numpy ring
+        buffers instead of a list when stack_data is True in read_buffers.
+        With policy 'overwrite' memory used is fixed.
+        If capacity and duration are None, ring buffers are not used.
+
+        :param int capacity: number of samples kept for each buffer
+        :param float duration: time in seconds kept for each buffer (used if capacity is None)
+        :param float rate: sample rate in Hz to convert duration. default is None estimated using get_sample_rate
+        :param str policy: 'overwrite' oldest samples are lost or 'grow' capacity is doubled (default: 'overwrite')
+        :param dtype: numpy data type (default: numpy.float64)
+        :return bool: False if capacity cannot be computed
+        """
+        if capacity is None and duration is None:
+            self.__rings = None
+            self.__ring_param = {}
+            return True
+        if capacity is None and rate is None and \
+                self.get_sample_rate() is None:
+            warnings.warn("Sample rate unknown. Call get_meta and " +
+                          "get_config first or give rate")
+            return False
+        self.__ring_param = {'capacity': capacity, 'duration': duration,
+                             'rate': rate, 'policy': policy, 'dtype': dtype}
+        self.__rings = {}
+        return True
+
+    def set_storage(self, encoding='float32+zlib', time_encoding='delta',
+                    block_size=65536):
+        """
+        Push data of selected buffers in compact buffers instead of
+        a list when stack_data is True in read_buffers: samples are
+        encoded by blocks and decoded when they are read
+        (get_buffer_since, get_buffer_view, get_all_buffer_read).
+        If encoding and time_encoding are None, compact buffers are
+        not used. Replaces ring buffers (see CompactBuffer).
+
+        :param encoding: encoding of value buffers, name in ENCODINGS, names joined with + or encoding object (default: 'float32+zlib')
+        :param time_encoding: encoding of time buffers (default: 'delta')
+        :param int block_size: number of samples of a block (default: 65536)
+        """
+        if encoding is None and time_encoding is None:
+            self.__rings = None
+            self.__ring_param = {}
+            return
+        # names are checked now, an object for each buffer later
+        get_encoding(encoding)
+        get_encoding(time_encoding)
+        self.__ring_param = {'encoding': encoding,
+                             'time_encoding': time_encoding,
+                             'block_size': block_size}
+        self.__rings = {}
+
+    def set_decimation(self, base=16, factor=4, nb_level=8, capacity=None,
+                       enable=True):
+        """
+        Keep multi-resolution summaries (min/max and LTTB) of selected
+        buffers, updated when data are read. See Decimator for parameters.
+
+        :param bool enable: False summaries are removed and not computed (default: True)
+        """
+        self.__decimators = {}
+        if enable:
+            self.__decimation = {'base': base, 'factor': factor,
+                                 'nb_level': nb_level, 'capacity': capacity}
+        else:
+            self.__decimation = None
+
+    def get_decimator(self, name):
+        """
+        Returns summaries of a selected buffer (time buffers excluded).
+
+        :param str name: buffer name
+        :return Decimator: None if no data or decimation is not used
+        """
+        return self.__decimators.get(name)
+
+    def get_decimated(self, name, debut=None, fin=None, max_points=2000,
+                      method='minmax'):
+        """
+        Returns at most max_points points to plot a buffer between
+        debut and fin. See Decimator.get.
+
+        :param str name: buffer name
+        :param float debut: first time (default: None beginning)
+        :param float fin: last time (default: None end)
+        :param int max_points: maximum number of points (default: 2000)
+        :param str method: 'minmax' or 'lttb' (default: 'minmax')
+        :return: numpy arrays of times and values, None if no summary
+        """
+        decimator = self.get_decimator(name)
+        if decimator is None:
+            return None
+        return decimator.get(debut, fin, max_points, method)
+
+    def set_spectrogram(self, name, nfft=1024, hop=None, window='hann',
+                        history=100, mode='magnitude', enable=True):
+        """
+        Compute new frames of a short-time Fourier transform of a
+        selected buffer when data are read. See Spectrogram for parameters.
+
+        :param str name: buffer name (time buffers excluded)
+        :param bool enable: False spectrogram is removed (default: True)
+        :return Spectrogram: None if enable is False
+        """
+        if not enable:
+            self.__spectrograms.pop(name, None)
+            return None
+        self.__spectrograms[name] = Spectrogram(nfft, hop, window, history,
+                                                mode)
+        return self.__spectrograms[name]
+
+    def get_spectrogram(self, name):
+        """
+        Returns spectrogram of a buffer added with set_spectrogram.
+
+        :param str name: buffer name
+        :return Spectrogram: None if no spectrogram
+        """
+        return self.__spectrograms.get(name)
+
+    def set_statistics(self, window=None, enable=True):
+        """
+        Compute statistics of selected buffers when data are read:
+        count, mean, variance, std, min, max and RMS of all samples
+        and of the last window samples.
+
+        :param int window: number of samples of rolling statistics (default: None no rolling statistics)
+        :param bool enable: False statistics are removed and not computed (default: True)
+        """
+        self.__statistics = {} if enable else None
+        self.__stat_window = window
+
+    def get_statistics(self, name, rolling=False):
+        """
+        Returns statistics of a selected buffer (see set_statistics).
+
+        :param str name: buffer name (see get_buffer_name)
+        :param bool rolling: True statistics of last window samples (default: False all samples)
+        :return dict: keys 'count', 'mean', 'variance', 'std', 'min', 'max', 'rms', None if no statistics
+        """
+        if self.__statistics is None or name not in self.__statistics:
+            return None
+        stats = self.__statistics[name][1 if rolling else 0]
+        if stats is None:
+            return None
+        return stats.get()
+
+    def get_ring_buffer(self, name):
+        """
+        Returns ring buffer of a selected buffer, or compact buffer
+        if set_storage is used. Buffer is created on first call.
+
+        :param str name: buffer name
+        :return RingBuffer: None if ring buffers are not used or name is not selected
+        """
+        if self.__rings is None or name not in self.__name_positions:
+            return None
+        if name not in self.__rings:
+            param = self.__ring_param
+            if 'block_size' in param:
+                is_time = self.__name_positions[name][1] == 0
+                encoding = param['time_encoding' if is_time else 'encoding']
+                self.__rings[name] = CompactBuffer(get_encoding(encoding),
+                                                   param['block_size'])
+                return self.__rings[name]
+            capacity = param['capacity']
+            if capacity is None:
+                rate = param['rate'] or self.get_sample_rate(name)
+                capacity = int(np.ceil(param['duration'] * rate))
+            self.__rings[name] = RingBuffer(capacity, dtype=param['dtype'],
+                                            policy=param['policy'])
+        return self.__rings[name]
+
+    def get_last_samples(self, name, nb=None):
+        """
+        Returns a contiguous view of the last samples of a selected buffer.
+
+        :param str name: buffer name
+        :param int nb: number of samples (default: None all samples kept)
+        :return numpy.ndarray: None if ring buffers are not used or name is not selected
+        """
+        ring = self.get_ring_buffer(name)
+        if ring is None:
+            return None
+        return ring.last(nb)
+
     def print_buffer_name(self):
         """
         Prints available buffers from configuration data.
@@ -0,0 +1,240 @@
+"""
+Pipeline class
+process acquired data on a thread or process pool
+"""
+import queue
+import threading
+import concurrent.futures
+import logging
+from multiprocessing import shared_memory
+import numpy as np
+
+# shared memory blocks opened by a worker process
+_BLOCKS = {}
+# end of results
+_END = object()
+
+
+def _run_stages(stages, chunk, layout=None):
+    """
+    Run stages on a chunk. In a worker process, chunk is the name of
+    a shared memory block and layout gives position of each array.
+    """
+    if layout is not None:
+        shm = _BLOCKS.get(chunk)
+        if shm is None:
+            # resource tracker of pool is the tracker of Pipeline process:
+            # block stays registered until Pipeline unlinks it
+            shm = _BLOCKS[chunk] = shared_memory.SharedMemory(name=chunk)
+        views = {}
+        for name, dtype, offset, shape in layout:
+            views[name] = np.ndarray(shape, dtype, shm.buf, offset)
+            views[name].flags.writeable = False
+        chunk = views
+    for stage in stages:
+        chunk = stage(chunk)
+    return chunk
+
+
+class Pipeline():
+    """
+    Processing of chunks on a thread or process pool: register submit
+    as a Logger callback, read_buffers returns as soon as the chunk is
+    queued. Each chunk goes through all stages (output of a stage is
+    input of next stage, first stage receives the chunk dict).
+    Results are given in submit order to callback or by get.
+    At most queue_size chunks are queued or processed: submit waits
+    for a free place (block True) or drops the chunk.
+    With a process pool, arrays are copied in shared memory blocks
+    reused from chunk to chunk: stages receive read-only views and
+    must be functions defined at module level.
+
+    :param list stages: functions with one argument (default: None no stage, add_stage)
+    :param str executor: 'thread' or 'process' (default: 'thread')
+    :param int workers: number of threads or processes (default: 2)
+    :param int queue_size: maximum number of chunks in pipeline (default: None 2 * workers)
+    :param callback: function called with each result in submit order (default: None use get)
+    :param bool block: True submit waits when pipeline is full, False chunk is dropped (default: True)
+    """
+    EXECUTORS = ('thread', 'process')
+
+    def __init__(self, stages=None, executor='thread', workers=2,
+                 queue_size=None, callback=None, block=True):
+        if executor not in Pipeline.EXECUTORS:
+            raise ValueError("executor must be in " +
+                             str(Pipeline.EXECUTORS))
+        #: processing functions
+        self.stages = list(stages or [])
+        #: function called with each result
+        self.callback = callback
+        #: True submit waits when pipeline is full
+        self.block = block
+        #: number of chunks dropped (pipeline full or close with cancel)
+        self.nb_dropped = 0
+        #: number of chunks whose processing raised an exception
+        self.nb_error = 0
+        if queue_size is None:
+            queue_size = 2 * workers
+        self.__slots = threading.BoundedSemaphore(queue_size)
+        if executor == 'process':
+            self.__executor = concurrent.futures.ProcessPoolExecutor(workers)
+            self.__blocks = []
+        else:
+            self.__executor = concurrent.futures.ThreadPoolExecutor(
+                workers, thread_name_prefix="phyphox-pipeline")
+            self.__blocks = None
+        self.__lock = threading.Lock()
+        self.__futures = queue.Queue()
+        self.__results = queue.Queue()
+        self.__collector = threading.Thread(target=self.__collect,
+                                            name="phyphox-pipeline-results",
+                                            daemon=True)
+        self.__collector.start()
+        self.__closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def add_stage(self, stage):
+        """
+        Add a processing function at the end of pipeline.
+
+        :param stage: function with one argument
+        """
+        self.stages.append(stage)
+
+    def __to_block(self, chunk):
+        """
+        Copy arrays of chunk in a free shared memory block.
+        """
+        arrays = [(name, np.asarray(values)) for name, values in
+                  chunk.items()]
+        layout = []
+        size = 0
+        for name, values in arrays:
+            if values.dtype.hasobject:
+                raise TypeError("array " + str(name) +
+                                " can not be copied in shared memory")
+            layout.append((name, values.dtype.str, size, values.shape))
+            size = size + values.nbytes
+            size = size + (-size % 8)
+        with self.__lock:
+            candidates = [shm for shm in self.__blocks if shm.size >= size]
+            if candidates:
+                shm = min(candidates, key=lambda shm: shm.size)
+                self.__blocks.remove(shm)
+            else:
+                shm = shared_memory.SharedMemory(create=True,
+                                                 size=max(size, 4096))
+        for (name, values), (_, dtype, offset, shape) in zip(arrays, layout):
+            np.ndarray(shape, dtype, shm.buf, offset)[...] = values
+        return shm, layout
+
+    def submit(self, chunk):
+        """
+        Queue a chunk (dict of array like for each buffer name).
+
+        :param dict chunk: new values
+        :return bool: False if chunk is dropped
+        """
+        if self.__closed:
+            raise RuntimeError("pipeline is closed")
+        if not self.__slots.acquire(self.block):
+            self.nb_dropped = self.nb_dropped + 1
+            logging.warning("Pipeline full: chunk dropped")
+            return False
+        stages = list(self.stages)
+        shm = None
+        try:
+            if self.__blocks is None:
+                future = self.__executor.submit(_run_stages, stages, chunk)
+            else:
+                shm, layout = self.__to_block(chunk)
+                future = self.__executor.submit(_run_stages, stages,
+                                                shm.name, layout)
+        except BaseException:
+            # chunk not queued: its place is free
+            if shm is not None:
+                with self.__lock:
+                    self.__blocks.append(shm)
+            self.__slots.release()
+            raise
+        self.__futures.put((future, shm))
+        return True
+
+    def __collect(self):
+        while True:
+            item = self.__futures.get()
+            if item is None:
+                self.__results.put(_END)
+                return
+            future, shm = item
+            cancelled = False
+            error = None
+            try:
+                result = future.result()
+            except concurrent.futures.CancelledError:
+                cancelled = True
+            except Exception as exception:
+                error = exception
+            if shm is not None:
+                with self.__lock:
+                    self.__blocks.append(shm)
+            if cancelled:
+                self.nb_dropped = self.nb_dropped + 1
+                logging.debug("Pipeline closed: chunk dropped")
+                self.__slots.release()
+            elif error is not None:
+                self.nb_error = self.nb_error + 1
+                logging.error("Error in pipeline: %s", repr(error))
+                self.__slots.release()
+            elif self.callback is not None:
+                try:
+                    self.callback(result)
+                except Exception:
+                    logging.exception("Error in pipeline callback %s",
+                                      str(self.callback))
+                self.__slots.release()
+            else:
+                self.__results.put(result)
+
+    def get(self, timeout=None):
+        """
+        Returns next result in submit order (callback is None).
+        Chunks whose processing raised an exception have no result.
+
+        :param float timeout: maximum time to wait in seconds (default: None no limit)
+        :return: result of last stage
+        :raise queue.Empty: if no result before timeout
+        :raise EOFError: if pipeline is closed and all results are read
+        """
+        result = self.__results.get(timeout=timeout)
+        if result is _END:
+            # kept for next calls
+            self.__results.put(_END)
+            raise EOFError("pipeline closed")
+        self.__slots.release()
+        return result
+
+    def close(self, cancel=False):
+        """
+        Stop pipeline and wait until chunks being processed are done.
+        Results can still be read with get.
+
+        :param bool cancel: True chunks not yet processed are dropped (default: False)
+        """
+        if self.__closed:
+            return
+        self.__closed = True
+        self.__futures.put(None)
+        self.__executor.shutdown(wait=True, cancel_futures=cancel)
+        self.__collector.join()
+        if self.__blocks is not None:
+            with self.__lock:
+                for shm in self.__blocks:
+                    shm.close()
+                    shm.unlink()
+                self.__blocks = []
@@ -0,0 +1,153 @@
+"""
+Recorder class
+append-only recording of acquired data in .npy files
+"""
+import os
+import time
+import struct
+import numpy as np
+
+#: size in bytes of .npy header written by Recorder
+HEADER_SIZE = 128
+
+
+def _npy_header(dtype, nb):
+    """
+    .npy header (format 1.0) with a fixed size: number of samples
+    can be updated in place.
+    """
+    header = "{'descr': " + repr(np.dtype(dtype).str) +\
+        ", 'fortran_order': False, 'shape': (" + str(nb) + ",), }"
+    header = header.ljust(HEADER_SIZE - 11) + "\n"
+    return b'\x93NUMPY\x01\x00' + struct.pack('<H', len(header)) +\
+        header.encode('latin1')
+
+
+class Recorder():
+    """
+    Append-only recording of buffers on disk: one .npy file for each
+    buffer name in directory. Register write method as a Logger callback
+    to record new data. Header (number of samples) is updated and files
+    are synchronised on disk every fsync_interval seconds: after a crash,
+    files are valid up to last synchronisation. An existing recording
+    is continued.
+
+    :param str directory: folder of recording (created if needed)
+    :param dtype: numpy data type in files (default: numpy.float64)
+    :param float fsync_interval: time in seconds between two synchronisations, 0 at each write, None only on close (default: 1.0)
+    """
+    def __init__(self, directory, dtype=np.float64, fsync_interval=1.0):
+        os.makedirs(directory, exist_ok=True)
+        #: folder of recording
+        self.directory = directory
+        #: time in seconds between two synchronisations
+        self.fsync_interval = fsync_interval
+        self.__dtype = np.dtype(dtype)
+        self.__files = {}
+        self.__counts = {}
+        self.__last_sync = time.monotonic()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __open(self, name):
+        path = os.path.join(self.directory, name + ".npy")
+        nb = 0
+        if os.path.exists(path):
+            with open(path, "rb") as fd:
+                np.lib.format.read_magic(fd)
+                shape, _, dtype = np.lib.format.read_array_header_1_0(fd)
+                size = fd.tell()
+            if dtype != self.__dtype or size != HEADER_SIZE:
+                raise ValueError(path + " is not a recording of " +
+                                 str(self.__dtype))
+            nb = shape[0]
+            fd = open(path, "r+b")
+            # samples written after last synchronisation are lost
+            fd.truncate(HEADER_SIZE + nb * self.__dtype.itemsize)
+            fd.seek(0, os.SEEK_END)
+        else:
+            fd = open(path, "w+b")
+            fd.write(_npy_header(self.__dtype, 0))
+        self.__files[name] = fd
+        self.__counts[name] = nb
+        return fd
+
+    def write(self, chunk):
+        """
+        Append new data at the end of files.
+
+        :param dict chunk: array like of values for each buffer name
+        """
+        for name, values in chunk.items():
+            fd = self.__files.get(name)
+            if fd is None:
+                fd = self.__open(name)
+            values = np.asarray(values, dtype=self.__dtype)
+            fd.write(values.tobytes())
+            self.__counts[name] = self.__counts[name] + values.shape[0]
+        if self.fsync_interval is not None and \
+                time.monotonic() - self.__last_sync >= self.fsync_interval:
+            self.flush()
+
+    def flush(self, sync=True):
+        """
+        Update headers and synchronise files on disk.
+
+        :param bool sync: True os.fsync is called (default: True)
+        """
+        for name, fd in self.__files.items():
+            fd.flush()
+            if sync:
+                os.fsync(fd.fileno())
+            fd.seek(0)
+            fd.write(_npy_header(self.__dtype, self.__counts[name]))
+            fd.seek(0, os.SEEK_END)
+            fd.flush()
+            if sync:
+                os.fsync(fd.fileno())
+        self.__last_sync = time.monotonic()
+
+    def get_count(self, name):
+        """
+        Returns number of samples written for a buffer.
+
+        :param str name: buffer name
+        :return int:
+        """
+        return self.__counts.get(name, 0)
+
+    def close(self):
+        """
+        Update headers and close files.
+        """
+        self.flush()
+        for fd in self.__files.values():
+            fd.close()
+        self.__files = {}
+
+
+def open_recording(directory, names=None):
+    """
+    Open a recording without loading it in memory (numpy.memmap).
+    Samples synchronised on disk are available while recording.
+
+    :param str directory: folder of recording
+    :param list names: buffer names (default: None all files in directory)
+    :return dict: read-only array for each buffer name
+    """
+    if names is None:
+        names = sorted(file_name[:-4] for file_name in os.listdir(directory)
+                       if file_name.endswith(".npy"))
+    tabs = {}
+    for name in names:
+        path = os.path.join(directory, name + ".npy")
+        try:
+            tabs[name] = np.load(path, mmap_mode='r')
+        except ValueError:
+            # numpy.memmap cannot map an empty file
+            tabs[name] = np.load(path)
+    return tabs
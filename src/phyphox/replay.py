@@ -0,0 +1,224 @@
+"""
+RecordingTransport and ReplayTransport classes
+record HTTP sessions with a phone and replay them without phone
+"""
+import os
+import time
+import zlib
+import struct
+import threading
+import collections
+import logging
+
+#: first bytes of a session file
+SESSION_MAGIC = b'PHYSES1\n'
+_RECORD = struct.Struct('<dII')
+
+
+def read_session(filename):
+    """
+    Read records of a session file written by RecordingTransport.
+    A record truncated by a crash ends the session.
+
+    :param str filename: session file name
+    :return: generator of (time in seconds since first request, path, body)
+    """
+    with open(filename, "rb") as fd:
+        for temps, path, offset, body_size in _index_session(fd):
+            fd.seek(offset)
+            yield temps, path, zlib.decompress(fd.read(body_size))
+
+
+def _index_session(fd):
+    """
+    Read headers and paths of a session file, skipping bodies.
+    A record truncated by a crash ends the session.
+
+    :param fd: session file opened in binary mode
+    :return: generator of (time, path, body offset, body size)
+    """
+    size = fd.seek(0, os.SEEK_END)
+    fd.seek(0)
+    if fd.read(len(SESSION_MAGIC)) != SESSION_MAGIC:
+        raise ValueError(str(fd.name) + " is not a session file")
+    position = len(SESSION_MAGIC)
+    while position + _RECORD.size <= size:
+        temps, path_size, body_size = _RECORD.unpack(fd.read(_RECORD.size))
+        path = fd.read(path_size)
+        offset = position + _RECORD.size + path_size
+        if offset + body_size > size:
+            return
+        yield temps, path.decode(), offset, body_size
+        position = offset + body_size
+        fd.seek(position)
+
+
+class RecordingTransport():
+    """
+    Transport saving every request path and answer body with its time
+    in a session file, answers being sent by another transport.
+    Bodies are compressed (zlib). Use ReplayTransport to read session.
+    File is flushed every flush_interval seconds: after a crash, session
+    is valid up to last flush.
+
+    :param transport: transport sending requests to phone
+    :param str filename: session file name (overwritten)
+    :param int level: zlib compression level 0 to 9 (default: 1 fastest)
+    :param float flush_interval: time in seconds between two flushes, 0 at each record, None only on close (default: 1.0)
+    """
+    def __init__(self, transport, filename, level=1, flush_interval=1.0):
+        #: transport sending requests to phone
+        self.transport = transport
+        #: zlib compression level
+        self.level = level
+        #: time in seconds between two flushes
+        self.flush_interval = flush_interval
+        self.__fd = open(filename, "wb")
+        self.__fd.write(SESSION_MAGIC)
+        self.__debut = None
+        self.__last_flush = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def __write(self, debut, path, body):
+        data = zlib.compress(body, self.level)
+        path = path.encode()
+        with self.__lock:
+            if self.__debut is None:
+                self.__debut = debut
+            self.__fd.write(_RECORD.pack(debut - self.__debut,
+                                         len(path), len(data)))
+            self.__fd.write(path)
+            self.__fd.write(data)
+            if self.flush_interval is not None and time.monotonic() -\
+                    self.__last_flush >= self.flush_interval:
+                self.__fd.flush()
+                self.__last_flush = time.monotonic()
+
+    def request(self, path, timeout=None):
+        """
+        Send a GET request and save answer.
+
+        :param str path: path and query string (e.g. "/meta")
+        :param float timeout: socket timeout for this request (default: None transport timeout)
+        :return bytes: response body
+        """
+        debut = time.monotonic()
+        if timeout is None:
+            body = self.transport.request(path)
+        else:
+            body = self.transport.request(path, timeout=timeout)
+        self.__write(debut, path, body)
+        return body
+
+    def stream(self, path, block_size=65536):
+        """
+        Send a GET request and read answer block by block.
+        Answer is saved when it is complete.
+
+        :param str path: path and query string (e.g. "/get?acc=full")
+        :param int block_size: maximum size of a block in bytes (default: 65536)
+        :return: generator of bytes blocks
+        """
+        debut = time.monotonic()
+        blocks = []
+        for block in self.transport.stream(path, block_size):
+            blocks.append(block)
+            yield block
+        self.__write(debut, path, b''.join(blocks))
+
+    def close(self):
+        """
+        Close session file and transport.
+        """
+        with self.__lock:
+            self.__fd.close()
+        self.transport.close()
+
+
+class ReplayTransport():
+    """
+    Transport answering with bodies of a session file: no phone is needed.
+    Answers are given in recorded order for each endpoint (path without
+    query string), so Logger.read_buffers, get_meta and get_config get
+    the same data as during recording. Last answer of an endpoint is
+    sent again when its records are exhausted, except for /get.
+    Records are indexed when file is opened, bodies are read and
+    decompressed on request.
+
+    :param str filename: session file written by RecordingTransport
+    :param float speed: None as fast as possible, 1.0 original pacing, 2.0 twice faster... (default: None)
+    """
+    def __init__(self, filename, speed=None):
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be greater than 0")
+        #: replay speed, None as fast as possible
+        self.speed = speed
+        self.__records = collections.defaultdict(collections.deque)
+        self.__last = {}
+        self.__fd = open(filename, "rb")
+        try:
+            for record in _index_session(self.__fd):
+                self.__records[record[1].split('?')[0]].append(record)
+        except BaseException:
+            self.__fd.close()
+            raise
+        self.__debut = None
+        self.__lock = threading.Lock()
+
+    def __next_record(self, path):
+        endpoint = path.split('?')[0]
+        with self.__lock:
+            records = self.__records.get(endpoint)
+            if records:
+                record = records.popleft()
+                self.__last[endpoint] = record
+            elif endpoint != "/get" and endpoint in self.__last:
+                record = self.__last[endpoint]
+                self.__fd.seek(record[2])
+                return zlib.decompress(self.__fd.read(record[3]))
+            else:
+                raise EOFError("No more answer for " + endpoint +
+                               " in session")
+            if self.__debut is None and self.speed is not None:
+                self.__debut = time.monotonic() - record[0] / self.speed
+            self.__fd.seek(record[2])
+            data = self.__fd.read(record[3])
+        body = zlib.decompress(data)
+        if record[1] != path:
+            logging.debug("Replay %s instead of %s", record[1], path)
+        if self.speed is not None:
+            attente = self.__debut + record[0] / self.speed -\
+                time.monotonic()
+            if attente > 0:
+                time.sleep(attente)
+        return body
+
+    def request(self, path, timeout=None):
+        """
+        Returns next recorded answer of path endpoint.
+
+        :param str path: path and query string (e.g. "/meta")
+        :param float timeout: not used
+        :return bytes: response body
+        :raise EOFError: if no more answer is recorded for /get
+        """
+        return self.__next_record(path)
+
+    def stream(self, path, block_size=65536):
+        """
+        Returns next recorded answer of path endpoint block by block.
+
+        :param str path: path and query string (e.g. "/get?acc=full")
+        :param int block_size: maximum size of a block in bytes (default: 65536)
+        :return: generator of bytes blocks
+        """
+        body = self.__next_record(path)
+        for debut in range(0, len(body), block_size):
+            yield body[debut:debut + block_size]
+
+    def close(self):
+        """
+        Close session file.
+        """
+        with self.__lock:
+            self.__fd.close()
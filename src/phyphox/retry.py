@@ -0,0 +1,260 @@
+"""
+RetryPolicy, CircuitBreaker and ResilientTransport classes
+deadlines, retries and hedging of requests sent to a phone
+"""
+import time
+import random
+import threading
+import http.client
+import urllib.error
+import concurrent.futures
+import logging
+
+
+class CircuitOpenError(ConnectionError):
+    """
+    Request not sent: too many requests to this phone failed.
+    """
+
+
+class RetryPolicy():
+    """
+    Parameters of ResilientTransport. A policy can be shared by
+    many loggers: each transport has its own circuit breaker.
+
+    :param int retries: number of retries after a failed request (default: 2)
+    :param float timeout: socket timeout of one try in seconds (default: 5.0)
+    :param float deadline: maximum time of a request, retries included, in seconds (default: None no limit)
+    :param float backoff: wait before first retry in seconds, doubled after each retry (default: 0.05)
+    :param float max_backoff: maximum wait before a retry in seconds (default: 1.0)
+    :param float jitter: wait is reduced by a random fraction up to jitter (default: 0.5)
+    :param float hedge_after: time in seconds before a second identical request is sent, None no hedging (default: None)
+    :param int breaker_threshold: number of failed requests opening circuit, None no circuit breaker (default: None)
+    :param float breaker_reset: time in seconds before a request is tried on an open circuit (default: 30.0)
+    """
+    def __init__(self, retries=2, timeout=5.0, deadline=None, backoff=0.05,
+                 max_backoff=1.0, jitter=0.5, hedge_after=None,
+                 breaker_threshold=None, breaker_reset=30.0):
+        if retries < 0 or not 0 <= jitter <= 1:
+            raise ValueError("retries >= 0 and 0 <= jitter <= 1")
+        #: number of retries after a failed request
+        self.retries = retries
+        #: socket timeout of one try in seconds
+        self.timeout = timeout
+        #: maximum time of a request in seconds
+        self.deadline = deadline
+        #: wait before first retry in seconds
+        self.backoff = backoff
+        #: maximum wait before a retry in seconds
+        self.max_backoff = max_backoff
+        #: random fraction of wait
+        self.jitter = jitter
+        #: time in seconds before a hedged request
+        self.hedge_after = hedge_after
+        #: number of failed requests opening circuit
+        self.breaker_threshold = breaker_threshold
+        #: time in seconds before a request is tried on an open circuit
+        self.breaker_reset = breaker_reset
+
+    def get_backoff(self, nb_try):
+        """
+        Returns wait before a retry.
+
+        :param int nb_try: number of tries already sent
+        :return float: time in seconds
+        """
+        attente = min(self.backoff * 2 ** (nb_try - 1), self.max_backoff)
+        return attente * (1 - self.jitter * random.random())
+
+
+class CircuitBreaker():
+    """
+    After threshold failed requests in a row, circuit is open:
+    requests are rejected during reset_timeout seconds, then
+    one request is tried (half-open) and closes circuit if it succeeds.
+
+    :param int threshold: number of failed requests in a row opening circuit
+    :param float reset_timeout: time in seconds before a request is tried
+    """
+    def __init__(self, threshold, reset_timeout=30.0):
+        #: number of failed requests in a row opening circuit
+        self.threshold = threshold
+        #: time in seconds before a request is tried
+        self.reset_timeout = reset_timeout
+        #: 'closed', 'open' or 'half-open'
+        self.state = 'closed'
+        self.__nb_failure = 0
+        self.__opened_at = 0.0
+        self.__lock = threading.Lock()
+
+    def allow(self):
+        """
+        Returns True if a request can be sent.
+
+        :return bool:
+        """
+        with self.__lock:
+            if self.state == 'closed':
+                return True
+            if self.state == 'open' and \
+                    time.monotonic() - self.__opened_at >= self.reset_timeout:
+                # only one request is tried
+                self.state = 'half-open'
+                return True
+            return False
+
+    def success(self):
+        """
+        Record a successful request.
+        """
+        with self.__lock:
+            self.__nb_failure = 0
+            self.state = 'closed'
+
+    def failure(self):
+        """
+        Record a failed request.
+        """
+        with self.__lock:
+            self.__nb_failure = self.__nb_failure + 1
+            if self.state == 'half-open' or \
+                    self.__nb_failure >= self.threshold:
+                if self.state != 'open':
+                    logging.warning("Circuit open after %d failures",
+                                    self.__nb_failure)
+                self.state = 'open'
+                self.__opened_at = time.monotonic()
+
+
+class ResilientTransport():
+    """
+    Transport sending requests with another transport, with a timeout
+    for each try, a deadline, retries with jittered exponential backoff,
+    hedged requests and a circuit breaker (see RetryPolicy). A retry
+    sends the same path: for Logger.read_buffers in UPDATE mode, data
+    are asked since the same threshold and no sample is lost or
+    duplicated. /control requests are never hedged.
+
+    :param transport: transport sending requests, request must accept a timeout argument
+    :param RetryPolicy policy: default None RetryPolicy()
+    """
+    def __init__(self, transport, policy=None):
+        #: transport sending requests
+        self.transport = transport
+        #: retry parameters
+        self.policy = policy or RetryPolicy()
+        #: circuit breaker, None if not used
+        self.breaker = None
+        if self.policy.breaker_threshold is not None:
+            self.breaker = CircuitBreaker(self.policy.breaker_threshold,
+                                          self.policy.breaker_reset)
+        #: number of retries sent
+        self.nb_retry = 0
+        #: number of hedged requests sent
+        self.nb_hedged = 0
+        #: number of requests rejected by circuit breaker
+        self.nb_rejected = 0
+        self.__executor = None
+
+    def __try(self, path, timeout):
+        if self.policy.hedge_after is None or path.startswith("/control"):
+            return self.transport.request(path, timeout=timeout)
+        if self.__executor is None:
+            self.__executor = concurrent.futures.ThreadPoolExecutor(
+                4, thread_name_prefix="phyphox-hedge")
+        futures = [self.__executor.submit(self.transport.request, path,
+                                          timeout=timeout)]
+        done, _ = concurrent.futures.wait(futures, self.policy.hedge_after)
+        if not done:
+            self.nb_hedged = self.nb_hedged + 1
+            futures.append(self.__executor.submit(self.transport.request,
+                                                  path, timeout=timeout))
+        if len(futures) == 1:
+            return futures[0].result()
+        # first answer is used, error if both requests fail
+        for future in concurrent.futures.as_completed(futures):
+            error = future.exception()
+            if error is None:
+                return future.result()
+        raise error
+
+    def request(self, path, timeout=None):
+        """
+        Send a GET request with retries.
+
+        :param str path: path and query string (e.g. "/meta")
+        :param float timeout: socket timeout of one try (default: None policy timeout)
+        :return bytes: response body
+        :raise CircuitOpenError: if circuit breaker is open
+        :raise TimeoutError: if deadline is reached
+        """
+        if self.breaker is not None and not self.breaker.allow():
+            self.nb_rejected = self.nb_rejected + 1
+            raise CircuitOpenError("Circuit open for " + path)
+        if timeout is None:
+            timeout = self.policy.timeout
+        fin = None
+        if self.policy.deadline is not None:
+            fin = time.monotonic() + self.policy.deadline
+        nb_try = 0
+        while True:
+            try_timeout = timeout
+            if fin is not None:
+                remaining = fin - time.monotonic()
+                if remaining <= 0:
+                    self.__failure()
+                    raise TimeoutError("Deadline reached for " + path)
+                try_timeout = remaining if timeout is None else\
+                    min(timeout, remaining)
+            try:
+                body = self.__try(path, try_timeout)
+            except urllib.error.HTTPError:
+                # phone answered: not a connection problem
+                self.__success()
+                raise
+            except (OSError, http.client.HTTPException) as error:
+                nb_try = nb_try + 1
+                if nb_try > self.policy.retries:
+                    self.__failure()
+                    raise
+                attente = self.policy.get_backoff(nb_try)
+                if fin is not None:
+                    attente = min(attente, max(fin - time.monotonic(), 0))
+                logging.info("Retry %d of %s in %.3f s: %s", nb_try, path,
+                             attente, str(error))
+                self.nb_retry = self.nb_retry + 1
+                time.sleep(attente)
+                continue
+            self.__success()
+            return body
+
+    def __success(self):
+        if self.breaker is not None:
+            self.breaker.success()
+
+    def __failure(self):
+        if self.breaker is not None:
+            self.breaker.failure()
+
+    def stream(self, path, block_size=65536):
+        """
+        Send a GET request and read answer block by block.
+        Circuit breaker is checked, a broken stream is not retried.
+
+        :param str path: path and query string (e.g. "/get?acc=full")
+        :param int block_size: maximum size of a block in bytes (default: 65536)
+        :return: generator of bytes blocks
+        :raise CircuitOpenError: if circuit breaker is open
+        """
+        if self.breaker is not None and not self.breaker.allow():
+            self.nb_rejected = self.nb_rejected + 1
+            raise CircuitOpenError("Circuit open for " + path)
+        return self.transport.stream(path, block_size)
+
+    def close(self):
+        """
+        Close transport.
+        """
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=False)
+        self.transport.close()
@@ -0,0 +1,148 @@
+"""
+RingBuffer class
+preallocated numpy buffer for acquired data
+"""
+import numpy as np
+
+
+class RingBuffer():
+    """
+    Preallocated numpy buffer keeping the last capacity samples.
+    Samples are stored in one array with some slack: when the end of
+    the array is reached, the last samples are moved at the beginning.
+    Hence the last samples are always contiguous in memory.
+
+    :param int capacity: number of samples kept
+    :param dtype: numpy data type (default: numpy.float64)
+    :param str policy: 'overwrite' oldest samples are lost or 'grow' capacity is doubled (default: 'overwrite')
+    :param float slack: extra memory allocated as a fraction of capacity (default: 0.25)
+    """
+    POLICIES = ('overwrite', 'grow')
+
+    def __init__(self, capacity, dtype=np.float64, policy='overwrite',
+                 slack=0.25):
+        if capacity < 1:
+            raise ValueError("capacity must be greater than 0")
+        if policy not in RingBuffer.POLICIES:
+            raise ValueError("policy must be in " + str(RingBuffer.POLICIES))
+        #: number of samples kept
+        self.capacity = int(capacity)
+        #: 'overwrite' or 'grow'
+        self.policy = policy
+        self.__slack = slack
+        self.__data = np.empty(self.__allocation(), dtype=dtype)
+        self.__begin = 0
+        self.__end = 0
+        #: number of samples appended since creation
+        self.total = 0
+
+    @classmethod
+    def from_duration(cls, duration, rate, **kwargs):
+        """
+        Build a ring buffer keeping duration seconds of data.
+
+        :param float duration: time in seconds
+        :param float rate: sample rate in Hz
+        :return RingBuffer:
+        """
+        return cls(int(np.ceil(duration * rate)), **kwargs)
+
+    def __allocation(self):
+        return self.capacity + max(int(self.capacity * self.__slack), 1)
+
+    def __len__(self):
+        return self.__end - self.__begin
+
+    def __repr__(self):
+        return 'RingBuffer(capacity=' + str(self.capacity) + ', size=' +\
+            str(len(self)) + ', dtype=' + str(self.dtype) + ')'
+
+    @property
+    def dtype(self):
+        """
+        numpy data type of samples
+        """
+        return self.__data.dtype
+
+    @property
+    def nbytes(self):
+        """
+        memory used by samples array
+        """
+        return self.__data.nbytes
+
+    def append(self, values):
+        """
+        Append samples at the end of buffer.
+
+        :param values: array like of samples
+        """
+        values = np.asarray(values, dtype=self.__data.dtype).ravel()
+        nb = values.shape[0]
+        if nb == 0:
+            return
+        self.total = self.total + nb
+        if len(self) + nb > self.capacity and self.policy == 'grow':
+            while len(self) + nb > self.capacity:
+                self.capacity = 2 * self.capacity
+            data = np.empty(self.__allocation(), dtype=self.__data.dtype)
+            data[:len(self)] = self.__data[self.__begin:self.__end]
+            self.__end = len(self)
+            self.__begin = 0
+            self.__data = data
+        if nb >= self.capacity:
+            self.__data[:self.capacity] = values[-self.capacity:]
+            self.__begin = 0
+            self.__end = self.capacity
+            return
+        if self.__end + nb > self.__data.shape[0]:
+            # keep samples still needed and move them at the beginning
+            keep = min(len(self), self.capacity - nb)
+            self.__data[:keep] = self.__data[self.__end - keep:self.__end]
+            self.__begin = 0
+            self.__end = keep
+        self.__data[self.__end:self.__end + nb] = values
+        self.__end = self.__end + nb
+        if len(self) > self.capacity:
+            self.__begin = self.__end - self.capacity
+
+    def last(self, nb=None):
+        """
+        Returns a contiguous view of the last nb samples.
+
+        :param int nb: number of samples (default: None all samples)
+        :return numpy.ndarray:
+        """
+        if nb is None or nb > len(self):
+            nb = len(self)
+        return self.__data[self.__end - nb:self.__end]
+
+    def view(self, nb=None):
+        """
+        Returns a read-only view of the last nb samples.
+        View is valid until next append.
+
+        :param int nb: number of samples (default: None all samples)
+        :return numpy.ndarray:
+        """
+        tab = self.last(nb)
+        tab.flags.writeable = False
+        return tab
+
+    def since(self, index):
+        """
+        Returns a read-only view of samples from index.
+        index is the position in all samples appended since creation.
+        Samples lost (overwritten) are not returned.
+
+        :param int index: index of first sample
+        :return numpy.ndarray:
+        """
+        return self.view(max(self.total - max(index, 0), 0))
+
+    def clear(self):
+        """
+        Remove all samples.
+        """
+        self.__begin = 0
+        self.__end = 0
@@ -0,0 +1,258 @@
+"""
+SharedPublisher and SharedReader classes
+share acquired data with other processes using shared memory
+"""
+import json
+import time
+import struct
+from multiprocessing import shared_memory, resource_tracker
+import numpy as np
+
+#: first bytes of a shared memory block written by SharedPublisher
+SHARED_MAGIC = b'PHYSHM1\0'
+_HEADER = struct.Struct('<8sqq')
+
+
+def _attach(name):
+    """
+    Open an existing block without removing it when process ends.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # python < 3.13: block is registered by resource tracker
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+class SharedPublisher():
+    """
+    Ring buffers in a shared memory block: one for each buffer name,
+    capacity samples each. Register write method as a Logger callback:
+    other processes read new samples with SharedReader, the phone is
+    polled once. A sequence counter is increased before and after each
+    chunk (odd while a chunk is written), a total counter of samples
+    for each buffer is updated after samples are written.
+
+    :param list names: buffer names (e.g. get_selected_names result flattened)
+    :param int capacity: number of samples kept for each buffer
+    :param dtype: numpy data type (default: numpy.float64)
+    :param str name: shared memory block name (default: None name chosen by system)
+    """
+    def __init__(self, names, capacity, dtype=np.float64, name=None):
+        if capacity < 1:
+            raise ValueError("capacity must be greater than 0")
+        #: buffer names
+        self.names = list(names)
+        #: number of samples kept for each buffer
+        self.capacity = int(capacity)
+        self.__dtype = np.dtype(dtype)
+        description = json.dumps({'names': self.names,
+                                  'capacity': self.capacity,
+                                  'dtype': self.__dtype.str}).encode()
+        offset = _HEADER.size + len(description)
+        offset = offset + (-offset % 8)
+        size = offset + 8 * len(self.names) +\
+            len(self.names) * self.capacity * self.__dtype.itemsize
+        self.__shm = shared_memory.SharedMemory(name=name, create=True,
+                                                size=size)
+        #: shared memory block name used by SharedReader
+        self.name = self.__shm.name
+        self.__shm.buf[:_HEADER.size] = _HEADER.pack(SHARED_MAGIC, 0,
+                                                     len(description))
+        self.__shm.buf[_HEADER.size:_HEADER.size + len(description)] =\
+            description
+        self.__seq = np.ndarray((1,), np.int64, self.__shm.buf, 8)
+        self.__totals = np.ndarray((len(self.names),), np.int64,
+                                   self.__shm.buf, offset)
+        self.__totals[:] = 0
+        self.__data = np.ndarray((len(self.names), self.capacity),
+                                 self.__dtype, self.__shm.buf,
+                                 offset + 8 * len(self.names))
+        self.__positions = {name: idx for idx, name in enumerate(self.names)}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, chunk):
+        """
+        Append new samples in ring buffers.
+
+        :param dict chunk: array like of values for each buffer name
+        """
+        # odd: readers copying samples must read them again
+        self.__seq[0] = self.__seq[0] + 1
+        for name, values in chunk.items():
+            idx = self.__positions.get(name)
+            if idx is None:
+                continue
+            values = np.asarray(values, dtype=self.__dtype)
+            total = int(self.__totals[idx])
+            nb = values.shape[0]
+            if nb > self.capacity:
+                values = values[-self.capacity:]
+            debut = (total + nb - values.shape[0]) % self.capacity
+            first = min(values.shape[0], self.capacity - debut)
+            self.__data[idx, debut:debut + first] = values[:first]
+            self.__data[idx, :values.shape[0] - first] = values[first:]
+            # samples are written before total is published
+            self.__totals[idx] = total + nb
+        self.__seq[0] = self.__seq[0] + 1
+
+    def close(self, unlink=True):
+        """
+        Close shared memory block.
+
+        :param bool unlink: True block is removed, readers can no longer open it (default: True)
+        """
+        del self.__seq, self.__totals, self.__data
+        self.__shm.close()
+        if unlink:
+            self.__shm.unlink()
+
+
+class SharedReader():
+    """
+    Reader of a block written by SharedPublisher in the same or another
+    process. read returns views of shared memory (no copy): use them
+    before capacity new samples are written, or use copy=True: a copy is
+    taken again if a chunk was written meanwhile (seqlock).
+    Samples overwritten before they are read are counted in lost.
+
+    :param str name: shared memory block name (SharedPublisher.name)
+    :param bool from_start: True samples already in block are read, False only new samples (default: True)
+    """
+    def __init__(self, name, from_start=True):
+        self.__shm = _attach(name)
+        magic, _, size = _HEADER.unpack(bytes(self.__shm.buf[:_HEADER.size]))
+        if magic != SHARED_MAGIC:
+            self.__shm.close()
+            raise ValueError(name + " is not a phyphox shared block")
+        description = json.loads(bytes(
+            self.__shm.buf[_HEADER.size:_HEADER.size + size]))
+        offset = _HEADER.size + size
+        offset = offset + (-offset % 8)
+        #: buffer names
+        self.names = description['names']
+        #: number of samples kept for each buffer
+        self.capacity = description['capacity']
+        #: number of samples overwritten before being read for each buffer
+        self.lost = {name: 0 for name in self.names}
+        self.__seq = np.ndarray((1,), np.int64, self.__shm.buf, 8)
+        self.__totals = np.ndarray((len(self.names),), np.int64,
+                                   self.__shm.buf, offset)
+        self.__data = np.ndarray((len(self.names), self.capacity),
+                                 np.dtype(description['dtype']),
+                                 self.__shm.buf,
+                                 offset + 8 * len(self.names))
+        self.__positions = {name: idx for idx, name in enumerate(self.names)}
+        self.__read = {name: 0 if from_start else int(self.__totals[idx])
+                       for name, idx in self.__positions.items()}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def get_seq(self):
+        """
+        Returns sequence counter: number of chunks written.
+
+        :return int:
+        """
+        return int(self.__seq[0]) // 2
+
+    def get_total(self, name):
+        """
+        Returns number of samples written for a buffer.
+
+        :param str name: buffer name
+        :return int:
+        """
+        return int(self.__totals[self.__positions[name]])
+
+    def wait(self, seq, timeout=None, interval=0.001):
+        """
+        Wait until sequence counter is different from seq.
+
+        :param int seq: last sequence counter known
+        :param float timeout: maximum time to wait in seconds (default: None no limit)
+        :param float interval: time between two checks in seconds (default: 0.001)
+        :return bool: True if new data were written
+        """
+        fin = None if timeout is None else time.monotonic() + timeout
+        while self.get_seq() == seq:
+            if fin is not None and time.monotonic() >= fin:
+                return False
+            time.sleep(interval)
+        return True
+
+    def read(self, name, copy=False, timeout=1.0):
+        """
+        Returns samples of a buffer written since last read.
+        Samples are read again while a chunk is written: if publisher
+        stops while writing (process killed), TimeoutError is raised.
+
+        :param str name: buffer name
+        :param bool copy: True returns a copy in one array (default: False)
+        :param float timeout: maximum time in seconds waiting for a chunk being written, None no limit (default: 1.0)
+        :return list: views of shared memory (one or two arrays, ring buffer end is reached) or a numpy array if copy is True
+        :raise TimeoutError: if a chunk is still being written after timeout
+        """
+        idx = self.__positions[name]
+        fin = None
+        while True:
+            seq = int(self.__seq[0])
+            if seq % 2:
+                # chunk being written
+                if timeout is not None:
+                    if fin is None:
+                        fin = time.monotonic() + timeout
+                    elif time.monotonic() >= fin:
+                        raise TimeoutError("Chunk of " + self.__shm.name +
+                                           " still written after " +
+                                           str(timeout) + " s")
+                time.sleep(0)
+                continue
+            total = int(self.__totals[idx])
+            debut = self.__read[name]
+            lost = max(total - debut - self.capacity, 0)
+            debut = debut + lost
+            start = debut % self.capacity
+            nb = total - debut
+            views = [self.__data[idx, start:start + nb]]
+            if start + nb > self.capacity:
+                views.append(self.__data[idx, :start + nb - self.capacity])
+            if not copy:
+                break
+            values = np.concatenate(views)
+            # no chunk written during copy: samples are consistent
+            if int(self.__seq[0]) == seq:
+                break
+        self.lost[name] = self.lost[name] + lost
+        self.__read[name] = total
+        if copy:
+            return values
+        return views
+
+    def read_all(self, copy=True, timeout=1.0):
+        """
+        Returns samples of all buffers written since last read.
+
+        :param bool copy: True one array for each buffer (default: True)
+        :param float timeout: see read (default: 1.0)
+        :return dict: read result for each buffer name
+        """
+        return {name: self.read(name, copy, timeout) for name in self.names}
+
+    def close(self):
+        """
+        Close shared memory block. Views returned by read must be deleted first.
+        """
+        del self.__seq, self.__totals, self.__data
+        self.__shm.close()
@@ -0,0 +1,300 @@
+"""
+Simulator class
+local stand-in of phyphox phone application
+"""
+import io
+import json
+import time
+import zlib
+import zipfile
+import threading
+import urllib.parse
+import http.server
+import numpy as np
+from .export import EXPORT_FORMATS
+
+#: sensor name and buffer prefix of simulated sets
+SOURCES = (("accelerometer", "acc"),
+           ("gyroscope", "gyr"),
+           ("magnetic_field", "mag"),
+           ("linear_acceleration", "lin"),
+           ("pressure", "pressure"),
+           ("light", "light"))
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        simulator = self.server.simulator
+        url = urllib.parse.urlsplit(self.path)
+        query = urllib.parse.parse_qsl(url.query, keep_blank_values=True)
+        body = simulator.answer(url.path, query)
+        if simulator.latency:
+            time.sleep(simulator.latency)
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        if url.path == "/export":
+            self.send_header("Content-Type", "application/zip")
+        else:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Simulator():
+    """
+    Local HTTP server answering like phyphox phone application:
+    /meta, /config, /control (start, stop, clear), /time, /get (full,
+    last and threshold queries) and /export. Each set is a sensor with
+    a time buffer and nb_buffer - 1 value buffers. Samples are computed
+    when they are asked: nothing is stored, whatever the duration.
+    Use it to test or benchmark without a phone.
+
+    :param int nb_set: number of sensors (default: 1)
+    :param int nb_buffer: number of buffers of each sensor, time included (default: 4)
+    :param rate: sample rate in Hz, float or list of float for each sensor (default: 100.0)
+    :param str host: server address (default: '127.0.0.1')
+    :param int port: server port, 0 a free port is chosen (default: 0)
+    :param float latency: time in seconds added before each answer (default: 0.0)
+    :param bool measuring: True measure is started with server (default: True)
+    """
+    def __init__(self, nb_set=1, nb_buffer=4, rate=100.0, host="127.0.0.1",
+                 port=0, latency=0.0, measuring=True):
+        if nb_set < 1 or nb_buffer < 2:
+            raise ValueError("nb_set >= 1 and nb_buffer >= 2")
+        if isinstance(rate, (int, float)):
+            rate = nb_set * [rate]
+        if len(rate) != nb_set:
+            raise ValueError("one rate for each set")
+        #: sample rate in Hz of each set
+        self.rates = [float(r) for r in rate]
+        #: time in seconds added before each answer
+        self.latency = latency
+        #: number of requests received
+        self.nb_request = 0
+        #: buffer names of each set, time buffer first
+        self.buffer_names = []
+        self.__config = {'title': "Simulator", 'localTitle': "Simulator",
+                         'category': "phyphox-py",
+                         'localCategory': "phyphox-py",
+                         'buffers': [], 'inputs': [], 'export': []}
+        self.__sensors = {}
+        for idx in range(nb_set):
+            source, prefix = SOURCES[idx % len(SOURCES)]
+            if idx >= len(SOURCES):
+                source = source + str(idx)
+                prefix = prefix + str(idx)
+            names = [prefix + "_time"] + [
+                prefix + "XYZ"[col] if col < 3 else prefix + str(col)
+                for col in range(nb_buffer - 1)]
+            self.buffer_names.append(names)
+            outputs = [{'t': names[0]}] + [
+                {"xyz"[col] if col < 3 else "v" + str(col): name}
+                for col, name in enumerate(names[1:])]
+            self.__config['buffers'].extend({'name': name, 'size': 0}
+                                            for name in names)
+            self.__config['inputs'].append({'source': source,
+                                            'outputs': outputs})
+            self.__config['export'].append({
+                'set': source,
+                'sources': [{'label': "Time (s)", 'buffer': names[0]}] +
+                [{'label': name, 'buffer': name} for name in names[1:]]})
+            self.__sensors[source] = {'Name': source, 'Vendor': "phyphox-py",
+                                      'MinDelay': 1e6 / self.rates[idx]}
+        self.__config['crc32'] = format(zlib.crc32(json.dumps(
+            self.__config, sort_keys=True).encode()), '08x')
+        self.__positions = {name: (idx, col)
+                            for idx, names in enumerate(self.buffer_names)
+                            for col, name in enumerate(names)}
+        self.__lock = threading.Lock()
+        self.__elapsed = 0.0
+        self.__debut = None
+        self.__events = []
+        if measuring:
+            self.__control("start")
+        self.__server = http.server.ThreadingHTTPServer((host, port),
+                                                        _Handler)
+        self.__server.daemon_threads = True
+        self.__server.simulator = self
+        #: server address
+        self.host = host
+        #: server port
+        self.port = self.__server.server_port
+        self.__thread = threading.Thread(target=self.__server.serve_forever,
+                                         name="phyphox-simulator",
+                                         daemon=True)
+        self.__thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Stop server.
+        """
+        self.__server.shutdown()
+        self.__server.server_close()
+        self.__thread.join()
+
+    def elapsed(self):
+        """
+        Returns experiment time in seconds.
+
+        :return float:
+        """
+        with self.__lock:
+            if self.__debut is None:
+                return self.__elapsed
+            return self.__elapsed + time.monotonic() - self.__debut
+
+    def get_count(self, idx_set=0):
+        """
+        Returns number of samples available in a set.
+
+        :param int idx_set: set index (default: 0)
+        :return int:
+        """
+        return int(self.elapsed() * self.rates[idx_set])
+
+    def values(self, name, debut=0, fin=None):
+        """
+        Returns samples debut to fin of a buffer.
+
+        :param str name: buffer name
+        :param int debut: first index (default: 0)
+        :param int fin: last index excluded (default: None number of samples available)
+        :return numpy.ndarray:
+        """
+        idx, col = self.__positions[name]
+        if fin is None:
+            fin = self.get_count(idx)
+        temps = np.arange(debut, max(fin, debut)) / self.rates[idx]
+        if col == 0:
+            return temps
+        return np.sin(2 * np.pi * col * temps) + col
+
+    def __control(self, cmd):
+        with self.__lock:
+            now = time.monotonic()
+            if cmd == "start" and self.__debut is None:
+                self.__debut = now
+                self.__events.append({'event': "START",
+                                      'experimentTime': self.__elapsed,
+                                      'systemTime': time.time()})
+            elif cmd == "stop" and self.__debut is not None:
+                self.__elapsed = self.__elapsed + now - self.__debut
+                self.__debut = None
+                self.__events.append({'event': "PAUSE",
+                                      'experimentTime': self.__elapsed,
+                                      'systemTime': time.time()})
+            elif cmd == "clear":
+                self.__elapsed = 0.0
+                self.__debut = None
+                self.__events = []
+
+    def __first_index(self, name, threshold, count):
+        """
+        First index of buffer name with a value greater than threshold.
+        """
+        idx, col = self.__positions[name]
+        if col == 0:
+            rate = self.rates[idx]
+            debut = int(np.floor(threshold * rate)) + 1
+            # time values are debut / rate: rounding is corrected
+            while debut > 0 and (debut - 1) / rate > threshold:
+                debut = debut - 1
+            while debut / rate <= threshold:
+                debut = debut + 1
+        else:
+            debut = int(np.searchsorted(self.values(name, 0, count),
+                                        threshold, side='right'))
+        return min(max(debut, 0), count)
+
+    def __get(self, query):
+        counts = [self.get_count(idx) for idx in range(len(self.rates))]
+        buffers = []
+        for name, value in query:
+            if name not in self.__positions:
+                continue
+            count = counts[self.__positions[name][0]]
+            if value == "full":
+                mode, debut = "full", 0
+            elif value == "":
+                mode, debut = "single", max(count - 1, 0)
+            else:
+                mode = "partial"
+                threshold, _, reference = value.partition("|")
+                if not reference:
+                    reference = self.buffer_names[
+                        self.__positions[name][0]][0]
+                debut = self.__first_index(reference, float(threshold),
+                                           counts[self.__positions[
+                                               reference][0]])
+            values = self.values(name, debut, count)
+            buffers.append('"' + name + '":{"size":0,"updateMode":"' + mode +
+                           '","buffer":[' +
+                           ",".join(map(repr, values.tolist())) + ']}')
+        status = {'session': "0", 'measuring': self.__debut is not None,
+                  'timedRun': False, 'countDown': 0}
+        return ('{"buffer":{' + ",".join(buffers) + '},"status":' +
+                json.dumps(status) + '}').encode()
+
+    def __export(self, filetype):
+        separator, decimal = EXPORT_FORMATS.get(filetype, EXPORT_FORMATS[1])
+        memory = io.BytesIO()
+        with zipfile.ZipFile(memory, "w", zipfile.ZIP_DEFLATED) as archive:
+            for cpt_set in self.__config['export']:
+                labels = [src['label'] for src in cpt_set['sources']]
+                tab = np.column_stack([self.values(src['buffer'])
+                                       for src in cpt_set['sources']])
+                lines = [separator.join('"' + label + '"'
+                                        for label in labels)]
+                for row in tab.tolist():
+                    lines.append(separator.join(
+                        repr(v).replace('.', decimal) for v in row))
+                archive.writestr(cpt_set['set'] + ".csv",
+                                 "\n".join(lines) + "\n")
+        return memory.getvalue()
+
+    def answer(self, path, query):
+        """
+        Returns answer body of a request.
+
+        :param str path: request path ('/get', '/meta'...)
+        :param list query: list of (name, value) decoded from query string
+        :return bytes: None if path is unknown
+        """
+        with self.__lock:
+            self.nb_request = self.nb_request + 1
+        match path:
+            case "/get":
+                return self.__get(query)
+            case "/config":
+                return json.dumps(self.__config).encode()
+            case "/meta":
+                return json.dumps({'version': "1.2.0", 'build': "0",
+                                   'fileFormat': "1.19",
+                                   'deviceModel': "Simulator",
+                                   'deviceBrand': "phyphox-py",
+                                   'sensors': self.__sensors}).encode()
+            case "/time":
+                with self.__lock:
+                    return json.dumps(self.__events).encode()
+            case "/control":
+                self.__control(dict(query).get("cmd"))
+                return b'{"result":true}'
+            case "/export":
+                # xls (format 0) is not simulated: format 1 is sent
+                return self.__export(int(dict(query).get("format", 1)))
+        return None
@@ -0,0 +1,144 @@
+"""
+Spectrogram class
+streaming short-time Fourier transform of a buffer
+"""
+import numpy as np
+
+#: window functions known by name
+WINDOWS = {'hann': np.hanning,
+           'hamming': np.hamming,
+           'blackman': np.blackman,
+           'bartlett': np.bartlett,
+           'rect': np.ones}
+
+
+class Spectrogram():
+    """
+    Streaming short-time Fourier transform: a frame of nfft samples
+    starts every hop samples. Samples are kept only until their last
+    frame is computed, so each frame is computed once when data arrive.
+    Last history spectra are kept. Sample rate is estimated using
+    the time buffer.
+
+    :param int nfft: number of samples of a frame
+    :param int hop: number of samples between two frames, at most nfft (default: None nfft // 4)
+    :param window: name in WINDOWS, array of nfft values or function of nfft (default: 'hann')
+    :param int history: number of spectra kept (default: 100)
+    :param str mode: 'magnitude', 'power' or 'complex' (default: 'magnitude')
+    """
+    MODES = ('magnitude', 'power', 'complex')
+
+    def __init__(self, nfft, hop=None, window='hann', history=100,
+                 mode='magnitude'):
+        if hop is None:
+            hop = max(nfft // 4, 1)
+        if nfft < 2 or not 1 <= hop <= nfft or history < 1:
+            raise ValueError("nfft >= 2, 1 <= hop <= nfft and history >= 1")
+        if mode not in Spectrogram.MODES:
+            raise ValueError("mode must be in " + str(Spectrogram.MODES))
+        #: number of samples of a frame
+        self.nfft = int(nfft)
+        #: number of samples between two frames
+        self.hop = int(hop)
+        #: 'magnitude', 'power' or 'complex'
+        self.mode = mode
+        if isinstance(window, str):
+            window = WINDOWS[window](self.nfft)
+        elif callable(window):
+            window = window(self.nfft)
+        self.__window = np.asarray(window, dtype=np.float64)
+        if self.__window.shape != (self.nfft,):
+            raise ValueError("window must have nfft values")
+        dtype = np.complex128 if mode == 'complex' else np.float64
+        self.__spectra = np.zeros((history, self.nfft // 2 + 1), dtype=dtype)
+        self.__times = np.zeros(history)
+        #: number of frames computed since creation
+        self.total = 0
+        self.__pending = [np.empty(0), np.empty(0)]
+        self.__first_time = None
+        self.__last_time = None
+        self.__count = 0
+
+    def __repr__(self):
+        return 'Spectrogram(nfft=' + str(self.nfft) + ', hop=' +\
+            str(self.hop) + ', frames=' + str(self.total) + ')'
+
+    def get_rate(self):
+        """
+        Returns sample rate estimated using all times received.
+
+        :return float: None if unknown
+        """
+        if self.__count < 2 or self.__last_time <= self.__first_time:
+            return None
+        return (self.__count - 1) / (self.__last_time - self.__first_time)
+
+    def get_frequencies(self):
+        """
+        Returns frequencies of spectra in Hz (estimated sample rate).
+
+        :return numpy.ndarray: None if sample rate is unknown
+        """
+        rate = self.get_rate()
+        if rate is None:
+            return None
+        return np.fft.rfftfreq(self.nfft, 1 / rate)
+
+    def append(self, temps, values):
+        """
+        Add samples and compute new frames.
+
+        :param temps: array like of times
+        :param values: array like of values
+        :return: times (center of frames) and spectra (one line for each frame) of new frames
+        """
+        temps = np.asarray(temps, dtype=np.float64)
+        if temps.shape[0]:
+            if self.__first_time is None:
+                self.__first_time = temps[0]
+            self.__last_time = temps[-1]
+            self.__count = self.__count + temps.shape[0]
+        temps, values = [np.concatenate((old, np.asarray(new,
+                                                         dtype=np.float64)))
+                         for old, new in zip(self.__pending,
+                                             (temps, values))]
+        nb = (values.shape[0] - self.nfft) // self.hop + 1
+        if nb <= 0:
+            self.__pending = [temps, values]
+            return np.empty(0), self.__spectra[:0].copy()
+        frames = np.lib.stride_tricks.sliding_window_view(
+            values, self.nfft)[::self.hop][:nb]
+        spectra = np.fft.rfft(frames * self.__window, axis=1)
+        if self.mode == 'magnitude':
+            spectra = np.abs(spectra)
+        elif self.mode == 'power':
+            spectra = spectra.real ** 2 + spectra.imag ** 2
+        frame_times = temps[self.nfft // 2 + self.hop * np.arange(nb)]
+        self.__pending = [temps[nb * self.hop:], values[nb * self.hop:]]
+        self.__store(frame_times, spectra)
+        return frame_times, spectra
+
+    def __store(self, frame_times, spectra):
+        history = self.__times.shape[0]
+        nb = frame_times.shape[0]
+        if nb > history:
+            frame_times, spectra = frame_times[-history:], spectra[-history:]
+        positions = (self.total + np.arange(nb - frame_times.shape[0], nb)) %\
+            history
+        self.__times[positions] = frame_times
+        self.__spectra[positions] = spectra
+        self.total = self.total + nb
+
+    def get(self, nb=None):
+        """
+        Returns last spectra in time order.
+
+        :param int nb: number of spectra (default: None all spectra kept)
+        :return: copies of times and spectra (one line for each frame)
+        """
+        history = self.__times.shape[0]
+        nb_kept = min(self.total, history)
+        if nb is None or nb > nb_kept:
+            nb = nb_kept
+        positions = (self.total - nb + np.arange(nb)) % history
+        return self.__times[positions], self.__spectra[positions]
@@ -0,0 +1,215 @@
+"""
+Transport classes
+used by Logger to send HTTP requests to phyphox phone application
+"""
+import http.client
+import urllib.request
+import urllib.parse
+import urllib.error
+import queue
+import logging
+
+
+class UrllibTransport():
+    """
+    Transport opening a new connection for each request
+    (urllib.request.urlopen). Proxy settings from environment are used.
+
+    :param str base_url: URL to access phyphox phone application
+    :param float timeout: socket timeout in seconds (default: None no timeout)
+    """
+    def __init__(self, base_url, timeout=None):
+        #: url to access phone phyphox application
+        self.base_url = base_url
+        #: socket timeout in seconds
+        self.timeout = timeout
+
+    def request(self, path, timeout=None):
+        """
+        Send a GET request and read the whole answer.
+
+        :param str path: path and query string (e.g. "/meta")
+        :param float timeout: socket timeout for this request (default: None transport timeout)
+        :return bytes: response body
+        """
+        url = self.base_url + path
+        if timeout is None:
+            timeout = self.timeout
+        if timeout is None:
+            with urllib.request.urlopen(url) as reponse:
+                return reponse.read()
+        with urllib.request.urlopen(url, timeout=timeout) as reponse:
+            return reponse.read()
+
+    def stream(self, path, block_size=65536):
+        """
+        Send a GET request and read answer block by block.
+
+        :param str path: path and query string (e.g. "/get?acc=full")
+        :param int block_size: maximum size of a block in bytes (default: 65536)
+        :return: generator of bytes blocks
+        """
+        url = self.base_url + path
+        if self.timeout is None:
+            reponse = urllib.request.urlopen(url)
+        else:
+            reponse = urllib.request.urlopen(url, timeout=self.timeout)
+        with reponse:
+            while True:
+                block = reponse.read(block_size)
+                if not block:
+                    return
+                yield block
+
+    def close(self):
+        """
+        Nothing to release: each request uses its own connection.
+        """
+
+
+class KeepAliveTransport():
+    """
+    Transport reusing persistent HTTP/1.1 connections.
+    A small pool of connections is shared by all requests,
+    a connection closed by the phone is opened again on next request.
+
+    :param str base_url: URL to access phyphox phone application
+    :param float timeout: socket timeout in seconds (default: None no timeout)
+    :param int pool_size: maximum number of connections opened at the same time (default: 1)
+    :param int retries: number of reconnections for one request when connection is lost (default: 1)
+    """
+    def __init__(self, base_url, timeout=None, pool_size=1, retries=1):
+        if pool_size < 1:
+            raise ValueError("pool_size must be greater than 0")
+        #: url to access phone phyphox application
+        self.base_url = base_url
+        #: socket timeout in seconds
+        self.timeout = timeout
+        #: number of reconnections for one request
+        self.retries = retries
+        url = urllib.parse.urlsplit(base_url)
+        self.__host = url.hostname
+        self.__port = url.port
+        if url.scheme == 'https':
+            self.__connection_class = http.client.HTTPSConnection
+        else:
+            self.__connection_class = http.client.HTTPConnection
+        # None slot means connection not opened yet
+        self.__pool = queue.LifoQueue()
+        for _ in range(pool_size):
+            self.__pool.put(None)
+        self.__opened = []
+        #: number of TCP connections opened since creation
+        self.nb_connection = 0
+
+    def __new_connection(self):
+        self.nb_connection = self.nb_connection + 1
+        logging.debug("New connection %d to %s", self.nb_connection,
+                      self.base_url)
+        connection = self.__connection_class(self.__host, self.__port,
+                                             timeout=self.timeout)
+        self.__opened.append(connection)
+        return connection
+
+    def __discard(self, connection):
+        connection.close()
+        if connection in self.__opened:
+            self.__opened.remove(connection)
+
+    def __release(self, connection, keep):
+        if not keep:
+            self.__discard(connection)
+            connection = None
+        self.__pool.put(connection)
+
+    def request(self, path, timeout=None):
+        """
+        Send a GET request and read the whole answer.
+
+        :param str path: path and query string (e.g. "/meta")
+        :param float timeout: socket timeout and maximum wait of a free connection for this request (default: None transport timeout)
+        :return bytes: response body
+        :raise urllib.error.HTTPError: if phone answer status is not 200
+        :raise TimeoutError: if no connection is free before timeout
+        """
+        if timeout is None:
+            timeout = self.timeout
+        try:
+            connection = self.__pool.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError("No free connection to " + self.base_url)
+        nb_try = 0
+        while True:
+            reused = connection is not None
+            if connection is None:
+                connection = self.__new_connection()
+            # timeout can be different for each request
+            connection.timeout = timeout
+            if connection.sock is not None:
+                connection.sock.settimeout(timeout)
+            try:
+                connection.request("GET", path)
+                reponse = connection.getresponse()
+                body = reponse.read()
+            except (http.client.RemoteDisconnected,
+                    http.client.CannotSendRequest,
+                    http.client.BadStatusLine,
+                    ConnectionResetError,
+                    ConnectionAbortedError,
+                    BrokenPipeError):
+                self.__discard(connection)
+                connection = None
+                # a stale keep-alive connection is not counted as a try
+                if not reused:
+                    nb_try = nb_try + 1
+                if nb_try > self.retries:
+                    self.__pool.put(None)
+                    raise
+                continue
+            except BaseException:
+                self.__release(connection, False)
+                raise
+            self.__release(connection, not reponse.will_close)
+            if reponse.status != 200:
+                raise urllib.error.HTTPError(self.base_url + path,
+                                             reponse.status,
+                                             reponse.reason,
+                                             reponse.headers, None)
+            return body
+
+    def stream(self, path, block_size=65536):
+        """
+        Send a GET request and read answer block by block.
+        A dedicated connection is used and closed at the end:
+        many streams can be read at the same time.
+
+        :param str path: path and query string (e.g. "/get?acc=full")
+        :param int block_size: maximum size of a block in bytes (default: 65536)
+        :return: generator of bytes blocks
+        :raise urllib.error.HTTPError: if phone answer status is not 200
+        """
+        connection = self.__connection_class(self.__host, self.__port,
+                                             timeout=self.timeout)
+        try:
+            connection.request("GET", path)
+            reponse = connection.getresponse()
+            if reponse.status != 200:
+                reponse.read()
+                raise urllib.error.HTTPError(self.base_url + path,
+                                             reponse.status,
+                                             reponse.reason,
+                                             reponse.headers, None)
+            while True:
+                block = reponse.read(block_size)
+                if not block:
+                    return
+                yield block
+        finally:
+            connection.close()
+
+    def close(self):
+        """
+        Close all opened connections.
+        """
+        for connection in self.__opened:
+            connection.close()
@@ -0,0 +1,102 @@
+import unittest
+import unittest.mock
+import os
+import json
+import time
+import phyphox
+
+
+FOLDER_NAME = os.path.dirname(__file__)
+
+
+def _wait(condition, timeout=10.0):
+    """
+    Wait until condition is true: tests do not depend on machine load.
+    """
+    fin = time.monotonic() + timeout
+    while not condition() and time.monotonic() < fin:
+        time.sleep(0.01)
+
+
+class TestAcquisition(unittest.TestCase):
+    def setUp(self):
+        patcher = unittest.mock.patch('urllib.request.urlopen')
+        mock_urlopen = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.nb_get = 0
+        self.debut = time.perf_counter()
+
+        def answer(url, *args, **kwargs):
+            cm = unittest.mock.MagicMock()
+            cm.__enter__.return_value = cm
+            if "/config" in url:
+                with open(FOLDER_NAME + "/config_1.bin") as fd:
+                    cm.read.return_value = fd.read()
+            else:
+                # phone sampling at 100 Hz
+                self.nb_get = self.nb_get + 1
+                fin = int((time.perf_counter() - self.debut) * 100)
+                values = [i * 0.01 for i in range(self.nb_measure, fin)]
+                self.nb_measure = fin
+                cm.read.return_value = json.dumps(
+                    {"buffer": {"mag_time": {"buffer": values},
+                                "magX": {"buffer": values}}})
+            return cm
+        self.nb_measure = 0
+        mock_urlopen.side_effect = answer
+
+    def test_queue(self):
+        phone = phyphox.Logger("0.0.0.0", 8080)
+        phone.buffer_needed([(0, (0, 1))])
+        chunks = []
+        phone.add_callback(chunks.append)
+        acquisition = phone.start_acquisition(min_interval=0.01,
+                                              target_samples=5)
+        _wait(lambda: self.nb_get >= 10 and len(chunks) >= 2)
+        phone.stop_acquisition()
+        self.assertFalse(acquisition.is_alive())
+        # Logger data are still available to other consumers
+        self.assertTrue(phone.new_data)
+        self.assertEqual(phone.get_last_buffer_read()[0][1],
+                         chunks[-1]["magX"])
+        self.assertEqual(len(phone.get_all_buffer_read()), 1)
+        # stack_data False: previous chunk was not read by Logger user
+        self.assertTrue(phone.overflow)
+        # rate and interval measured with wall clock: only bounds
+        self.assertGreater(acquisition.rate, 0)
+        self.assertGreaterEqual(acquisition.interval,
+                                acquisition.min_interval)
+        self.assertLessEqual(acquisition.interval, acquisition.max_interval)
+        self.assertEqual(acquisition.nb_request, self.nb_get)
+        nb = 0
+        while not acquisition.queue.empty():
+            chunk = acquisition.queue.get()
+            self.assertEqual(list(chunk), ["mag_time", "magX"])
+            nb = nb + len(chunk["magX"])
+        self.assertEqual(nb, self.nb_measure)
+        self.assertEqual(sum(len(c["magX"]) for c in chunks), nb)
+
+    def test_interval(self):
+        phone = phyphox.Logger("0.0.0.0", 8080)
+        # sample rate given by sensor
+        phone.get_sample_rate = lambda name=None: 100.0
+        acquisition = phyphox.Acquisition(phone, min_interval=0.01,
+                                          target_samples=5)
+        self.assertAlmostEqual(acquisition.interval, 0.05)
+        acquisition = phyphox.Acquisition(phone, min_interval=0.01,
+                                          target_samples=500)
+        self.assertEqual(acquisition.interval, acquisition.max_interval)
+
+    def test_drop(self):
+        phone = phyphox.Logger("0.0.0.0", 8080)
+        phone.buffer_needed([(0, (0, 1))])
+        acquisition = phone.start_acquisition(min_interval=0.01,
+                                              queue_size=2, policy='drop')
+        _wait(lambda: acquisition.nb_dropped > 0)
+        phone.stop_acquisition()
+        self.assertEqual(acquisition.queue.qsize(), 2)
+        self.assertGreater(acquisition.nb_dropped, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
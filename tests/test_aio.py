@@ -0,0 +1,174 @@
+import unittest
+import asyncio
+import threading
+import os
+import io
+import contextlib
+import tempfile
+import json
+import urllib.parse
+import http.server
+import numpy as np
+import phyphox
+
+
+FOLDER_NAME = os.path.dirname(__file__)
+EXPORT = bytes(range(256)) * 400
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    nb_get = 0
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        if url.path == "/config":
+            with open(FOLDER_NAME + "/config_1.bin", "rb") as fd:
+                body = fd.read()
+        elif url.path == "/control":
+            body = b'{"result":true}'
+        elif url.path == "/export" or url.path == "/time":
+            body = EXPORT
+            if url.path == "/time":
+                body = json.dumps([{"event": "START",
+                                    "experimentTime": 0.0,
+                                    "systemTime": float(idx)}
+                                   for idx in range(2000)]).encode()
+            if url.query == "format=1" or url.path == "/time":
+                # chunked answer
+                self.send_response(200)
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for idx in range(0, len(body), 30000):
+                    block = body[idx:idx + 30000]
+                    self.wfile.write(format(len(block), "x").encode() +
+                                     b"\r\n" + block + b"\r\n")
+                self.wfile.write(b"0\r\n\r\n")
+                return
+        elif url.path == "/get":
+            # 10 new values at each request
+            type(self).nb_get = type(self).nb_get + 1
+            debut = (self.nb_get - 1) * 10
+            buffers = {}
+            for name in urllib.parse.parse_qs(url.query,
+                                              keep_blank_values=True):
+                buffers[name] = {"size": 0, "updateMode": "partial",
+                                 "buffer": [(debut + i) * 0.01
+                                            for i in range(10)]}
+            body = json.dumps({"buffer": buffers}).encode()
+        else:
+            body = b'{}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestAsyncLogger(unittest.TestCase):
+    def setUp(self):
+        _Handler.nb_get = 0
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0),
+                                                      _Handler)
+        threading.Thread(target=self.server.serve_forever,
+                         daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_read_buffers(self):
+        async def acquisition():
+            async with phyphox.AsyncLogger("127.0.0.1",
+                                           self.server.server_port,
+                                           timeout=5) as phone:
+                self.assertTrue(await phone.buffer_needed([(0, (0, 1))]))
+                self.assertEqual(phone.get_experiment().get('crc32'),
+                                 'e04c0bfa')
+                self.assertEqual(await phone.start(), {"result": True})
+                self.assertTrue(await phone.read_buffers(
+                    mode_data=phyphox.BufferMode.FULL))
+                self.assertTrue(await phone.read_buffers())
+                self.assertEqual(phone.get_nb_measure(), 20)
+                self.assertEqual(phone.transport.nb_connection, 1)
+                return phone.get_all_buffer_read()
+        tabs = asyncio.run(acquisition())
+        self.assertEqual(len(tabs), 2)
+        self.assertEqual(tabs[1][0][1][0], 0.1)
+
+    def test_chunks(self):
+        async def acquisition():
+            phone = phyphox.AsyncLogger("127.0.0.1", self.server.server_port)
+            await phone.buffer_needed()
+            chunks = []
+            async for chunk in phone.chunks(interval=0):
+                chunks.append(chunk)
+                if len(chunks) == 3:
+                    break
+            # data are still available to other users
+            self.assertTrue(phone.new_data)
+            self.assertTrue(phone.overflow)
+            self.assertIs(phone.get_last_buffer_read(), chunks[-1])
+            await phone.close()
+            return chunks
+        chunks = asyncio.run(acquisition())
+        self.assertEqual([len(c[0]) for c in chunks], [5, 5, 5])
+        self.assertEqual(chunks[2][0][0][0], 0.2)
+
+    def test_chunked(self):
+        async def get_time():
+            async with phyphox.AsyncLogger("127.0.0.1",
+                                           self.server.server_port,
+                                           timeout=5) as phone:
+                return await phone.get_time()
+        events = asyncio.run(get_time())
+        self.assertEqual(len(events), 2000)
+        self.assertEqual(events[-1]["systemTime"], 1999.0)
+
+    def test_export(self):
+        async def export(filetype):
+            async with phyphox.AsyncLogger("127.0.0.1",
+                                           self.server.server_port,
+                                           timeout=5) as phone:
+                sizes = []
+                nb_bytes = await phone.export_file(
+                    filetype, os.path.join(folder, "data.zip"),
+                    block_size=4096, progress=sizes.append)
+                return nb_bytes, sizes
+        with tempfile.TemporaryDirectory() as folder:
+            for filetype in (0, 1):
+                nb_bytes, sizes = asyncio.run(export(filetype))
+                self.assertEqual(nb_bytes, len(EXPORT))
+                self.assertEqual(sizes[-1], len(EXPORT))
+                # written block by block
+                self.assertLessEqual(max(np.diff([0] + sizes)), 4096)
+                with open(os.path.join(folder, "data.zip"), "rb") as fd:
+                    self.assertEqual(fd.read(), EXPORT)
+
+    def test_core(self):
+        async def acquisition():
+            async with phyphox.AsyncLogger("127.0.0.1",
+                                           self.server.server_port,
+                                           timeout=5) as phone:
+                with contextlib.redirect_stdout(io.StringIO()) as output:
+                    await phone.print_buffer_name()
+                # Logger methods without coroutine do not exist
+                self.assertFalse(hasattr(phone, "start_acquisition"))
+                self.assertFalse(hasattr(phone, "read_buffers_chunked"))
+                self.assertFalse(isinstance(phone, phyphox.Logger))
+                with self.assertRaises(TypeError):
+                    with phone:
+                        pass
+                self.assertEqual(phone.get_buffer_position("magX"), None)
+                self.assertEqual(phone.get_experiment().get("crc32"),
+                                 "e04c0bfa")
+                return output.getvalue()
+        self.assertIn("Source", asyncio.run(acquisition()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+import numpy as np
+import phyphox
+
+
+class TestAligner(unittest.TestCase):
+    def test_incremental(self):
+        acc_time = np.arange(0.013, 10, 0.01)
+        mag_time = np.arange(0.05, 10, 0.037)
+        aligner = phyphox.Aligner(20, [["acc_time", "accX"],
+                                       ["mag_time", "magX"]])
+        chunks = []
+        for debut in range(0, 1000, 70):
+            fin = debut + 70
+            # magnetometer samples received until next acceleration sample
+            select = (mag_time >= debut * 0.01) & (mag_time < fin * 0.01)
+            chunk = {"acc_time": acc_time[debut:fin],
+                     "accX": np.sin(acc_time[debut:fin]),
+                     "mag_time": mag_time[select],
+                     "magX": np.cos(mag_time[select])}
+            chunks.append(aligner.feed(chunk))
+        temps = np.concatenate([chunk["time"] for chunk in chunks])
+        np.testing.assert_allclose(temps, np.arange(1, len(temps) + 1) / 20)
+        self.assertGreater(temps[-1], 9.8)
+        np.testing.assert_allclose(
+            np.concatenate([chunk["accX"] for chunk in chunks]),
+            np.interp(temps, acc_time, np.sin(acc_time)))
+        np.testing.assert_allclose(
+            np.concatenate([chunk["magX"] for chunk in chunks]),
+            np.interp(temps, mag_time, np.cos(mag_time)))
+
+    def test_phones(self):
+        aligner = phyphox.Aligner(10, [["a:t", "a:x"], ["b:t", "b:x"]],
+                                  method='previous')
+        self.assertEqual(aligner.get_names(), ["time", "a:x", "b:x"])
+        chunk = aligner.feed({"t": [0.0, 0.1, 0.2], "x": [1, 2, 3]}, "a:")
+        self.assertEqual(len(chunk["time"]), 0)
+        # clock of phone b is 0.05 s late
+        chunk = aligner.feed({"t": [0.0, 0.1, 0.2], "x": [4, 5, 6]}, "b:",
+                             offset=0.05)
+        np.testing.assert_allclose(chunk["time"], [0.1, 0.2])
+        np.testing.assert_array_equal(chunk["a:x"], [2, 3])
+        np.testing.assert_array_equal(chunk["b:x"], [4, 5])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import os
+import json
+import unittest
+import tempfile
+import phyphox
+
+CONFIG = {"crc32": "1a2b3c4d", "title": "Acceleration",
+          "export": [{"set": "Acc", "sources": [
+              {"label": "t", "buffer": "acc_time"},
+              {"label": "x", "buffer": "accX"}]}]}
+META = {"version": "1.1.16", "deviceModel": "Pixel"}
+
+
+class _Transport():
+    def __init__(self):
+        self.answers = {"/config": CONFIG, "/meta": META}
+        self.paths = []
+
+    def request(self, path):
+        self.paths.append(path)
+        return json.dumps(self.answers[path]).encode()
+
+    def close(self):
+        pass
+
+
+class TestConfigCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def new_logger(self, transport, **kwargs):
+        cache = phyphox.ConfigCache(self.directory.name, **kwargs)
+        return phyphox.Logger("127.0.0.1", transport=transport, cache=cache)
+
+    def test_hit(self):
+        transport = _Transport()
+        phone = self.new_logger(transport)
+        phone.get_meta()
+        phone.get_config()
+        self.assertEqual(phone.cache.stats()['misses'], 2)
+        self.assertEqual(len(transport.paths), 2)
+        # new process: nothing is sent to phone
+        other = self.new_logger(transport)
+        other.get_meta()
+        other.get_config()
+        self.assertEqual(len(transport.paths), 2)
+        self.assertEqual(other.cache.stats()['hits'], 2)
+        self.assertEqual(other.get_meta_key("deviceModel"), "Pixel")
+        self.assertEqual(other.get_experiment().buffer_names,
+                         [["acc_time", "accX"]])
+
+    def test_crc32(self):
+        transport = _Transport()
+        phone = self.new_logger(transport, max_age=0)
+        phone.get_config()
+        experiment = phone.get_experiment()
+        # answer too old: phone is asked, same crc32 experiment is kept
+        phone.get_config(force_update=True)
+        self.assertIs(phone.get_experiment(), experiment)
+        other = self.new_logger(transport, max_age=0)
+        other.get_config()
+        # meta and config answers are too old
+        self.assertEqual(other.cache.stats()['expired'], 2)
+        self.assertEqual(other.cache.stats()['unchanged'], 1)
+        transport.answers["/config"] = dict(CONFIG, crc32="00000000",
+                                            title="Gyroscope")
+        other.get_config(force_update=True)
+        self.assertEqual(other.cache.stats()['invalidations'], 1)
+        self.assertEqual(other.get_experiment().get("title"), "Gyroscope")
+
+    def test_eviction(self):
+        cache = phyphox.ConfigCache(self.directory.name, max_entries=2)
+        for idx in range(2):
+            cache.put("http://10.0.0." + str(idx) + ":8080", "meta", META)
+            os.utime(os.path.join(self.directory.name,
+                                  "phyphox_cache_http___10_0_0_" +
+                                  str(idx) + "_8080.json"), (idx, idx))
+        # files of user are kept
+        user_file = os.path.join(self.directory.name, "settings.json")
+        with open(user_file, "w", encoding="utf-8") as fd:
+            fd.write("{}")
+        os.utime(user_file, (0, 0))
+        cache.get("http://10.0.0.0:8080", "meta")
+        # least recently used device is removed
+        cache.put("http://10.0.0.2:8080", "meta", META)
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.assertIsNotNone(cache.get("http://10.0.0.0:8080", "meta"))
+        self.assertIsNone(cache.get("http://10.0.0.1:8080", "meta"))
+        self.assertTrue(os.path.exists(user_file))
+
+    def test_device(self):
+        transport = _Transport()
+        phone = self.new_logger(transport)
+        phone.get_config()
+        self.assertEqual(transport.paths, ["/meta", "/config"])
+        # another phone with same address
+        transport.answers["/meta"] = dict(META, deviceModel="Galaxy")
+        other = self.new_logger(transport)
+        other.get_meta(force_update=True)
+        other.get_config()
+        self.assertEqual(transport.paths[2:], ["/meta", "/config"])
+        self.assertEqual(other.cache.stats()['invalidations'], 1)
+        # config stored with another device identity is not used
+        cache = other.cache
+        self.assertIsNone(cache.get(other.base_url, "config", META))
+        self.assertIsNotNone(cache.get(other.base_url, "config",
+                                       transport.answers["/meta"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+import threading
+import os
+import urllib.parse
+import http.server
+import numpy as np
+import phyphox
+
+
+FOLDER_NAME = os.path.dirname(__file__)
+NB_SAMPLE = 10000
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    nb_broken = 0
+    paths = []
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        type(self).paths.append(self.path)
+        broken = False
+        if url.path == "/config":
+            with open(FOLDER_NAME + "/config_1.bin", "rb") as fd:
+                body = fd.read()
+        else:
+            # one buffer in each request, magX is ten times time
+            name, value = url.query.split("=")
+            temps = np.arange(NB_SAMPLE) * 0.01
+            if value != "full":
+                temps = temps[temps > float(value.split("%7C")[0]) + 1e-9]
+            if name == "magX":
+                temps = temps * 10
+                if type(self).nb_broken > 0:
+                    type(self).nb_broken = type(self).nb_broken - 1
+                    broken = True
+            body = b'{"buffer":{"' + name.encode() + b'":{"size":0,' +\
+                b'"updateMode":"full","buffer":[' +\
+                b','.join(b'%.2f' % v for v in temps) + b']}},"status":{}}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if broken:
+            self.wfile.write(body[:len(body) // 2])
+            self.close_connection = True
+        else:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestChunked(unittest.TestCase):
+    def setUp(self):
+        _Handler.nb_broken = 0
+        _Handler.paths = []
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0),
+                                                      _Handler)
+        threading.Thread(target=self.server.serve_forever,
+                         daemon=True).start()
+        self.phone = phyphox.Logger("127.0.0.1", self.server.server_port,
+                                    keep_alive=True, timeout=5)
+        self.phone.buffer_needed([(0, (0, 1))])
+
+    def tearDown(self):
+        self.phone.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_chunks(self):
+        chunks = []
+        self.phone.add_callback(chunks.append)
+        self.assertTrue(self.phone.read_buffers_chunked(chunk_size=3000,
+                                                        block_size=4096))
+        self.assertEqual([len(c["magX"]) for c in chunks],
+                         [3000, 3000, 3000, 1000])
+        tabs = self.phone.get_last_buffer_read()[0]
+        np.testing.assert_allclose(tabs[1], tabs[0] * 10)
+        self.assertEqual(self.phone.get_nb_measure(), NB_SAMPLE)
+        self.assertTrue(self.phone.build_link(
+            [float(tabs[0][-1])]).startswith("/get?mag_time=99.99&"))
+
+    def test_restart(self):
+        _Handler.nb_broken = 1
+        self.phone.set_ring_buffer(capacity=NB_SAMPLE)
+        self.assertTrue(self.phone.read_buffers_chunked(chunk_size=1000,
+                                                        block_size=4096))
+        np.testing.assert_allclose(self.phone.get_buffer_view("mag_time"),
+                                   np.arange(NB_SAMPLE) * 0.01)
+        np.testing.assert_allclose(self.phone.get_buffer_view("magX"),
+                                   np.arange(NB_SAMPLE) * 0.1)
+        self.assertEqual(len(self.phone.get_last_buffer_read()[0][0]), 1000)
+        self.assertIn("magX=", _Handler.paths[-1])
+        self.assertIn("%7Cmag_time", _Handler.paths[-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
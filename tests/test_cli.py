@@ -0,0 +1,43 @@
+import io
+import os
+import tempfile
+import contextlib
+import unittest
+import numpy as np
+import phyphox
+from phyphox import cli
+
+
+class TestCli(unittest.TestCase):
+    def test_record(self):
+        with phyphox.Simulator(nb_set=2, rate=[1000, 200]) as simulator,\
+                tempfile.TemporaryDirectory() as directory:
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                status = cli.main(["127.0.0.1:" + str(simulator.port),
+                                   "-b", "accX", "-b", "gyr*",
+                                   "-o", directory, "-d", "0.3",
+                                   "--stats-interval", "0.1"])
+            self.assertEqual(status, 0)
+            self.assertIn("samples", output.getvalue())
+            # phone is stopped by phyphox-record: all samples are recorded
+            tabs = phyphox.open_recording(
+                os.path.join(directory, "127.0.0.1_" + str(simulator.port)))
+            self.assertEqual(sorted(tabs), ["accX", "acc_time", "gyrX",
+                                            "gyrY", "gyrZ", "gyr_time"])
+            for name in ("accX", "gyr_time", "gyrZ"):
+                np.testing.assert_array_equal(tabs[name],
+                                              simulator.values(name))
+
+    def test_selection(self):
+        with phyphox.Simulator() as simulator,\
+                tempfile.TemporaryDirectory() as directory,\
+                contextlib.redirect_stderr(io.StringIO()),\
+                self.assertWarns(UserWarning):
+            self.assertEqual(cli.main(["127.0.0.1:" + str(simulator.port),
+                                       "-b", "mag*", "-o", directory,
+                                       "-d", "0.1"]), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import time
+import unittest
+import numpy as np
+import phyphox
+
+
+class TestClockSync(unittest.TestCase):
+    def test_fit(self):
+        clock = phyphox.ClockSync(None, "acc_time", window=40)
+        rng = np.random.default_rng(1)
+        for phone in np.linspace(1000, 1100, 40):
+            host = phone - 12.5 + 1e-4 * (phone - 1000)
+            rtt = 0.01 if rng.random() < 0.6 else 0.5
+            # slow answers are not symmetric
+            clock.add_probe(phone, host - 0.005, host - 0.005 + rtt)
+        self.assertAlmostEqual(clock.drift, 1e-4, places=6)
+        self.assertAlmostEqual(clock.rtt, 0.01)
+        np.testing.assert_allclose(clock.to_host([1000, 1100]),
+                                   [987.5, 1087.51], atol=1e-6)
+
+    def test_events(self):
+        clock = phyphox.ClockSync(None, "acc_time")
+        with self.assertRaises(RuntimeError):
+            clock.to_host([0.0])
+        clock.set_events([
+            {'event': 'START', 'experimentTime': 0.0, 'systemTime': 100.0},
+            {'event': 'PAUSE', 'experimentTime': 2.0, 'systemTime': 102.0},
+            {'event': 'START', 'experimentTime': 2.0, 'systemTime': 110.0}])
+        np.testing.assert_allclose(clock.to_phone([0.0, 1.5, 2.5]),
+                                   [100.0, 101.5, 110.5])
+
+    def test_simulator(self):
+        with phyphox.Simulator(rate=1000) as simulator:
+            phone = phyphox.Logger("127.0.0.1", simulator.port,
+                                   keep_alive=True)
+            clock = phyphox.ClockSync(phone, "acc_time")
+            time.sleep(0.02)
+            # simulator and host use the same clock
+            self.assertLess(abs(clock.refresh()), 0.01)
+            clock.start(interval=0.01)
+            time.sleep(0.05)
+            clock.stop()
+            temps = simulator.values("acc_time")
+            self.assertLess(abs(clock.to_host(temps[-1:])[0] - time.time()),
+                            0.01)
+            phone.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
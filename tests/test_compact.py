@@ -0,0 +1,93 @@
+import time
+import unittest
+import numpy as np
+import phyphox
+
+
+class TestCompactBuffer(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.temps = np.arange(20000) / 100 + rng.normal(0, 1e-5, 20000)
+        self.values = np.sin(self.temps) + rng.normal(0, 0.01, 20000)
+
+    def fill(self, encoding, values):
+        buffer = phyphox.CompactBuffer(encoding, block_size=1024)
+        for chunk in np.array_split(values, 37):
+            buffer.append(chunk)
+        return buffer
+
+    def test_encodings(self):
+        for encoding, values, atol, ratio in [
+                ('delta', self.temps, 5e-7, 6),
+                ('delta+zlib', self.temps, 5e-7, 6),
+                (phyphox.DeltaEncoding(None), self.temps, 0, 0.9),
+                ('float32', self.values, 1e-7, 1.9),
+                ('float32+zlib', self.values, 1e-7, 2.2),
+                ('zlib', self.values, 0, 1.1)]:
+            buffer = self.fill(encoding, values)
+            self.assertEqual(len(buffer), values.shape[0])
+            self.assertGreater(values.nbytes / buffer.nbytes, ratio)
+            np.testing.assert_allclose(buffer.get(), values, rtol=0,
+                                       atol=atol)
+            np.testing.assert_allclose(buffer.get(1000, 3000),
+                                       values[1000:3000], rtol=0, atol=atol)
+            np.testing.assert_allclose(buffer.since(19990), values[19990:],
+                                       rtol=0, atol=atol)
+            # blocks and samples not yet encoded have the same type
+            dtype = np.float32 if 'float32' in str(encoding) else np.float64
+            for tab in (buffer.get(), buffer.get(1000, 3000),
+                        buffer.since(19990), buffer.get(5, 5)):
+                self.assertEqual(tab.dtype, dtype)
+        with self.assertRaises(ValueError):
+            phyphox.CompactBuffer('zlib+float32')
+
+    def test_non_finite(self):
+        temps = self.temps.copy()
+        temps[1500] = np.nan
+        temps[2500] = np.inf
+        for encoding in ('delta', 'delta+zlib'):
+            buffer = self.fill(encoding, temps)
+            # blocks with non finite times are exact, others rounded
+            np.testing.assert_array_equal(buffer.get(1024, 3072),
+                                          temps[1024:3072])
+            np.testing.assert_allclose(buffer.get(0, 1024), temps[:1024],
+                                       rtol=0, atol=5e-7)
+            np.testing.assert_allclose(buffer.get(), temps, rtol=0,
+                                       atol=5e-7)
+
+    def test_clear(self):
+        buffer = self.fill('delta', self.temps[:3000])
+        buffer.clear()
+        self.assertEqual(len(buffer), 0)
+        buffer.append(self.temps[3000:5000])
+        self.assertEqual(buffer.total, 5000)
+        np.testing.assert_allclose(buffer.since(2000), self.temps[3000:5000],
+                                   atol=5e-7)
+        np.testing.assert_allclose(buffer.last(3), self.temps[4997:5000],
+                                   atol=5e-7)
+
+    def test_logger(self):
+        with phyphox.Simulator(rate=1000) as simulator:
+            phone = phyphox.Logger("127.0.0.1", simulator.port,
+                                   keep_alive=True, dtype=np.float64)
+            phone.get_config()
+            phone.buffer_needed()
+            phone.set_storage(block_size=16)
+            for _ in range(4):
+                time.sleep(0.01)
+                phone.read_buffers()
+            simulator.answer("/control", [("cmd", "stop")])
+            phone.read_buffers()
+            self.assertIsInstance(phone.get_ring_buffer("accX"),
+                                  phyphox.CompactBuffer)
+            np.testing.assert_allclose(phone.get_buffer_since("acc_time"),
+                                       simulator.values("acc_time"),
+                                       atol=5e-7)
+            np.testing.assert_allclose(phone.get_buffer_view("accX", 20),
+                                       simulator.values("accX")[-20:],
+                                       rtol=1e-6)
+            phone.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
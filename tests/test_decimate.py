@@ -0,0 +1,75 @@
+import time
+import unittest
+import numpy as np
+import phyphox
+
+
+class TestDecimator(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.temps = np.arange(10000) * 0.002
+        self.values = rng.normal(0, 1, 10000)
+
+    def test_incremental(self):
+        decimator = phyphox.Decimator(base=10, factor=5, nb_level=3)
+        whole = phyphox.Decimator(base=10, factor=5, nb_level=3)
+        whole.append(self.temps, self.values)
+        debut = 0
+        for size in [1, 7, 300, 33, 2000, 5000, 2659]:
+            decimator.append(self.temps[debut:debut + size],
+                             self.values[debut:debut + size])
+            debut = debut + size
+        self.assertEqual(decimator.total, 10000)
+        for level, bucket in enumerate([10, 50, 250]):
+            tmin, vmin, tmax, vmax = decimator.get_level(level)
+            tab = self.values.reshape(-1, bucket)
+            np.testing.assert_array_equal(vmin, tab.min(axis=1))
+            np.testing.assert_array_equal(vmax, tab.max(axis=1))
+            np.testing.assert_array_equal(
+                tmax, self.temps.reshape(-1, bucket)[np.arange(len(tab)),
+                                                     tab.argmax(axis=1)])
+            # last complete bucket waits for next bucket mean
+            for tab_inc, tab_whole in zip(decimator.get_level(level, 'lttb'),
+                                          whole.get_level(level, 'lttb')):
+                np.testing.assert_array_equal(tab_inc, tab_whole)
+        self.assertEqual(len(decimator.get_level(0, 'lttb')[0]), 999)
+
+    def test_get(self):
+        decimator = phyphox.Decimator(base=10, factor=4, nb_level=4)
+        decimator.append(self.temps, self.values)
+        temps, values = decimator.get(max_points=200)
+        self.assertLessEqual(len(temps), 200)
+        self.assertTrue(np.all(np.diff(temps) >= 0))
+        self.assertEqual(values.max(), self.values.max())
+        # zoom: finest level
+        temps, values = decimator.get(1.0, 2.0, max_points=200)
+        self.assertEqual(len(temps), 100)
+        self.assertTrue(temps[0] >= 1.0 and temps[-1] <= 2.0)
+        temps, values = decimator.get(max_points=100, method='lttb')
+        self.assertLessEqual(len(temps), 100)
+        # coarsest level too large
+        temps, values = decimator.get(max_points=10)
+        self.assertLessEqual(len(temps), 10)
+        self.assertEqual(values.min(), self.values.min())
+        temps, values = decimator.get(max_points=10, method='lttb')
+        self.assertLessEqual(len(temps), 10)
+
+    def test_logger(self):
+        with phyphox.Simulator(rate=2000) as simulator:
+            with phyphox.Logger("127.0.0.1", simulator.port,
+                                keep_alive=True) as phone:
+                phone.get_config()
+                phone.buffer_needed()
+                phone.set_decimation(base=4, nb_level=2)
+                for _ in range(3):
+                    time.sleep(0.02)
+                    phone.read_buffers()
+                self.assertIsNone(phone.get_decimator("acc_time"))
+                temps, values = phone.get_decimated("accX", max_points=10)
+                self.assertLessEqual(len(temps), 10)
+                self.assertEqual(phone.get_decimator("accY").total,
+                                 phone.get_nb_measure())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import unittest.mock
+import os
+import json
+import numpy as np
+import phyphox
+
+
+FOLDER_NAME = os.path.dirname(__file__)
+
+
+class TestDecode(unittest.TestCase):
+    def test_decode_buffers(self):
+        reponse = json.dumps({
+            "buffer": {"acc_time": {"size": 0, "updateMode": "partial",
+                                    "buffer": [0.5, 1.0, 1.5e-3]},
+                       "acc": {"buffer": [], "size": 0},
+                       "accX": {"size": 0, "buffer": [1, None, -2E2]}},
+            "status": {"session": "acc", "measuring": True}}).encode()
+        columns = phyphox.decode_buffers(reponse, ["accX", "acc_time", "acc"],
+                                         np.float32)
+        self.assertEqual(columns["acc_time"].dtype, np.float32)
+        np.testing.assert_array_equal(columns["acc_time"],
+                                      np.float32([0.5, 1.0, 1.5e-3]))
+        np.testing.assert_array_equal(columns["accX"], [1, np.nan, -200])
+        self.assertEqual(len(columns["acc"]), 0)
+        with self.assertRaises(KeyError):
+            phyphox.decode_buffers(reponse, ["gyr"])
+
+    @unittest.mock.patch('urllib.request.urlopen')
+    def test_read_buffers(self, mock_urlopen):
+        cm = unittest.mock.MagicMock()
+        cm.__enter__.return_value = cm
+        mock_urlopen.return_value = cm
+        with open(FOLDER_NAME + "/config_1.bin") as fd:
+            cm.read.return_value = fd.read()
+        x = phyphox.Logger("0.0.0.0", 8080, dtype=np.float32)
+        x.buffer_needed([(0, (0, 1))])
+        cm.read.return_value = json.dumps(
+            {"buffer": {"mag_time": {"buffer": [1000.0001, 1000.0002]},
+                        "magX": {"buffer": [0.1, 0.2]}}})
+        self.assertTrue(x.read_buffers())
+        tabs = x.get_last_buffer_read()[0]
+        self.assertEqual(tabs[0].dtype, np.float64)
+        self.assertEqual(tabs[1].dtype, np.float32)
+        self.assertEqual(x.build_link([1000.0002]),
+                         "/get?mag_time=1000.0002&magX=1000.0002%7Cmag_time")
+        x.read_buffers()
+        self.assertTrue(mock_urlopen.call_args[0][0].endswith(
+            "/get?mag_time=1000.0002&magX=1000.0002%7Cmag_time"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import unittest.mock
+import tempfile
+import zipfile
+import os
+import numpy as np
+import phyphox
+
+
+class TestExport(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write_zip(self, separator, decimal):
+        filename = os.path.join(self.directory.name, "data.zip")
+        lines = [separator.join(['"Time (s)"', '"Magnetic field x (µT)"',
+                                 '"Magnetic field y (µT)"'])]
+        for idx in range(100):
+            line = separator.join(["%.3E" % (idx * 0.01),
+                                   "%.3E" % (idx * 1.5), "%.3E" % -idx])
+            lines.append(line.replace('.', decimal))
+        with zipfile.ZipFile(filename, "w") as fd:
+            fd.writestr("Raw Data.csv", "\n".join(lines) + "\n")
+            fd.writestr("meta/device.csv", '"property";"value"\n')
+        return filename
+
+    def test_decimal_comma(self):
+        filename = self.write_zip(';', ',')
+        with phyphox.ExportReader(filename) as reader:
+            self.assertEqual(reader.sets(), ["Raw Data", "meta/device"])
+            self.assertEqual(reader.labels("Raw Data")[1],
+                             "Magnetic field x (µT)")
+            tab = reader.get("Raw Data", "Magnetic field x (µT)")
+            np.testing.assert_allclose(tab, np.arange(100) * 1.5)
+            tabs = reader.load("Raw Data", [0, 2])
+            np.testing.assert_allclose(tabs["Time (s)"],
+                                       np.arange(100) * 0.01)
+            np.testing.assert_allclose(tabs["Magnetic field y (µT)"],
+                                       -np.arange(100))
+
+    def test_filetype(self):
+        for filetype in range(1, 6):
+            separator, decimal = phyphox.EXPORT_FORMATS[filetype]
+            filename = self.write_zip(separator, decimal)
+            with phyphox.ExportReader(filename, filetype) as reader:
+                np.testing.assert_allclose(reader.get("Raw Data", 2),
+                                           -np.arange(100))
+            with phyphox.ExportReader(filename) as reader:
+                np.testing.assert_allclose(reader.get("Raw Data", 2),
+                                           -np.arange(100))
+
+    @unittest.mock.patch('urllib.request.urlopen')
+    def test_export_file(self, mock_urlopen):
+        cm = unittest.mock.MagicMock()
+        cm.__enter__.return_value = cm
+        cm.read.side_effect = [b"PK", b"\x03\x04", b""]
+        mock_urlopen.return_value = cm
+        filename = os.path.join(self.directory.name, "data.zip")
+        sizes = []
+        phone = phyphox.Logger("0.0.0.0", 8080)
+        self.assertEqual(phone.export_file(1, filename, 2, sizes.append), 4)
+        self.assertEqual(sizes, [2, 4])
+        self.assertTrue(mock_urlopen.call_args[0][0].endswith(
+            "/export?format=1"))
+        with open(filename, "rb") as fd:
+            self.assertEqual(fd.read(), b"PK\x03\x04")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import time
+import threading
+import urllib.error
+import phyphox
+
+
+class _FakeLogger():
+    def __init__(self, name, delay=0, error=None, gate=None):
+        self.base_url = name
+        self.delay = delay
+        self.error = error
+        self.new_data = False
+        # read_buffers waits until gate is set
+        self.gate = gate
+        self.nb_read = 0
+
+    def start(self):
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return {"result": True}
+
+    def read_buffers(self, stack_data=True,
+                     mode_data=phyphox.BufferMode.UPDATE):
+        time.sleep(self.delay)
+        if self.gate is not None:
+            self.gate.wait()
+        if self.error:
+            raise self.error
+        self.new_data = True
+        self.nb_read = self.nb_read + 1
+        return True
+
+    def get_last_buffer_read(self):
+        return [[[0.0, 0.1], [1.0, 2.0]]]
+
+    def close(self):
+        pass
+
+
+class TestLoggerGroup(unittest.TestCase):
+    def test_concurrent(self):
+        phones = [_FakeLogger("p" + str(i), delay=0.2) for i in range(10)]
+        with phyphox.LoggerGroup(phones) as group:
+            debut = time.perf_counter()
+            chunks = group.read_buffers()
+            self.assertLess(time.perf_counter() - debut, 1.0)
+        self.assertEqual(len(chunks), 10)
+        self.assertEqual(chunks["p3"][0][1], [1.0, 2.0])
+
+    def test_slow_unreachable(self):
+        group = phyphox.LoggerGroup(timeout=0.2)
+        group.add(_FakeLogger("fast"))
+        group.add(_FakeLogger("slow", delay=0.6))
+        group.add(_FakeLogger("lost",
+                              error=urllib.error.URLError("no route")))
+        self.assertEqual(group.start(), {"fast": {"result": True}})
+        self.assertEqual(group.slow, {"slow"})
+        self.assertEqual(group.unreachable, {"lost"})
+        # previous request of slow phone is still running
+        self.assertEqual(list(group.read_buffers()), ["fast"])
+        self.assertEqual(group.slow, {"slow"})
+        time.sleep(0.6)
+        group.timeout = None
+        self.assertEqual(sorted(group.read_buffers()), ["fast", "slow"])
+        self.assertEqual(group.late, {"slow": ("start", {"result": True})})
+        group.close()
+
+    def test_late(self):
+        gate = threading.Event()
+        slow = _FakeLogger("slow", gate=gate)
+        group = phyphox.LoggerGroup([_FakeLogger("fast"), slow],
+                                    timeout=0.05)
+        self.assertEqual(list(group.read_buffers()), ["fast"])
+        gate.set()
+        group.timeout = None
+        while slow.nb_read == 0:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        # chunk read after timeout is given with new chunk
+        chunks = group.read_buffers()
+        self.assertEqual(slow.nb_read, 2)
+        self.assertEqual(chunks["slow"], [[[0.0, 0.1, 0.0, 0.1],
+                                           [1.0, 2.0, 1.0, 2.0]]])
+        self.assertEqual(chunks["fast"], [[[0.0, 0.1], [1.0, 2.0]]])
+        group.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import json
+import unittest
+import phyphox
+
+CONFIG = {"crc32": "1a2b3c4d",
+          "export": [{"set": "Acc", "sources": [
+              {"label": "t", "buffer": "acc_time"},
+              {"label": "x", "buffer": "accX"}]}]}
+
+
+class _Transport():
+    def __init__(self):
+        self.answers = [[0.0, 0.1], [0.2], []]
+
+    def request(self, path):
+        if path == "/config":
+            return json.dumps(CONFIG).encode()
+        values = self.answers.pop(0)
+        return json.dumps({"buffer": {
+            "acc_time": {"buffer": values},
+            "accX": {"buffer": [1.0] * len(values)}}}).encode()
+
+    def close(self):
+        pass
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_disabled(self):
+        phone = phyphox.Logger("127.0.0.1", transport=_Transport())
+        phone.get_config()
+        self.assertEqual(phone.stats(), {})
+
+    def test_stats(self):
+        phone = phyphox.Logger("127.0.0.1", transport=_Transport())
+        events = []
+        phone.enable_stats(hook=lambda event, values: events.append(event))
+        phone.get_config()
+        phone.buffer_needed()
+        for _ in range(3):
+            phone.read_buffers(stack_data=False)
+        stats = phone.stats()
+        self.assertEqual(sorted(stats['endpoints']), ["/config", "/get"])
+        self.assertEqual(stats['endpoints']["/get"]['count'], 3)
+        self.assertGreater(stats['endpoints']["/get"]['bytes'], 0)
+        self.assertEqual(stats['decode']['count'], 4)
+        self.assertEqual(stats['samples'], {"acc_time": 3, "accX": 3})
+        self.assertEqual(stats['empty_polls'], 1)
+        self.assertAlmostEqual(stats['empty_ratio'], 1 / 3)
+        # last data overwrite data not read
+        self.assertEqual(stats['overflows'], 1)
+        self.assertEqual(events.count('request'), 4)
+        self.assertIn('overflow', events)
+        phone.instrumentation.reset()
+        self.assertEqual(phone.stats()['polls'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import time
+import unittest
+import numpy as np
+import phyphox
+
+
+class TestOnlineStats(unittest.TestCase):
+    def test_update(self):
+        rng = np.random.default_rng(0)
+        values = rng.normal(1e6, 2.0, 10000)
+        stats = phyphox.OnlineStats()
+        other = phyphox.OnlineStats()
+        rolling = phyphox.RollingStats(500)
+        for debut in range(0, 6000, 700):
+            stats.update(values[debut:min(debut + 700, 6000)])
+            rolling.update(values[debut:min(debut + 700, 6000)])
+        other.update(values[6000:])
+        stats.merge(other)
+        self.assertEqual(stats.count, 10000)
+        self.assertAlmostEqual(stats.mean, values.mean())
+        self.assertAlmostEqual(stats.variance(ddof=1), values.var(ddof=1),
+                               places=6)
+        self.assertEqual(stats.max, values.max())
+        self.assertAlmostEqual(stats.rms(), np.sqrt((values ** 2).mean()))
+        result = rolling.get()
+        self.assertEqual(result['count'], 500)
+        self.assertAlmostEqual(result['std'], values[5500:6000].std())
+        self.assertEqual(result['min'], values[5500:6000].min())
+        stats.update([np.nan])
+        self.assertEqual(stats.count, 10000)
+
+    def test_rolling(self):
+        rng = np.random.default_rng(1)
+        values = rng.normal(1e6, 2.0, 20000)
+        values[rng.integers(0, 20000, 500)] = np.nan
+        rolling = phyphox.RollingStats(300)
+        fin = 0
+        while fin < 20000:
+            # chunks smaller and larger than window
+            nb = int(rng.integers(0, 700))
+            rolling.update(values[fin:fin + nb])
+            fin = min(fin + nb, 20000)
+            window = values[max(fin - 300, 0):fin]
+            window = window[~np.isnan(window)]
+            result = rolling.get()
+            self.assertEqual(result['count'], window.shape[0])
+            self.assertAlmostEqual(result['mean'], window.mean(), places=6)
+            self.assertAlmostEqual(result['std'], window.std(), places=6)
+            self.assertEqual(result['min'], window.min())
+            self.assertEqual(result['max'], window.max())
+        rolling.update([np.nan] * 300)
+        self.assertEqual(rolling.get()['count'], 0)
+
+    def test_logger(self):
+        with phyphox.Simulator(rate=1000) as simulator:
+            with phyphox.Logger("127.0.0.1", simulator.port,
+                                keep_alive=True) as phone:
+                phone.get_config()
+                phone.buffer_needed()
+                phone.set_statistics(window=10)
+                chunks = []
+                phone.add_callback(chunks.append)
+                for _ in range(3):
+                    time.sleep(0.02)
+                    phone.read_buffers()
+                name = phone.get_buffer_name((0, 1))
+                values = np.concatenate([chunk[name] for chunk in chunks])
+                stats = phone.get_statistics(name)
+                self.assertEqual(stats['count'], len(values))
+                self.assertAlmostEqual(stats['mean'], values.mean())
+                self.assertAlmostEqual(
+                    phone.get_statistics(name, rolling=True)['max'],
+                    values[-10:].max())
+
+
+if __name__ == '__main__':
+    unittest.main()
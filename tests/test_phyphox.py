@@ -53,5 +53,17 @@ class TestPhyphoxMethods(unittest.TestCase):
         self.assertEqual(x._Logger__experiment.get('crc32'), 'e04c0bfa')
         self.assertEqual(x._Logger__experiment.get('category'), 'Raw Sensors')
 
+    def test_index(self):
+        with open(FOLDER_NAME + "/config_1.bin") as fd:
+            exp = phyphox.Experiment(json.load(fd))
+        self.assertEqual(exp.get_position("magY"), (0, 2))
+        self.assertEqual(exp.get_time_name("mag"), "mag_time")
+        self.assertIsNone(exp.get_position("accX"))
+        self.assertEqual(exp.find("mag[XY]"), [(0, 1), (0, 2)])
+        self.assertEqual(exp.find("Magnetic Field z*"), [(0, 3)])
+        self.assertEqual(len(exp.find("Raw Data")), 5)
+        self.assertEqual(exp.find("magx"), [])
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
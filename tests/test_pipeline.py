@@ -0,0 +1,102 @@
+import time
+import random
+import unittest
+import numpy as np
+import phyphox
+
+
+def energy(chunk):
+    return {name: float(np.sum(np.asarray(values) ** 2))
+            for name, values in chunk.items()}
+
+
+def slow_sum(chunk):
+    time.sleep(random.random() * 0.01)
+    return float(np.sum(chunk['x']))
+
+
+class TestPipeline(unittest.TestCase):
+    def test_order(self):
+        results = []
+        with phyphox.Pipeline([slow_sum], workers=4,
+                              callback=results.append) as pipeline:
+            for idx in range(50):
+                pipeline.submit({'x': np.full(10, idx)})
+        self.assertEqual(results, [10.0 * idx for idx in range(50)])
+
+    def test_process(self):
+        pipeline = phyphox.Pipeline(executor='process', workers=2,
+                                    queue_size=32)
+        pipeline.add_stage(energy)
+        chunks = [{'x': np.arange(idx, dtype=np.float32),
+                   'y': np.ones(3 * idx)} for idx in range(1, 20)]
+        for chunk in chunks:
+            pipeline.submit(chunk)
+        for chunk in chunks:
+            self.assertEqual(pipeline.get(timeout=10), energy(chunk))
+        pipeline.close()
+        with self.assertRaises(EOFError):
+            pipeline.get()
+
+    def test_drop(self):
+        pipeline = phyphox.Pipeline([lambda chunk: time.sleep(0.05)],
+                                    workers=1, queue_size=1, block=False)
+        self.assertTrue(pipeline.submit({}))
+        self.assertFalse(pipeline.submit({}))
+        self.assertEqual(pipeline.nb_dropped, 1)
+        self.assertIsNone(pipeline.get(timeout=1))
+        pipeline.submit({'x': 1})
+        pipeline.close()
+
+    def test_cancel(self):
+        results = []
+        pipeline = phyphox.Pipeline([lambda chunk: time.sleep(0.02)],
+                                    workers=1, queue_size=10,
+                                    callback=results.append)
+        for _ in range(10):
+            pipeline.submit({})
+        pipeline.close(cancel=True)
+        self.assertEqual(pipeline.nb_error, 0)
+        self.assertGreater(pipeline.nb_dropped, 0)
+        self.assertEqual(pipeline.nb_dropped + len(results), 10)
+
+    def test_shape(self):
+        with phyphox.Pipeline([energy], executor='process', workers=1,
+                              queue_size=1, block=False) as pipeline:
+            # object array can not be copied in shared memory
+            with self.assertRaises(TypeError):
+                pipeline.submit({'x': np.array(["a", None])})
+            # place of failed chunk is free
+            self.assertTrue(pipeline.submit({'x': np.array(2.0)}))
+            self.assertEqual(pipeline.get(timeout=10), {'x': 4.0})
+            self.assertTrue(pipeline.submit({'x': np.ones((3, 2))}))
+            self.assertEqual(pipeline.get(timeout=10), {'x': 6.0})
+            self.assertEqual(pipeline.nb_dropped, 0)
+
+    def test_logger(self):
+        with phyphox.Simulator(rate=1000) as simulator:
+            phone = phyphox.Logger("127.0.0.1", simulator.port,
+                                   keep_alive=True, dtype=np.float64)
+            phone.get_config()
+            phone.buffer_needed(["accX"])
+            pipeline = phyphox.Pipeline([energy])
+            phone.add_callback(pipeline.submit)
+            for _ in range(3):
+                time.sleep(0.01)
+                phone.read_buffers(stack_data=False)
+            simulator.answer("/control", [("cmd", "stop")])
+            phone.read_buffers(stack_data=False)
+            pipeline.close()
+            total = 0.0
+            while True:
+                try:
+                    total = total + pipeline.get()['accX']
+                except EOFError:
+                    break
+            self.assertAlmostEqual(total, energy(
+                {'x': simulator.values("accX")})['x'])
+            phone.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
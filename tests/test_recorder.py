@@ -0,0 +1,43 @@
+import unittest
+import tempfile
+import numpy as np
+import phyphox
+
+
+class TestRecorder(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_record(self):
+        with phyphox.Recorder(self.directory.name,
+                              fsync_interval=None) as recorder:
+            for debut in range(0, 1000, 100):
+                recorder.write({"acc_time": np.arange(debut, debut + 100),
+                                "accX": [1.5] * 100})
+            # header is updated only on flush
+            self.assertEqual(len(phyphox.open_recording(
+                self.directory.name)["accX"]), 0)
+            recorder.flush(sync=False)
+            self.assertEqual(recorder.get_count("accX"), 1000)
+        tabs = phyphox.open_recording(self.directory.name)
+        self.assertEqual(sorted(tabs), ["accX", "acc_time"])
+        self.assertIsInstance(tabs["acc_time"], np.memmap)
+        np.testing.assert_array_equal(tabs["acc_time"], np.arange(1000))
+        self.assertEqual(tabs["accX"][999], 1.5)
+
+    def test_continue(self):
+        with phyphox.Recorder(self.directory.name, np.float32) as recorder:
+            recorder.write({"acc": [1, 2, 3]})
+        with phyphox.Recorder(self.directory.name, np.float32) as recorder:
+            recorder.write({"acc": [4, 5]})
+            self.assertEqual(recorder.get_count("acc"), 5)
+        tab = phyphox.open_recording(self.directory.name, ["acc"])["acc"]
+        self.assertEqual(tab.dtype, np.float32)
+        np.testing.assert_array_equal(tab, [1, 2, 3, 4, 5])
+        with self.assertRaises(ValueError):
+            phyphox.Recorder(self.directory.name).write({"acc": [1]})
+
+
+if __name__ == '__main__':
+    unittest.main()
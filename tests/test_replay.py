@@ -0,0 +1,82 @@
+import os
+import time
+import tempfile
+import unittest
+import numpy as np
+import phyphox
+
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.filename = os.path.join(directory.name, "session.bin")
+
+    def run_session(self, phone, nb_read):
+        phone.get_meta()
+        phone.get_config()
+        phone.buffer_needed()
+        for _ in range(nb_read):
+            time.sleep(0.01)
+            phone.read_buffers()
+        return phone.get_all_buffer_read()
+
+    def test_replay(self):
+        with phyphox.Simulator(rate=1000) as simulator:
+            with phyphox.Logger("127.0.0.1", simulator.port, keep_alive=True,
+                                record=self.filename) as phone:
+                expected = self.run_session(phone, 5)
+        records = list(phyphox.read_session(self.filename))
+        self.assertEqual([path for _, path, _ in records[:2]],
+                         ["/meta", "/config"])
+        self.assertEqual(len(records), 7)
+        transport = phyphox.ReplayTransport(self.filename)
+        with phyphox.Logger("127.0.0.1", transport=transport,
+                            dtype=np.float64) as phone:
+            tabs = self.run_session(phone, 5)
+            self.assertEqual(phone.get_sample_rate(), 1000)
+            with self.assertRaises(EOFError):
+                phone.read_buffers()
+        for expected_tabs, replay_tabs in zip(expected, tabs):
+            for expected_values, values in zip(expected_tabs[0],
+                                               replay_tabs[0]):
+                np.testing.assert_array_equal(expected_values, values)
+        # original pacing
+        transport = phyphox.ReplayTransport(self.filename, speed=1.0)
+        debut = time.perf_counter()
+        for _ in range(5):
+            transport.request("/get")
+        self.assertGreaterEqual(time.perf_counter() - debut,
+                                records[-1][0] - records[2][0])
+        transport.close()
+
+    def test_crash(self):
+        class Transport():
+            def request(self, path, timeout=None):
+                return path.encode() * 1000
+
+            def close(self):
+                pass
+
+        recording = phyphox.RecordingTransport(Transport(), self.filename,
+                                               flush_interval=0)
+        self.addCleanup(recording.close)
+        for i in range(3):
+            recording.request("/get?acc=" + str(i))
+        recording.request("/meta")
+        # session is readable before close, a truncated tail is ignored
+        with open(self.filename, "ab") as fd:
+            fd.write(b"\x00" * 10)
+        transport = phyphox.ReplayTransport(self.filename)
+        self.addCleanup(transport.close)
+        self.assertEqual(transport.request("/meta"), b"/meta" * 1000)
+        self.assertEqual(transport.request("/meta"), b"/meta" * 1000)
+        for i in range(3):
+            self.assertEqual(transport.request("/get"),
+                             ("/get?acc=" + str(i)).encode() * 1000)
+        with self.assertRaises(EOFError):
+            transport.request("/get")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import time
+import unittest
+import numpy as np
+import phyphox
+
+
+class _Flaky():
+    """
+    Transport failing nb_failure times in a row every period requests
+    """
+    def __init__(self, transport=None, period=2, nb_failure=1, delay=0.0):
+        self.transport = transport
+        self.period = period
+        self.nb_failure = nb_failure
+        self.delay = delay
+        self.paths = []
+
+    def request(self, path, timeout=None):
+        self.paths.append(path)
+        if (len(self.paths) - 1) % self.period < self.nb_failure:
+            raise ConnectionResetError("connection lost")
+        delay, self.delay = self.delay, 0.0
+        time.sleep(delay)
+        if self.transport is None:
+            return b'{}'
+        return self.transport.request(path, timeout=timeout)
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
+
+
+class TestRetry(unittest.TestCase):
+    def test_retry(self):
+        flaky = _Flaky(period=3, nb_failure=2)
+        transport = phyphox.ResilientTransport(
+            flaky, phyphox.RetryPolicy(retries=2, backoff=0.001))
+        self.assertEqual(transport.request("/meta"), b'{}')
+        self.assertEqual(flaky.paths, ["/meta"] * 3)
+        self.assertEqual(transport.nb_retry, 2)
+        flaky.paths = []
+        transport.policy.retries = 1
+        with self.assertRaises(ConnectionResetError):
+            transport.request("/meta")
+
+    def test_breaker(self):
+        policy = phyphox.RetryPolicy(retries=0, breaker_threshold=2,
+                                     breaker_reset=0.05)
+        transport = phyphox.ResilientTransport(
+            _Flaky(period=10, nb_failure=10), policy)
+        for _ in range(2):
+            with self.assertRaises(ConnectionResetError):
+                transport.request("/get?acc_time=full")
+        with self.assertRaises(phyphox.CircuitOpenError):
+            transport.request("/get?acc_time=full")
+        self.assertEqual(transport.breaker.state, 'open')
+        time.sleep(0.06)
+        # one request is tried and fails: circuit is open again
+        with self.assertRaises(ConnectionResetError):
+            transport.request("/get?acc_time=full")
+        self.assertEqual(transport.breaker.state, 'open')
+        self.assertEqual(transport.nb_rejected, 1)
+
+    def test_hedge(self):
+        flaky = _Flaky(period=10, nb_failure=0, delay=1.0)
+        transport = phyphox.ResilientTransport(
+            flaky, phyphox.RetryPolicy(hedge_after=0.05))
+        debut = time.perf_counter()
+        self.assertEqual(transport.request("/config"), b'{}')
+        self.assertLess(time.perf_counter() - debut, 0.5)
+        self.assertEqual(transport.nb_hedged, 1)
+        transport.close()
+
+    def test_hedge_keep_alive(self):
+        with phyphox.Simulator(latency=0.3) as simulator:
+            policy = phyphox.RetryPolicy(hedge_after=0.05)
+            phone = phyphox.Logger("127.0.0.1", simulator.port,
+                                   keep_alive=True, retry=policy)
+            phone.send_url("meta")
+            self.assertEqual(phone.transport.nb_hedged, 1)
+            # hedged request is sent on its own connection
+            self.assertEqual(phone.transport.transport.nb_connection, 2)
+            phone.close()
+
+    def test_deadline(self):
+        with phyphox.Simulator(latency=1.0) as simulator:
+            policy = phyphox.RetryPolicy(retries=5, timeout=0.1,
+                                         deadline=0.3)
+            phone = phyphox.Logger("127.0.0.1", simulator.port,
+                                   keep_alive=True, retry=policy)
+            debut = time.perf_counter()
+            with self.assertRaises(TimeoutError):
+                phone.send_url("meta")
+            self.assertLess(time.perf_counter() - debut, 0.6)
+            phone.close()
+
+    def test_update(self):
+        with phyphox.Simulator(rate=1000) as simulator:
+            phone = phyphox.Logger("127.0.0.1", simulator.port,
+                                   keep_alive=True)
+            flaky = _Flaky(phone.transport)
+            phone.transport = phyphox.ResilientTransport(
+                flaky, phyphox.RetryPolicy(backoff=0.001))
+            phone.get_config()
+            phone.buffer_needed()
+            chunks = []
+            phone.add_callback(chunks.append)
+            for _ in range(5):
+                time.sleep(0.01)
+                phone.read_buffers()
+            simulator.answer("/control", [("cmd", "stop")])
+            phone.read_buffers()
+            # same link after a lost connection: no sample lost or duplicated
+            self.assertEqual(flaky.paths[0::2], flaky.paths[1::2])
+            np.testing.assert_array_equal(
+                np.concatenate([chunk["accZ"] for chunk in chunks]),
+                simulator.values("accZ"))
+            phone.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
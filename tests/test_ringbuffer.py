@@ -0,0 +1,106 @@
+import unittest
+import unittest.mock
+import os
+import json
+import numpy as np
+import phyphox
+
+
+FOLDER_NAME = os.path.dirname(__file__)
+
+class TestRingBuffer(unittest.TestCase):
+    def test_overwrite(self):
+        ring = phyphox.RingBuffer(100)
+        for debut in range(0, 1000, 7):
+            ring.append(np.arange(debut, debut + 7))
+        self.assertEqual(len(ring), 100)
+        self.assertEqual(ring.total, 1001)
+        np.testing.assert_array_equal(ring.last(), np.arange(901, 1001))
+        np.testing.assert_array_equal(ring.last(3), [998, 999, 1000])
+        self.assertTrue(ring.last().flags.c_contiguous)
+        self.assertEqual(ring.nbytes, 125 * 8)
+        ring.append(np.arange(500))
+        np.testing.assert_array_equal(ring.last(), np.arange(400, 500))
+
+    def test_view_since(self):
+        ring = phyphox.RingBuffer(10)
+        ring.append(np.arange(15))
+        view = ring.view()
+        self.assertFalse(view.flags.writeable)
+        with self.assertRaises(ValueError):
+            view[0] = 1
+        self.assertTrue(memoryview(ring.view(3)).readonly)
+        np.testing.assert_array_equal(ring.since(12), [12, 13, 14])
+        np.testing.assert_array_equal(ring.since(0), np.arange(5, 15))
+        self.assertEqual(len(ring.since(15)), 0)
+
+    def test_grow(self):
+        ring = phyphox.RingBuffer.from_duration(1, 10, policy='grow',
+                                                dtype=np.float32)
+        ring.append(np.arange(25))
+        self.assertEqual(ring.capacity, 40)
+        self.assertEqual(ring.dtype, np.float32)
+        np.testing.assert_array_equal(ring.last(), np.arange(25))
+
+
+class TestLoggerRingBuffer(unittest.TestCase):
+    def setUp(self):
+        patcher = unittest.mock.patch('urllib.request.urlopen')
+        mock_urlopen = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cm = unittest.mock.MagicMock()
+        self.cm.__enter__.return_value = self.cm
+        mock_urlopen.return_value = self.cm
+
+    def select_buffers(self, x):
+        with open(FOLDER_NAME + "/config_1.bin") as fd:
+            self.cm.read.return_value = fd.read()
+        x.buffer_needed([(0, (0, 1))])
+
+    def push(self, x, values):
+        self.cm.read.return_value = json.dumps(
+            {"buffer": {"mag_time": {"buffer": values},
+                        "magX": {"buffer": values}}})
+        return x.read_buffers()
+
+    def test_read_buffers(self):
+        x = phyphox.Logger("0.0.0.0", 8080)
+        self.select_buffers(x)
+        with self.assertWarns(UserWarning):
+            self.assertFalse(x.set_ring_buffer(duration=10))
+        self.assertTrue(x.set_ring_buffer(capacity=50))
+        for debut in range(0, 100, 20):
+            values = [float(v) for v in range(debut, debut + 20)]
+            self.assertTrue(self.push(x, values))
+        np.testing.assert_array_equal(x.get_last_samples("magX", 2), [98, 99])
+        self.assertEqual(len(x.get_ring_buffer("mag_time")), 50)
+        self.assertEqual(len(x.get_all_buffer_read()[0][0][1]), 50)
+        self.assertEqual(x.get_last_buffer_read()[0][1][0], 80)
+        self.assertFalse(x.get_buffer_view("magX").flags.writeable)
+        np.testing.assert_array_equal(x.get_buffer_since("magX", 97),
+                                      [97, 98, 99])
+        # unknown names get no buffer
+        for name in ("nope", "magY"):
+            self.assertIsNone(x.get_ring_buffer(name))
+            self.assertIsNone(x.get_buffer_view(name))
+            self.assertIsNone(x.get_buffer_memoryview(name))
+            self.assertIsNone(x.get_last_samples(name))
+
+    def test_list_since(self):
+        x = phyphox.Logger("0.0.0.0", 8080)
+        self.select_buffers(x)
+        for debut in range(0, 100, 20):
+            self.push(x, [float(v) for v in range(debut, debut + 20)])
+        np.testing.assert_array_equal(x.get_buffer_since("magX", 35),
+                                      np.arange(35, 100))
+        np.testing.assert_array_equal(x.get_buffer_since("magX", 90),
+                                      np.arange(90, 100))
+        self.assertEqual(len(x.get_buffer_since("magX", 100)), 0)
+        np.testing.assert_array_equal(x.get_buffer_view("mag_time", 3),
+                                      [97, 98, 99])
+        self.assertTrue(x.get_buffer_memoryview("magX").readonly)
+        self.assertIsNone(x.get_buffer_view("magY"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import threading
+import multiprocessing
+import numpy as np
+import phyphox
+
+
+def _reader_process(name, result):
+    with phyphox.SharedReader(name) as reader:
+        reader.wait(0, timeout=10)
+        result.put(reader.read("accX", copy=True).sum())
+
+
+class TestShared(unittest.TestCase):
+    def setUp(self):
+        self.publisher = phyphox.SharedPublisher(["acc_time", "accX"], 100)
+        self.addCleanup(self.publisher.close)
+
+    def test_ring(self):
+        reader = phyphox.SharedReader(self.publisher.name)
+        late = phyphox.SharedReader(self.publisher.name)
+        self.publisher.write({"acc_time": np.arange(60), "accX": [1.0] * 60,
+                              "unknown": [0]})
+        views = reader.read("acc_time")
+        self.assertEqual(len(views), 1)
+        np.testing.assert_array_equal(views[0], np.arange(60))
+        self.publisher.write({"acc_time": np.arange(60, 130)})
+        self.assertEqual(reader.get_seq(), 2)
+        self.assertEqual(reader.get_total("acc_time"), 130)
+        # end of ring buffer: two views
+        views = reader.read("acc_time")
+        self.assertEqual([len(view) for view in views], [40, 30])
+        np.testing.assert_array_equal(np.concatenate(views),
+                                      np.arange(60, 130))
+        np.testing.assert_array_equal(late.read("acc_time", copy=True),
+                                      np.arange(30, 130))
+        self.assertEqual(late.lost["acc_time"], 30)
+        self.assertEqual(len(reader.read_all()["acc_time"]), 0)
+        del views
+        reader.close()
+        late.close()
+
+    def test_dead_publisher(self):
+        reader = phyphox.SharedReader(self.publisher.name)
+        self.addCleanup(reader.close)
+        self.publisher.write({"accX": [1.0, 2.0]})
+        # publisher stopped while writing a chunk: seq stays odd
+        self.publisher._SharedPublisher__seq[0] += 1
+        with self.assertRaises(TimeoutError):
+            reader.read("accX", timeout=0.05)
+        with self.assertRaises(TimeoutError):
+            reader.read_all(timeout=0.05)
+        self.publisher._SharedPublisher__seq[0] += 1
+        np.testing.assert_array_equal(reader.read("accX", copy=True),
+                                      [1.0, 2.0])
+
+    def test_concurrent(self):
+        publisher = phyphox.SharedPublisher(["acc_time"], 1000)
+        self.addCleanup(publisher.close)
+        reader = phyphox.SharedReader(publisher.name)
+
+        def writer():
+            for idx in range(200):
+                publisher.write({"acc_time": np.arange(idx * 700,
+                                                       (idx + 1) * 700)})
+        thread = threading.Thread(target=writer)
+        thread.start()
+        nb = 0
+        while thread.is_alive():
+            values = reader.read("acc_time", copy=True)
+            # consecutive samples: no sample overwritten during copy
+            np.testing.assert_array_equal(np.diff(values), 1)
+            nb = nb + len(values)
+        thread.join()
+        nb = nb + len(reader.read("acc_time", copy=True))
+        self.assertEqual(nb + reader.lost["acc_time"], 200 * 700)
+        self.assertEqual(reader.get_seq(), 200)
+        reader.close()
+
+    def test_process(self):
+        result = multiprocessing.Queue()
+        process = multiprocessing.Process(
+            target=_reader_process, args=(self.publisher.name, result))
+        process.start()
+        self.publisher.write({"accX": [0.5] * 10})
+        self.assertEqual(result.get(timeout=20), 5.0)
+        process.join(10)
+
+
+if __name__ == '__main__':
+    unittest.main()
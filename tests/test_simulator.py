@@ -0,0 +1,81 @@
+import os
+import time
+import tempfile
+import unittest
+import numpy as np
+import phyphox
+
+
+class TestSimulator(unittest.TestCase):
+    def setUp(self):
+        self.simulator = phyphox.Simulator(nb_set=2, rate=[1000, 200])
+        self.addCleanup(self.simulator.close)
+        self.phone = phyphox.Logger("127.0.0.1", self.simulator.port,
+                                    keep_alive=True, dtype=np.float64)
+        self.addCleanup(self.phone.close)
+        self.phone.get_meta()
+        self.phone.get_config()
+        self.phone.buffer_needed()
+
+    def test_update(self):
+        chunks = []
+        self.phone.add_callback(chunks.append)
+        for _ in range(4):
+            time.sleep(0.02)
+            self.phone.read_buffers()
+        self.simulator.answer("/control", [("cmd", "stop")])
+        self.phone.read_buffers()
+        for names in self.simulator.buffer_names:
+            for name in names:
+                values = np.concatenate([chunk[name] for chunk in chunks])
+                # samples are read once and in order
+                np.testing.assert_array_equal(
+                    values, self.simulator.values(name))
+        self.assertEqual(self.phone.get_sample_rate("gyrX"), 200)
+
+    def test_last_export(self):
+        time.sleep(0.02)
+        self.phone.read_buffers(mode_data=phyphox.BufferMode.LAST)
+        self.assertEqual(len(self.phone.get_last_buffer_read()[0][0]), 1)
+        self.assertEqual(self.phone.send_url("time")[0]['event'], "START")
+        self.phone.clear_data()
+        self.assertEqual(self.simulator.get_count(), 0)
+        self.phone.start()
+        time.sleep(0.02)
+        self.phone.stop()
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "data.zip")
+            self.phone.export_file(5, filename)
+            with phyphox.ExportReader(filename) as reader:
+                np.testing.assert_allclose(
+                    reader.get("gyroscope", "gyrZ"),
+                    self.simulator.values("gyrZ"))
+
+    def test_select(self):
+        self.assertTrue(self.phone.buffer_needed(["gyr[XZ]", "accY"]))
+        self.assertEqual(self.phone.get_selected_names(),
+                         [["acc_time", "accY"],
+                          ["gyr_time", "gyrX", "gyrZ"]])
+        self.assertEqual(self.phone.get_buffer_position("gyrZ"), (1, 2))
+        with self.assertWarns(UserWarning):
+            self.assertFalse(self.phone.buffer_needed("mag*"))
+        # selection and its index are unchanged
+        self.assertEqual(self.phone.get_selected_names(),
+                         [["acc_time", "accY"],
+                          ["gyr_time", "gyrX", "gyrZ"]])
+        self.assertEqual(self.phone.get_buffer_position("gyrZ"), (1, 2))
+        with self.assertWarns(UserWarning):
+            self.assertFalse(self.phone.buffer_needed([(5, (0, 1))]))
+        self.assertEqual(self.phone.get_buffer_position("accY"), (0, 1))
+        self.phone.buffer_needed([(1, (0, 2)), "gyrZ"])
+        self.assertEqual(self.phone.get_selected_names(),
+                         [["gyr_time", "gyrY", "gyrZ"]])
+        time.sleep(0.02)
+        self.phone.read_buffers()
+        self.assertEqual(self.phone.build_link([1.5]),
+                         "/get?gyr_time=1.5&gyrY=1.5%7Cgyr_time"
+                         "&gyrZ=1.5%7Cgyr_time")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import time
+import unittest
+import numpy as np
+import phyphox
+
+
+class TestSpectrogram(unittest.TestCase):
+    def test_incremental(self):
+        temps = np.arange(5000) / 1000
+        values = np.sin(2 * np.pi * 125 * temps)
+        spectrogram = phyphox.Spectrogram(256, 64, history=10)
+        nb_frame = 0
+        for debut in range(0, 5000, 333):
+            frame_times, spectra = spectrogram.append(
+                temps[debut:debut + 333], values[debut:debut + 333])
+            nb_frame = nb_frame + len(frame_times)
+            self.assertEqual(spectra.shape[0], len(frame_times))
+        self.assertEqual(nb_frame, (5000 - 256) // 64 + 1)
+        self.assertEqual(spectrogram.total, nb_frame)
+        self.assertAlmostEqual(spectrogram.get_rate(), 1000)
+        frame_times, spectra = spectrogram.get()
+        self.assertEqual(spectra.shape, (10, 129))
+        # same frames as a batch computation
+        debut = (nb_frame - 1) * 64
+        expected = np.abs(np.fft.rfft(values[debut:debut + 256] *
+                                      np.hanning(256)))
+        np.testing.assert_allclose(spectra[-1], expected)
+        self.assertEqual(frame_times[-1], temps[debut + 128])
+        frequencies = spectrogram.get_frequencies()
+        self.assertAlmostEqual(frequencies[spectra[-1].argmax()], 125)
+        # samples between two frames are not skipped
+        with self.assertRaises(ValueError):
+            phyphox.Spectrogram(256, 300)
+        self.assertEqual(spectrogram.get(3)[1].shape, (3, 129))
+
+    def test_logger(self):
+        with phyphox.Simulator(rate=2000) as simulator:
+            with phyphox.Logger("127.0.0.1", simulator.port,
+                                keep_alive=True) as phone:
+                phone.get_config()
+                phone.buffer_needed()
+                spectrogram = phone.set_spectrogram("accY", 64, mode='power')
+                time.sleep(0.1)
+                phone.read_buffers()
+                self.assertIs(phone.get_spectrogram("accY"), spectrogram)
+                self.assertGreater(spectrogram.total, 0)
+                # accY is a 2 Hz sine: peak at first bins
+                self.assertLess(spectrogram.get(1)[1][0].argmax(), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
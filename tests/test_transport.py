@@ -0,0 +1,82 @@
+import unittest
+import threading
+import urllib.error
+import http.server
+import phyphox
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        type(self).connections = type(self).connections + 1
+
+    def do_GET(self):
+        if self.path in ("/time", "/drop"):
+            body = b'[{"event":"START","experimentTime":0.0,"systemTime":1.0}]'
+            self.send_response(200)
+        else:
+            body = b'{}'
+            self.send_response(404)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if self.path == "/drop":
+            # connection closed without Connection: close header
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestTransport(unittest.TestCase):
+    def setUp(self):
+        _Handler.connections = 0
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0),
+                                                      _Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever,
+                                       daemon=True)
+        self.thread.start()
+        self.base_url = "http://127.0.0.1:" + str(self.server.server_port)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_keep_alive_reuse(self):
+        transport = phyphox.KeepAliveTransport(self.base_url, timeout=5)
+        for _ in range(10):
+            self.assertIn(b"START", transport.request("/time"))
+        self.assertEqual(transport.nb_connection, 1)
+        self.assertEqual(_Handler.connections, 1)
+        transport.close()
+
+    def test_reconnect(self):
+        transport = phyphox.KeepAliveTransport(self.base_url, timeout=5)
+        transport.request("/drop")
+        self.assertIn(b"START", transport.request("/time"))
+        self.assertEqual(_Handler.connections, 2)
+        transport.close()
+
+    def test_http_error(self):
+        transport = phyphox.KeepAliveTransport(self.base_url, timeout=5)
+        with self.assertRaises(urllib.error.HTTPError):
+            transport.request("/unknown")
+        self.assertIn(b"START", transport.request("/time"))
+        self.assertEqual(transport.nb_connection, 1)
+        transport.close()
+
+    def test_logger_keep_alive(self):
+        with phyphox.Logger("127.0.0.1", self.server.server_port,
+                            keep_alive=True, timeout=5) as logger:
+            self.assertEqual(logger.get_time()[0]['event'], 'START')
+            self.assertEqual(logger.get_time()[0]['event'], 'START')
+            self.assertEqual(logger.transport.nb_connection, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()